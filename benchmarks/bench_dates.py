@@ -0,0 +1,56 @@
+"""
+Measures per-value cost of date parsing on a mix of dates seen in feeds, sitemaps and page metadata.
+
+    python -m benchmarks.bench_dates
+"""
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+from dateutil import parser as dateutil_parser
+from pyminiscraper.dates import parse_date, _parse_date
+
+
+def make_dates(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    formats = [
+        # RSS pubDate
+        lambda d: d.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+        lambda d: d.strftime("%a, %d %b %Y %H:%M:%S +0000"),
+        # Atom, sitemap lastmod, schema.org
+        lambda d: d.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        lambda d: d.strftime("%Y-%m-%dT%H:%M:%S.%f+00:00"),
+        lambda d: d.strftime("%Y-%m-%d"),
+        # the occasional free-form date
+        lambda d: d.strftime("%B %d, %Y"),
+    ]
+    weights = [30, 10, 30, 10, 15, 5]
+    dates = []
+    for _ in range(count):
+        # sitemaps and feeds repeat timestamps, pages are often regenerated in the same batch
+        d = start + timedelta(minutes=rng.randint(0, count // 2))
+        dates.append(rng.choices(formats, weights)[0](d))
+    return dates
+
+
+def main() -> None:
+    dates = make_dates(10_000)
+    number = 3
+
+    dateutil_time = timeit.timeit(lambda: [dateutil_parser.parse(value) for value in dates], number=number)
+    year = datetime.now().year
+    fast_path_time = timeit.timeit(lambda: [_parse_date.__wrapped__(value, year) for value in dates], number=number)
+
+    def cached() -> None:
+        _parse_date.cache_clear()
+        for value in dates:
+            parse_date(value)
+    cached_time = timeit.timeit(cached, number=number)
+
+    total = len(dates) * number
+    for name, seconds in (("dateutil", dateutil_time), ("fast paths", fast_path_time), ("fast paths + cache", cached_time)):
+        print(f"{name:>20}: {seconds / total * 1e6:6.2f} us/date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Measures PathFilter throughput with many include/exclude patterns.
+
+    python -m benchmarks.bench_path_filter [patterns] [paths]
+"""
+import random
+import sys
+import time
+from pyminiscraper.filter import PathFilter
+from pyminiscraper.robots import robots_txt_pattern_compile
+
+
+def make_patterns(count: int, rng: random.Random) -> list[str]:
+    patterns = []
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.7:
+            patterns.append(f"/section-{i}/")
+        elif kind < 0.8:
+            patterns.append(f"/page-{i}.html$")
+        else:
+            patterns.append(f"/archive-{i}/*/comments")
+    return patterns
+
+
+def make_paths(count: int, pattern_count: int, rng: random.Random) -> list[str]:
+    return [f"https://example.com/section-{rng.randint(0, pattern_count * 2)}/item-{i}" for i in range(count)]
+
+
+def legacy_is_passing(patterns: list, url: str) -> bool:
+    path = url[len("https://example.com"):]
+    for pattern in patterns:
+        if pattern.fullmatch(path):
+            return True
+    return False
+
+
+def main() -> None:
+    pattern_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    path_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    rng = random.Random(11)
+    patterns = make_patterns(pattern_count, rng)
+    urls = make_paths(path_count, pattern_count, rng)
+
+    start = time.perf_counter()
+    path_filter = PathFilter(patterns)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for url in urls:
+        path_filter.is_passing(url)
+    filter_seconds = time.perf_counter() - start
+
+    # the pattern by pattern loop is measured on a sample, it is too slow for the full path set
+    legacy_patterns = [robots_txt_pattern_compile(pattern) for pattern in patterns]
+    sample = urls[:max(1, path_count // 100)]
+    start = time.perf_counter()
+    for url in sample:
+        legacy_is_passing(legacy_patterns, url)
+    legacy_seconds = (time.perf_counter() - start) / len(sample) * path_count
+
+    print(f"{pattern_count} patterns, {path_count} paths")
+    print(f"  build:                {build_seconds * 1e3:8.1f} ms")
+    print(f"  compiled PathFilter:  {filter_seconds:8.2f} s  ({filter_seconds / path_count * 1e6:.2f} us/path)")
+    print(f"  pattern loop (est.):  {legacy_seconds:8.2f} s  ({legacy_seconds / path_count * 1e6:.2f} us/path)")
+
+
+if __name__ == "__main__":
+    main()
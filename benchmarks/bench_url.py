@@ -0,0 +1,49 @@
+"""
+Measures per-url cost of url normalization on a realistic link set.
+
+    python -m benchmarks.bench_url
+"""
+import random
+import timeit
+from pyminiscraper.url import normalize_changing_semantics, normalize_url_single_pass, NormalizedUrlMemo
+
+
+def make_links(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    hosts = ["https://www.example.com", "https://blog.example.com", "http://news.example.org:80", "https://shop.example.net"]
+    sections = ["articles", "tags", "category/tech", "products", "2024/05", "about"]
+    links = []
+    for i in range(count):
+        url = f"{rng.choice(hosts)}/{rng.choice(sections)}/item-{rng.randint(0, count // 4)}"
+        if rng.random() < 0.3:
+            url += f"?page={rng.randint(1, 5)}&utm_source=feed&sort=new"
+        if rng.random() < 0.2:
+            url += "#comments"
+        if rng.random() < 0.1:
+            url += "/index.html"
+        links.append(url)
+    return links
+
+
+def main() -> None:
+    links = make_links(10_000)
+    # every link is normalized several times along the crawl: url model, domain filter, page hash, file store
+    repeated_links = links * 4
+    number = 5
+
+    chain = timeit.timeit(lambda: [normalize_changing_semantics(url) for url in repeated_links], number=number)
+    single_pass = timeit.timeit(lambda: [normalize_url_single_pass(url) for url in repeated_links], number=number)
+
+    def memoized() -> None:
+        memo = NormalizedUrlMemo()
+        for url in repeated_links:
+            memo.normalize(url)
+    memo_time = timeit.timeit(memoized, number=number)
+
+    total = len(repeated_links) * number
+    for name, seconds in (("three pass chain", chain), ("single pass", single_pass), ("single pass + memo", memo_time)):
+        print(f"{name:>20}: {seconds / total * 1e6:6.2f} us/url")
+
+
+if __name__ == "__main__":
+    main()
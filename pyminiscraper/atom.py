@@ -3,8 +3,8 @@ from datetime import datetime
 from typing import List, Optional
 import asyncio
 import xml.etree.ElementTree as ET
-from email.utils import parsedate_to_datetime
 from io import BytesIO
+from .dates import parse_optional_date
 
 @dataclass
 class AtomAuthor:
@@ -153,10 +153,4 @@ class AtomParser:
     
     def _parse_datetime(self, dt_str: Optional[str]) -> Optional[datetime]:
         """Parse datetime string into datetime object."""
-        if not dt_str:
-            return None
-        try:
-            return parsedate_to_datetime(dt_str)
-        except (TypeError, ValueError):
-            return None
-
+        return parse_optional_date(dt_str)
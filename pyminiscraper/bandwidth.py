@@ -0,0 +1,37 @@
+import asyncio
+from typing import Dict, Optional
+from .ratelimiter import TokenBucket
+
+
+class BandwidthLimiter:
+    """Limits downloaded bytes per second globally and per host with token buckets"""
+    def __init__(self, *,
+                 bytes_per_second: Optional[float] = None,
+                 burst_bytes: Optional[float] = None,
+                 bytes_per_second_per_host: Optional[float] = None,
+                 burst_bytes_per_host: Optional[float] = None) -> None:
+        self.global_bucket = TokenBucket(bytes_per_second, burst_bytes or bytes_per_second) if bytes_per_second else None
+        self.bytes_per_second_per_host = bytes_per_second_per_host
+        self.burst_bytes_per_host = burst_bytes_per_host or bytes_per_second_per_host
+        self.host_buckets: Dict[str, TokenBucket] = {}
+        self.downloaded_bytes_count = 0
+        self.start_time: Optional[float] = None
+
+    async def consume(self, host: str, bytes_count: int) -> None:
+        if self.start_time is None:
+            self.start_time = asyncio.get_event_loop().time()
+        self.downloaded_bytes_count += bytes_count
+        if self.bytes_per_second_per_host and self.burst_bytes_per_host:
+            host_bucket = self.host_buckets.get(host)
+            if host_bucket is None:
+                host_bucket = TokenBucket(self.bytes_per_second_per_host, self.burst_bytes_per_host)
+                self.host_buckets[host] = host_bucket
+            await host_bucket.consume(bytes_count)
+        if self.global_bucket:
+            await self.global_bucket.consume(bytes_count)
+
+    def bytes_per_second(self) -> float:
+        if self.start_time is None:
+            return 0.0
+        elapsed = asyncio.get_event_loop().time() - self.start_time
+        return self.downloaded_bytes_count / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,39 @@
+from collections import defaultdict
+from typing import Dict
+from urllib.parse import urlsplit
+
+
+class CrawlBudget:
+    """
+    Limits the number of pages queued per host and per path prefix on each host,
+    so one large domain cannot use the whole max_requested_urls budget.
+    """
+    def __init__(self, *, max_urls_per_host: int | None = None, max_urls_per_path_prefix: Dict[str, int] | None = None) -> None:
+        self.max_urls_per_host = max_urls_per_host
+        self.max_urls_per_path_prefix = max_urls_per_path_prefix if max_urls_per_path_prefix is not None else {}
+        self.host_counts: Dict[str, int] = defaultdict(int)
+        self.path_prefix_counts: Dict[tuple[str, str], int] = defaultdict(int)
+        self.over_budget_urls_count = 0
+
+    def try_consume(self, normalized_url: str) -> bool:
+        """Counts the url against its host and path prefix budgets, returns False if any of them is exhausted"""
+        parsed_url = urlsplit(normalized_url)
+        host = parsed_url.netloc
+        if self.max_urls_per_host is not None and self.host_counts[host] >= self.max_urls_per_host:
+            self.over_budget_urls_count += 1
+            return False
+
+        path_prefix_keys: list[tuple[str, str]] = []
+        for path_prefix, max_urls in self.max_urls_per_path_prefix.items():
+            if not parsed_url.path.startswith(path_prefix):
+                continue
+            key = (host, path_prefix)
+            if self.path_prefix_counts[key] >= max_urls:
+                self.over_budget_urls_count += 1
+                return False
+            path_prefix_keys.append(key)
+
+        self.host_counts[host] += 1
+        for key in path_prefix_keys:
+            self.path_prefix_counts[key] += 1
+        return True
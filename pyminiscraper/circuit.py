@@ -0,0 +1,99 @@
+from enum import Enum
+from typing import Callable, Dict
+import logging
+import time
+
+logger = logging.getLogger("circuit")
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    DEAD = "dead"
+
+
+class HostCircuit:
+    def __init__(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.back_to_back_failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.probe_in_flight = False
+
+
+class HostCircuitBreaker:
+    """
+    Stops dispatching requests to a failing host without affecting other hosts:
+    - CLOSED: requests flow, back to back failures are counted.
+    - OPEN: after failure_threshold back to back failures no requests are sent for cooldown_seconds.
+    - HALF_OPEN: after the cooldown a single probe request is sent, its outcome closes or reopens the circuit.
+    - DEAD: the circuit was reopened max_trips times in a row, the host is given up.
+    """
+    def __init__(self, *,
+                 failure_threshold: int,
+                 cooldown_seconds: float = 60.0,
+                 max_trips: int = 5,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_trips = max_trips
+        self.clock = clock
+        self.hosts: Dict[str, HostCircuit] = {}
+
+    def _host(self, host: str) -> HostCircuit:
+        circuit = self.hosts.get(host)
+        if circuit is None:
+            circuit = HostCircuit()
+            self.hosts[host] = circuit
+        return circuit
+
+    def is_dead(self, host: str) -> bool:
+        return self._host(host).state == CircuitState.DEAD
+
+    def allow_request(self, host: str) -> float:
+        """Returns 0 if a request to the host can be sent now, or seconds to wait before asking again"""
+        circuit = self._host(host)
+        if circuit.state == CircuitState.CLOSED:
+            return 0.0
+        if circuit.state == CircuitState.OPEN:
+            remaining = circuit.opened_at + self.cooldown_seconds - self.clock()
+            if remaining > 0:
+                return remaining
+            logger.info(f"circuit half-open - probing host {host}")
+            circuit.state = CircuitState.HALF_OPEN
+        if circuit.state == CircuitState.HALF_OPEN and not circuit.probe_in_flight:
+            circuit.probe_in_flight = True
+            return 0.0
+        return self.cooldown_seconds
+
+    def record_success(self, host: str) -> None:
+        circuit = self._host(host)
+        if circuit.state == CircuitState.HALF_OPEN:
+            logger.info(f"circuit closed - host recovered {host}")
+        circuit.state = CircuitState.CLOSED
+        circuit.back_to_back_failures = 0
+        circuit.trips = 0
+        circuit.probe_in_flight = False
+
+    def record_failure(self, host: str) -> None:
+        circuit = self._host(host)
+        circuit.probe_in_flight = False
+        if circuit.state == CircuitState.DEAD:
+            return
+        circuit.back_to_back_failures += 1
+        if circuit.state == CircuitState.HALF_OPEN or circuit.back_to_back_failures >= self.failure_threshold:
+            self._open(host, circuit)
+
+    def _open(self, host: str, circuit: HostCircuit) -> None:
+        circuit.trips += 1
+        if circuit.trips >= self.max_trips:
+            logger.error(f"circuit dead - giving up host after {circuit.trips} trips {host}")
+            circuit.state = CircuitState.DEAD
+            return
+        logger.warning(f"circuit open - pausing host for {self.cooldown_seconds}s {host}")
+        circuit.state = CircuitState.OPEN
+        circuit.opened_at = self.clock()
+
+    def states(self) -> Dict[str, str]:
+        return {host: circuit.state.value for host, circuit in self.hosts.items() if circuit.state != CircuitState.CLOSED}
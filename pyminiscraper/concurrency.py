@@ -0,0 +1,100 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Dict, Optional
+import logging
+from .fetch import is_overload_error
+
+logger = logging.getLogger("concurrency")
+
+
+class HostConcurrency:
+    def __init__(self, limit: float, latency_seconds: float) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.condition = asyncio.Condition()
+        # moving average of response latency, used to estimate when a slot frees up
+        self.latency_seconds = latency_seconds
+        # sequence number of the last started request, and of the last one started before the last decrease
+        self.started_count = 0
+        self.decreased_at = 0
+
+
+class HostConcurrencyLimiter:
+    """
+    Limits in-flight requests per host with additive increase / multiplicative decrease:
+    - The limit grows by additive_increase per window of healthy responses.
+    - The limit is multiplied by multiplicative_decrease on timeouts, 429 and 5xx responses,
+      at most once per generation of in-flight requests, so one burst of failures counts as one.
+    """
+    def __init__(self, *,
+                 max_limit: int,
+                 initial_limit: int = 2,
+                 min_limit: int = 1,
+                 target_latency_seconds: float = 2.0,
+                 additive_increase: float = 1.0,
+                 multiplicative_decrease: float = 0.5) -> None:
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.initial_limit = max(min_limit, min(initial_limit, max_limit))
+        self.target_latency_seconds = target_latency_seconds
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.hosts: Dict[str, HostConcurrency] = {}
+
+    def _host(self, host: str) -> HostConcurrency:
+        host_concurrency = self.hosts.get(host)
+        if host_concurrency is None:
+            host_concurrency = HostConcurrency(self.initial_limit, self.target_latency_seconds)
+            self.hosts[host] = host_concurrency
+        return host_concurrency
+
+    def busy_delay(self, host: str) -> float:
+        """Returns 0 if the host has a free slot, otherwise the expected time until one frees up"""
+        host_concurrency = self.hosts.get(host)
+        if host_concurrency is None or host_concurrency.in_flight < int(host_concurrency.limit):
+            return 0.0
+        return host_concurrency.latency_seconds / host_concurrency.in_flight
+
+    async def acquire(self, host: str) -> int:
+        """Waits for a free slot and returns the request sequence number to pass back to release"""
+        host_concurrency = self._host(host)
+        async with host_concurrency.condition:
+            while host_concurrency.in_flight >= int(host_concurrency.limit):
+                await host_concurrency.condition.wait()
+            host_concurrency.in_flight += 1
+            host_concurrency.started_count += 1
+            return host_concurrency.started_count
+
+    async def release(self, host: str, latency_seconds: float, error: Optional[BaseException] = None, request: Optional[int] = None) -> None:
+        host_concurrency = self._host(host)
+        async with host_concurrency.condition:
+            host_concurrency.in_flight -= 1
+            host_concurrency.latency_seconds += 0.2 * (latency_seconds - host_concurrency.latency_seconds)
+            previous_limit = host_concurrency.limit
+            if error is not None:
+                # requests already in flight at the last decrease belong to the same burst
+                if is_overload_error(error) and (request is None or request > host_concurrency.decreased_at):
+                    host_concurrency.limit = max(self.min_limit, host_concurrency.limit * self.multiplicative_decrease)
+                    host_concurrency.decreased_at = host_concurrency.started_count
+            elif latency_seconds <= self.target_latency_seconds:
+                host_concurrency.limit = min(self.max_limit, host_concurrency.limit + self.additive_increase / host_concurrency.limit)
+            if int(host_concurrency.limit) != int(previous_limit):
+                logger.info(f"host concurrency limit changed - {host} {int(previous_limit)} -> {int(host_concurrency.limit)}")
+            host_concurrency.condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncGenerator[None, None]:
+        request = await self.acquire(host)
+        loop = asyncio.get_event_loop()
+        start_time = loop.time()
+        error: Optional[BaseException] = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            await self.release(host, loop.time() - start_time, error, request)
+
+    def limits(self) -> Dict[str, float]:
+        return {host: host_concurrency.limit for host, host_concurrency in self.hosts.items()}
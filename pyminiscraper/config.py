@@ -2,12 +2,15 @@ from abc import ABC, abstractmethod
 from .model import ScraperUrl, ScraperWebPage
 import logging
 from enum import Enum
+from datetime import datetime
 from typing import Optional
 from typing import AsyncGenerator, Any
 import aiohttp
 from .sitemap import Sitemap
 from .feed import Feed
 from contextlib import asynccontextmanager
+from .robots_cache import RobotsCache
+from .feed_poller import FeedPollState
 
 logger = logging.getLogger("config")
 
@@ -41,6 +44,24 @@ class ScraperCallback:
 
         async def load_web_page_from_cache(self, normalized_url: str) -> Optional[ScraperWebPage]:
             return None
+
+        async def load_last_fetched_at(self, normalized_url: str) -> Optional[datetime]:
+            """Returns when the url was last downloaded, used by incremental crawls"""
+            return None
+
+        async def load_last_fetched_at_many(self, normalized_urls: list[str]) -> dict[str, Optional[datetime]]:
+            """Returns when each url was last downloaded, stores can override it with one batched lookup"""
+            return {normalized_url: await self.load_last_fetched_at(normalized_url) for normalized_url in normalized_urls}
+
+        async def save_last_fetched_at(self, normalized_url: str, fetched_at: datetime) -> None:
+            pass
+
+        async def load_feed_poll_state(self, normalized_url: str) -> Optional[FeedPollState]:
+            """Returns the validators, seen items and poll interval of a feed, used by feed polling"""
+            return None
+
+        async def save_feed_poll_state(self, normalized_url: str, state: FeedPollState) -> None:
+            pass
         
         async def on_log(self, text: str) -> None:        
             pass
@@ -65,6 +86,101 @@ class ScraperDomainConfig:
                 allowance: ScraperDomainConfigMode|ScraperAllowedDomains = ScraperDomainConfigMode.DIREVE_FROM_SEED_URLS):        
         self.forbidden_domains = forbidden_domains
         self.allowance = allowance
+
+class ScraperTrapConfig:
+    def __init__(self, *,
+                max_path_segment_repeats: int = 3,
+                max_numeric_parameter_values: int = 1000,
+                max_query_combinations_per_path: int = 64,
+                max_stale_link_yield_pages: int = 50,
+                stale_link_yield_blocked_urls: int = 1000,
+                max_content_hashes_per_host: int = 10000):
+        self.max_path_segment_repeats = max_path_segment_repeats
+        self.max_numeric_parameter_values = max_numeric_parameter_values
+        self.max_query_combinations_per_path = max_query_combinations_per_path
+        self.max_stale_link_yield_pages = max_stale_link_yield_pages
+        self.stale_link_yield_blocked_urls = stale_link_yield_blocked_urls
+        self.max_content_hashes_per_host = max_content_hashes_per_host
+
+class ScraperBudgetConfig:
+    def __init__(self, *,
+                max_urls_per_host: int | None = None,
+                max_urls_per_path_prefix: dict[str, int] | None = None):
+        self.max_urls_per_host = max_urls_per_host
+        self.max_urls_per_path_prefix = max_urls_per_path_prefix if max_urls_per_path_prefix is not None else {}
+
+class ScraperAdaptiveConcurrencyConfig:
+    def __init__(self, *,
+                initial_requests_per_host: int = 2,
+                target_latency_seconds: float = 2.0,
+                additive_increase: float = 1.0,
+                multiplicative_decrease: float = 0.5):
+        self.initial_requests_per_host = initial_requests_per_host
+        self.target_latency_seconds = target_latency_seconds
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+
+class ScraperRetryConfig:
+    def __init__(self, *,
+                max_retries: int = 2,
+                base_delay_seconds: float = 1.0,
+                max_delay_seconds: float = 60.0):
+        self.max_retries = max_retries
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+
+class ScraperBandwidthConfig:
+    def __init__(self, *,
+                bytes_per_second: float | None = None,
+                burst_bytes: float | None = None,
+                bytes_per_second_per_host: float | None = None,
+                burst_bytes_per_host: float | None = None):
+        self.bytes_per_second = bytes_per_second
+        self.burst_bytes = burst_bytes
+        self.bytes_per_second_per_host = bytes_per_second_per_host
+        self.burst_bytes_per_host = burst_bytes_per_host
+
+class ScraperAutoThrottleConfig:
+    def __init__(self, *,
+                target_concurrency: float = 1.0,
+                start_delay_seconds: float = 5.0,
+                max_delay_seconds: float = 60.0):
+        self.target_concurrency = target_concurrency
+        self.start_delay_seconds = start_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+
+class ScraperSitemapConfig:
+    def __init__(self, *,
+                max_parallel_requests: int = 4,
+                max_parallel_requests_per_host: int = 2):
+        self.max_parallel_requests = max_parallel_requests
+        self.max_parallel_requests_per_host = max_parallel_requests_per_host
+
+class ScraperFeedPollConfig:
+    def __init__(self, *,
+                min_interval_seconds: float = 5 * 60.0,
+                max_interval_seconds: float = 24 * 60 * 60.0,
+                default_interval_seconds: float = 60 * 60.0,
+                no_new_items_factor: float = 1.5,
+                max_seen_items: int = 1000):
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.default_interval_seconds = default_interval_seconds
+        self.no_new_items_factor = no_new_items_factor
+        self.max_seen_items = max_seen_items
+
+class ScraperRecrawlConfig:
+    def __init__(self, *,
+                min_interval_seconds: float = 5 * 60.0,
+                max_interval_seconds: float = 30 * 24 * 60 * 60.0,
+                default_interval_seconds: float = 24 * 60 * 60.0,
+                change_factor: float = 0.5,
+                no_change_factor: float = 1.5):
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.default_interval_seconds = default_interval_seconds
+        self.change_factor = change_factor
+        self.no_change_factor = no_change_factor
         
 class ScraperConfig:
     def __init__(self, *, 
@@ -81,12 +197,29 @@ class ScraperConfig:
                 prevent_default_queuing: bool = False,
                 max_requested_urls: int = 64 * 1024,
                 max_back_to_back_errors: int = 128,                
+                circuit_breaker_cooldown_seconds: int = 60,
+                circuit_breaker_max_trips: int = 5,
                 on_response_callback: ScraperResponseCallback | None = None,
                 max_depth: int = 16,
                 crawl_delay_seconds: int = 1,
                 domain_config: ScraperDomainConfig = ScraperDomainConfig(
                     allowance=ScraperDomainConfigMode.DIREVE_FROM_SEED_URLS
                 ),                
+                trap_config: ScraperTrapConfig | None = None,
+                budget_config: ScraperBudgetConfig | None = None,
+                adaptive_concurrency_config: ScraperAdaptiveConcurrencyConfig | None = None,
+                retry_config: ScraperRetryConfig | None = ScraperRetryConfig(),
+                bandwidth_config: ScraperBandwidthConfig | None = None,
+                auto_throttle_config: ScraperAutoThrottleConfig | None = None,
+                sitemap_config: ScraperSitemapConfig | None = ScraperSitemapConfig(),
+                incremental: bool = False,
+                recrawl_config: ScraperRecrawlConfig | None = None,
+                feed_poll_config: ScraperFeedPollConfig | None = None,
+                robots_cache: RobotsCache | None = None,
+                prefetch_domain_metadata: bool = True,
+                max_parallel_prefetch_requests: int = 8,
+                dns_cache_ttl_seconds: int = 300,
+                collect_domain_stats: bool = True,
                 user_agent: str = 'pyminiscraper',
                 referer: str = "https://www.google.com",) -> None:
         self.seed_urls = seed_urls
@@ -107,7 +240,24 @@ class ScraperConfig:
         self.user_agent = user_agent
         self.referer = referer
         self.max_back_to_back_errors = max_back_to_back_errors
+        self.circuit_breaker_cooldown_seconds = circuit_breaker_cooldown_seconds
+        self.circuit_breaker_max_trips = circuit_breaker_max_trips
         self.domain_config = domain_config
+        self.trap_config = trap_config
+        self.budget_config = budget_config
+        self.adaptive_concurrency_config = adaptive_concurrency_config
+        self.retry_config = retry_config
+        self.bandwidth_config = bandwidth_config
+        self.auto_throttle_config = auto_throttle_config
+        self.sitemap_config = sitemap_config
+        self.incremental = incremental
+        self.recrawl_config = recrawl_config
+        self.feed_poll_config = feed_poll_config
+        self.robots_cache = robots_cache
+        self.prefetch_domain_metadata = prefetch_domain_metadata
+        self.max_parallel_prefetch_requests = max_parallel_prefetch_requests
+        self.dns_cache_ttl_seconds = dns_cache_ttl_seconds
+        self.collect_domain_stats = collect_domain_stats
 
     async def log(self, text: str) -> None:
         logger.info(text)        
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional
+from dateutil import parser as dateutil_parser
+
+
+def parse_date(value: str) -> Optional[datetime]:
+    """
+    Parses dates found in feeds, sitemaps and page metadata, returns None if the value is not a date:
+    - ISO 8601 / W3C datetime, as used by Atom, sitemaps and schema.org, goes through datetime.fromisoformat.
+    - RFC 822, as used by RSS pubDate, goes through email.utils.parsedate_to_datetime.
+    - Anything else falls back to dateutil, which is an order of magnitude slower.
+    Results are always timezone aware, values without a timezone (or with RFC 822 -0000) are taken as UTC.
+    Values without a year take the current one.
+    """
+    return _parse_date(value, datetime.now().year)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value: str, year: int) -> Optional[datetime]:
+    # cached per year, feeds and sitemaps often repeat the same timestamps
+    parsed = _parse_naive_or_aware_date(value, year)
+    if parsed is not None and parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _parse_naive_or_aware_date(value: str, year: int) -> Optional[datetime]:
+    value = value.strip()
+    if not value:
+        return None
+    if value[0].isdigit():
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    if ',' in value or value[0].isdigit():
+        try:
+            return parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            pass
+    try:
+        # missing fields start at the beginning of the period, so partial W3C dates such as "2024-05" start on the 1st
+        return dateutil_parser.parse(value, default=datetime(year, 1, 1))
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def parse_optional_date(value: Optional[str]) -> Optional[datetime]:
+    return parse_date(value) if value else None
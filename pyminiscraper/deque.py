@@ -1,6 +1,7 @@
 import asyncio
+import heapq
 from collections import deque
-from typing import Deque, TypeVar, Generic
+from typing import Awaitable, Callable, Deque, Iterable, List, Tuple, TypeVar, Generic
 
 T = TypeVar('T')
 
@@ -22,6 +23,20 @@ class AsyncDeque(Generic[T]):
             self._deque.appendleft(item)
             self._condition.notify()
 
+    async def extendright(self, items: Iterable[T]) -> None:
+        """Add items to the right end of the deque, taking the lock once and waking a waiter per item."""
+        async with self._condition:
+            count = len(self._deque)
+            self._deque.extend(items)
+            self._condition.notify(len(self._deque) - count)
+
+    async def extendleft(self, items: Iterable[T]) -> None:
+        """Add items to the left end of the deque one after another, so the first item ends up closest to the right end."""
+        async with self._condition:
+            count = len(self._deque)
+            self._deque.extendleft(items)
+            self._condition.notify(len(self._deque) - count)
+
     async def popright(self) -> T:
         """
         Remove and return an item from the right end.
@@ -41,3 +56,44 @@ class AsyncDeque(Generic[T]):
             while not self._deque:
                 await self._condition.wait()
             return self._deque.popleft()
+
+
+class AsyncDelayedQueue(Generic[T]):
+    def __init__(self, on_ready: Callable[[T], Awaitable[None]]) -> None:
+        # Heap of (ready time, sequence, item), sequence keeps ordering stable for equal times
+        self._heap: List[Tuple[float, int, T]] = []
+        self._sequence = 0
+        self._on_ready = on_ready
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, item: T, delay_seconds: float) -> None:
+        """Schedule an item to be handed to on_ready after the delay."""
+        ready_time = asyncio.get_event_loop().time() + max(0.0, delay_seconds)
+        heapq.heappush(self._heap, (ready_time, self._sequence, item))
+        self._sequence += 1
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """
+        Hand items to on_ready as their delays expire.
+        Runs until cancelled, sleeping until the earliest item is ready.
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            self._wakeup.clear()
+            timeout: float | None = None
+            while self._heap:
+                ready_time = self._heap[0][0]
+                now = loop.time()
+                if ready_time > now:
+                    timeout = ready_time - now
+                    break
+                _, _, item = heapq.heappop(self._heap)
+                await self._on_ready(item)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
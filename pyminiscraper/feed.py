@@ -1,11 +1,13 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, cast
 import xml.etree.ElementTree as ET
 import aiohttp
 import logging
-from .rss import RssError, RssParser
-from .atom import AtomParser, AtomLink
+from .rss import RssError
+from .fetch import FetchStatusError, iter_body
+from .bandwidth import BandwidthLimiter
+from .dates import parse_optional_date
 
 logger = logging.getLogger("feed")
 
@@ -18,69 +20,197 @@ class Item:
     link: Optional[str]
     description: Optional[str]
     pub_date: Optional[datetime]
+    guid: Optional[str] = None
 
 
 @dataclass
 class Feed:
     items: List[Item]
+    # validators of the response, sent back on the next conditional request
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+RSS1_NAMESPACE = 'http://purl.org/rss/1.0/'
+ATOM_NAMESPACE = 'http://www.w3.org/2005/Atom'
+DC_NAMESPACE = 'http://purl.org/dc/elements/1.1/'
+CONTENT_NAMESPACE = 'http://purl.org/rss/1.0/modules/content/'
+# item fields are only read from these namespaces, so extensions such as media:title or atom:link do not shadow them
+RSS_NAMESPACES = ('', RSS1_NAMESPACE)
+ATOM_NAMESPACES = ('', ATOM_NAMESPACE)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _split_tag(tag: str) -> Tuple[str, str]:
+    if tag.startswith('{'):
+        namespace, name = tag[1:].split('}', 1)
+        return namespace, name
+    return '', tag
+
+
+def _text(elem: ET.Element) -> Optional[str]:
+    text = ''.join(elem.itertext()).strip()
+    return text or None
+
+
+class FeedStreamParser:
+    """
+    Incremental RSS 2.0, RSS 1.0 (RDF) and Atom parser with memory bounded by the size of one item:
+    - The format is sniffed from the root element, the Content-Type header is not trusted.
+    - Bytes are fed as they arrive, items are returned as soon as their closing tag is seen.
+    - Each item is read in one pass over its direct children, then cleared from the tree.
+    """
+    # root element local name -> (depth of item elements, item element local name)
+    FORMATS = {
+        'rss': (3, 'item'),
+        'RDF': (2, 'item'),
+        'feed': (2, 'entry'),
+    }
+
+    def __init__(self) -> None:
+        self.parser: ET.XMLPullParser[ET.Element] = ET.XMLPullParser(events=('start', 'end'))
+        self.format: Optional[str] = None
+        self.item_depth = 0
+        self.item_name = ''
+        self.depth = 0
+        self.container: Optional[ET.Element] = None
+
+    def feed(self, data: bytes | str) -> List[Item]:
+        self.parser.feed(data)
+        return self._read_events()
+
+    def close(self) -> List[Item]:
+        self.parser.close()
+        return self._read_events()
+
+    def _read_events(self) -> List[Item]:
+        items: List[Item] = []
+        # only start and end events are requested, so every event carries an element
+        for event, elem in cast(Iterator[Tuple[str, ET.Element]], self.parser.read_events()):
+            if event == 'start':
+                self.depth += 1
+                if self.format is None:
+                    self._start_root(elem)
+                if self.depth == self.item_depth - 1:
+                    self.container = elem
+                continue
+            if self.depth == self.item_depth:
+                if _local_name(elem.tag) == self.item_name:
+                    items.append(self._parse_entry(elem) if self.format == 'feed' else self._parse_item(elem))
+                assert self.container is not None
+                self.container.clear()
+            self.depth -= 1
+        return items
+
+    def _start_root(self, root: ET.Element) -> None:
+        name = _local_name(root.tag)
+        if name not in self.FORMATS:
+            raise FeedError(f"Unsupported feed format {name}")
+        self.format = name
+        self.item_depth, self.item_name = self.FORMATS[name]
+
+    def _parse_item(self, elem: ET.Element) -> Item:
+        """RSS 2.0 and RSS 1.0 item, dc:date and content:encoded fill in missing pubDate and description"""
+        fields: dict[str, str] = {}
+        for child in elem:
+            namespace, name = _split_tag(child.tag)
+            if namespace == DC_NAMESPACE:
+                name = f"dc:{name}"
+            elif namespace == CONTENT_NAMESPACE:
+                name = f"content:{name}"
+            elif namespace not in RSS_NAMESPACES:
+                continue
+            text = _text(child)
+            if text is not None and name not in fields:
+                fields[name] = text
+        return Item(
+            title=fields.get('title'),
+            link=fields.get('link'),
+            description=fields.get('description') or fields.get('content:encoded'),
+            pub_date=parse_optional_date(fields.get('pubDate') or fields.get('dc:date')),
+            guid=fields.get('guid') or elem.get('{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about'),
+        )
+
+    def _parse_entry(self, elem: ET.Element) -> Item:
+        """Atom entry, the link is the alternate link preferring text/html"""
+        fields: dict[str, str] = {}
+        link: Optional[str] = None
+        link_is_html = False
+        for child in elem:
+            namespace, name = _split_tag(child.tag)
+            if namespace not in ATOM_NAMESPACES:
+                continue
+            if name == 'link':
+                if child.get('rel', 'alternate') == 'alternate' and not link_is_html \
+                    and (link is None or child.get('type') == 'text/html'):
+                    link = child.get('href')
+                    link_is_html = child.get('type') == 'text/html'
+            elif name not in fields:
+                text = _text(child)
+                if text is not None:
+                    fields[name] = text
+        return Item(
+            title=fields.get('title'),
+            link=link,
+            description=fields.get('content') or fields.get('summary'),
+            pub_date=parse_optional_date(fields.get('published') or fields.get('updated')),
+            guid=fields.get('id'),
+        )
 
 
 class FeedParser:
     def __init__(self, session: aiohttp.ClientSession):
         self.session = session
-        
-    def from_rss(self, xml_content_bytes: bytes) -> Feed:
-        rss_parser = RssParser(self.session)
-        rss_feed = rss_parser.parse(xml_content_bytes)
-        items = []
-        for rss_item in rss_feed.items:
-            items.append(Item(
-                title=rss_item.title,
-                link=rss_item.link,
-                description=rss_item.description,
-                pub_date=rss_item.pub_date
-            ))
-        return Feed(items=items)
-    
-    def from_atom(self, xml_content_bytes: bytes) -> Feed:
-        atom_parser = AtomParser()
-        atom_feed = atom_parser.parse(xml_content_bytes)
-        items = []
-        for atom_entry in atom_feed.entries:
-            items.append(Item(
-                title=atom_entry.title,
-                link=self._get_link(atom_entry.links) if atom_entry.links else None,
-                description=atom_entry.content,
-                pub_date=atom_entry.published
-            ))
-        return Feed(items=items)
-    
-    def _get_link(self, links: list[AtomLink]|None) -> Optional[str]:
-        if links:
-            for link in links:
-                if link.type == 'text/html':
-                    return link.href
-        return None
-        
-    
+
+    def parse(self, xml_content_bytes: bytes) -> Feed:
+        parser = FeedStreamParser()
+        try:
+            return Feed(items=parser.feed(xml_content_bytes) + parser.close())
+        except ET.ParseError as e:
+            raise FeedError(f"Failed to parse feed XML: {str(e)}") from e
+
+    # the format is sniffed from the document, both are kept for existing callers
+    from_rss = parse
+    from_atom = parse
+
+    @staticmethod
+    def conditional_headers(etag: Optional[str], last_modified: Optional[str]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    @staticmethod
+    async def _iter_items(response: aiohttp.ClientResponse, bandwidth_limiter: Optional[BandwidthLimiter]) -> AsyncIterator[Item]:
+        """Yields items as they are parsed while the body downloads, whatever the Content-Type of the response"""
+        parser = FeedStreamParser()
+        async for chunk in iter_body(response, bandwidth_limiter):
+            for item in parser.feed(chunk):
+                yield item
+        for item in parser.close():
+            yield item
+
     @classmethod
-    async def download_and_parse(cls, normalized_url: str, session: aiohttp.ClientSession) -> Feed:
+    async def download_and_parse(cls, normalized_url: str, session: aiohttp.ClientSession, bandwidth_limiter: Optional[BandwidthLimiter] = None,
+                                 etag: Optional[str] = None, last_modified: Optional[str] = None) -> Feed:
+        """
+        Downloads and parses the feed. If etag or last_modified are given the request is conditional,
+        and a 304 response returns an empty feed marked not_modified.
+        """
         try:
-            async with session.get(normalized_url) as response:
+            async with session.get(normalized_url, headers=cls.conditional_headers(etag, last_modified)) as response:
+                if response.status == 304:
+                    return Feed(items=[], etag=etag, last_modified=last_modified, not_modified=True)
                 if response.status != 200:
-                    raise ValueError(f"Failed to download rss {normalized_url} status: {response.status}")
-                
-                content_type = response.content_type
-                if not content_type:
-                    raise ValueError(f"Failed to identify content for {normalized_url}")
-                
-                if 'rss' in content_type:
-                    return cls(session).from_rss(await response.read())
-                elif 'xml' in content_type:
-                    return cls(session).from_atom(await response.read())                
-                else:
-                    raise ValueError(f"Unknown content {content_type} for {normalized_url}")
-                
+                    raise FetchStatusError(f"Failed to download rss {normalized_url} status: {response.status}", response.status, response.headers)
+                items = [item async for item in cls._iter_items(response, bandwidth_limiter)]
+                return Feed(items=items, etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'))
         except Exception as e:
             logger.error(f"Error fetching {normalized_url}: {e}")
-            raise RssError(f"""Failed to fetch rss from {normalized_url}""") from e                    
+            raise RssError(f"""Failed to fetch rss from {normalized_url}""") from e
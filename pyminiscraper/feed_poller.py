@@ -0,0 +1,134 @@
+from typing import Any, Collection, Dict, List, Optional
+import logging
+from .feed import Feed, Item
+
+logger = logging.getLogger("feed_poller")
+
+
+def item_key(item: Item) -> Optional[str]:
+    return item.guid or item.link
+
+
+class FeedPollState:
+    def __init__(self, *,
+                 interval_seconds: float,
+                 etag: Optional[str] = None,
+                 last_modified: Optional[str] = None,
+                 seen_item_keys: Optional[List[str]] = None,
+                 published_at: Optional[List[float]] = None) -> None:
+        self.interval_seconds = interval_seconds
+        self.etag = etag
+        self.last_modified = last_modified
+        # insertion ordered, so the oldest keys are dropped first
+        self.seen_item_keys: Dict[str, None] = dict.fromkeys(seen_item_keys or [])
+        # timestamps of the most recent publications, oldest first
+        self.published_at: List[float] = published_at or []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'interval_seconds': self.interval_seconds,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'seen_item_keys': list(self.seen_item_keys),
+            'published_at': self.published_at,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "FeedPollState":
+        return cls(
+            interval_seconds=d['interval_seconds'],
+            etag=d['etag'],
+            last_modified=d['last_modified'],
+            seen_item_keys=d['seen_item_keys'],
+            published_at=d['published_at'],
+        )
+
+
+class FeedPoller:
+    """
+    Keeps the polling state of each feed in feed polling mode:
+    - ETag and Last-Modified of the last response are sent back, so unchanged feeds answer 304.
+    - Items already seen, by guid or link, are dropped, so only new items are queued.
+      The oldest seen keys are forgotten past max_seen_items, but never while the feed still lists them.
+    - The poll interval is half the average gap between recent publications,
+      and grows by no_new_items_factor after polls and failures without new items.
+    """
+    def __init__(self, *,
+                 min_interval_seconds: float = 5 * 60.0,
+                 max_interval_seconds: float = 24 * 60 * 60.0,
+                 default_interval_seconds: float = 60 * 60.0,
+                 no_new_items_factor: float = 1.5,
+                 max_seen_items: int = 1000,
+                 max_publications: int = 10) -> None:
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.default_interval_seconds = default_interval_seconds
+        self.no_new_items_factor = no_new_items_factor
+        self.max_seen_items = max_seen_items
+        self.max_publications = max_publications
+        self.states: Dict[str, FeedPollState] = {}
+
+    def _clamp(self, interval_seconds: float) -> float:
+        return max(self.min_interval_seconds, min(self.max_interval_seconds, interval_seconds))
+
+    def state(self, normalized_url: str) -> FeedPollState:
+        state = self.states.get(normalized_url)
+        if state is None:
+            state = FeedPollState(interval_seconds=self._clamp(self.default_interval_seconds))
+            self.states[normalized_url] = state
+        return state
+
+    def new_items(self, normalized_url: str, feed: Feed) -> List[Item]:
+        """Returns the items of a poll response not seen before, without changing the feed state"""
+        seen_item_keys = self.state(normalized_url).seen_item_keys
+        batch_keys: set[str] = set()
+        new_items: List[Item] = []
+        for item in feed.items:
+            key = item_key(item)
+            if key is not None:
+                if key in seen_item_keys or key in batch_keys:
+                    continue
+                batch_keys.add(key)
+            new_items.append(item)
+        return new_items
+
+    def listed_item_keys(self, feed: Feed) -> List[str]:
+        return [key for key in map(item_key, feed.items) if key is not None]
+
+    def record_poll(self, normalized_url: str, feed: Feed, listed_item_keys: Collection[str] = ()) -> float:
+        """
+        Commits a poll once its new items were delivered: stores the validators, marks the items seen
+        and returns the delay before the next poll. Until then a failed delivery is retried with the same items.
+        listed_item_keys are the keys of every item in the poll response, they stay seen while the feed lists them.
+        """
+        state = self.state(normalized_url)
+        if not feed.not_modified:
+            state.etag = feed.etag
+            state.last_modified = feed.last_modified
+        for item in feed.items:
+            key = item_key(item)
+            if key is not None:
+                state.seen_item_keys[key] = None
+        excess = len(state.seen_item_keys) - self.max_seen_items
+        if excess > 0:
+            listed = set(listed_item_keys)
+            for key in [key for key in state.seen_item_keys if key not in listed][:excess]:
+                del state.seen_item_keys[key]
+
+        if not feed.items:
+            state.interval_seconds = self._clamp(state.interval_seconds * self.no_new_items_factor)
+            return state.interval_seconds
+        # undated items say nothing about the publishing rate
+        published_at = [item.pub_date.timestamp() for item in feed.items if item.pub_date]
+        state.published_at = sorted(state.published_at + published_at)[-self.max_publications:]
+        if published_at and len(state.published_at) >= 2:
+            average_gap = (state.published_at[-1] - state.published_at[0]) / (len(state.published_at) - 1)
+            state.interval_seconds = self._clamp(average_gap / 2)
+        logger.debug(f"new feed items - {normalized_url} - count: {len(feed.items)} next poll in {state.interval_seconds:.0f}s")
+        return state.interval_seconds
+
+    def record_failure(self, normalized_url: str) -> float:
+        """Backs the feed off after a failed poll and returns the delay before the next one"""
+        state = self.state(normalized_url)
+        state.interval_seconds = self._clamp(state.interval_seconds * self.no_new_items_factor)
+        return state.interval_seconds
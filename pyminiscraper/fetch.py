@@ -0,0 +1,151 @@
+import asyncio
+import zlib
+from typing import AsyncIterator, Mapping, Optional
+import aiohttp
+from .bandwidth import BandwidthLimiter
+
+
+class FetchStatusError(Exception):
+    """Raised when a response has an unexpected HTTP status"""
+    def __init__(self, message: str, status: int, headers: Optional[Mapping[str, str]] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def error_chain(error: BaseException) -> list[BaseException]:
+    chain: list[BaseException] = []
+    current: Optional[BaseException] = error
+    while current is not None and current not in chain:
+        chain.append(current)
+        current = current.__cause__ or current.__context__
+    return chain
+
+
+def find_status_error(error: BaseException) -> Optional[FetchStatusError]:
+    for e in error_chain(error):
+        if isinstance(e, FetchStatusError):
+            return e
+    return None
+
+
+def find_status(error: BaseException) -> Optional[int]:
+    for e in error_chain(error):
+        if isinstance(e, FetchStatusError):
+            return e.status
+        if isinstance(e, aiohttp.ClientResponseError):
+            return e.status
+    return None
+
+
+def is_timeout_error(error: BaseException) -> bool:
+    return any(isinstance(e, (asyncio.TimeoutError, aiohttp.ServerTimeoutError)) for e in error_chain(error))
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Timeouts, 429 and 5xx responses signal that the host is overloaded"""
+    if is_timeout_error(error):
+        return True
+    status = find_status(error)
+    return status is not None and (status == 429 or status >= 500)
+
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+async def iter_body(response: aiohttp.ClientResponse, bandwidth_limiter: Optional[BandwidthLimiter] = None) -> AsyncIterator[bytes]:
+    """Yields the response body in chunks as they arrive, passing them through the bandwidth limiter if given"""
+    host = response.url.host or ''
+    async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+        if bandwidth_limiter is not None:
+            await bandwidth_limiter.consume(host, len(chunk))
+        yield chunk
+
+
+async def read_body(response: aiohttp.ClientResponse, bandwidth_limiter: Optional[BandwidthLimiter] = None) -> bytes:
+    """Reads the response body, streaming it through the bandwidth limiter if given"""
+    if bandwidth_limiter is None:
+        return await response.read()
+    chunks: list[bytes] = []
+    async for chunk in iter_body(response, bandwidth_limiter):
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+async def read_text(response: aiohttp.ClientResponse, bandwidth_limiter: Optional[BandwidthLimiter] = None) -> str:
+    if bandwidth_limiter is None:
+        return await response.text()
+    body = await read_body(response, bandwidth_limiter)
+    return body.decode(response.charset or 'utf-8', errors='replace')
+
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class DecompressionLimitError(Exception):
+    """Raised when a compressed body expands beyond the allowed size"""
+    pass
+
+
+class TruncatedBodyError(Exception):
+    """Raised when a gzip body ends in the middle of a member"""
+    pass
+
+
+async def iter_decompressed(chunks: AsyncIterator[bytes], max_bytes: int = 256 * 1024 * 1024) -> AsyncIterator[bytes]:
+    """
+    Yields the body with gzip compression removed, detected by the gzip magic bytes.
+    Bodies that are not gzipped, including ones aiohttp already decoded from Content-Encoding, pass through unchanged.
+    Output is produced in chunks of at most READ_CHUNK_SIZE, so a small compressed chunk cannot expand in memory at once.
+    Concatenated gzip members are decompressed in turn, trailing padding is dropped and a truncated member raises.
+    """
+    # bytes not yet known to start a gzip member, before the first member or between members
+    head = b''
+    gzipped = False
+    padding = False
+    decompressor: Optional['zlib._Decompress'] = None
+    total_bytes = 0
+    async for chunk in chunks:
+        if padding:
+            continue
+        if not gzipped:
+            head += chunk
+            if len(head) < len(GZIP_MAGIC):
+                continue
+            if not head.startswith(GZIP_MAGIC):
+                yield head
+                async for chunk in chunks:
+                    yield chunk
+                return
+            gzipped = True
+            data, head = head, b''
+        else:
+            data, head = head + chunk, b''
+        while True:
+            if decompressor is None:
+                if len(data) < len(GZIP_MAGIC):
+                    # the next member header may be split across network chunks
+                    head = data
+                    break
+                if not data.startswith(GZIP_MAGIC):
+                    padding = True
+                    break
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            output = decompressor.decompress(data, READ_CHUNK_SIZE)
+            if decompressor.eof:
+                data = decompressor.unused_data
+                decompressor = None
+            else:
+                data = decompressor.unconsumed_tail
+            if output:
+                total_bytes += len(output)
+                if total_bytes > max_bytes:
+                    raise DecompressionLimitError(f"Decompressed body exceeds {max_bytes} bytes")
+                yield output
+            elif not data and decompressor is not None:
+                break
+    if not gzipped:
+        if head:
+            yield head
+    elif decompressor is not None:
+        raise TruncatedBodyError("Gzip body ends in the middle of a member")
@@ -1,17 +1,61 @@
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
+from typing import Any, Dict, Iterable
 from .config import ScraperDomainConfig, ScraperDomainConfigMode, ScraperAllowedDomains
 import re
 from .robots import robots_txt_pattern_compile
 from .url import normalize_url
 
+class DomainTrie:
+    """
+    Set of domains stored as a trie of reversed labels, "www.example.com" is stored as com -> example -> www.
+    A host matches a domain if it is the domain itself or one of its subdomains, so "example.com"
+    matches "a.example.com" but not "notexample.com".
+    """
+    TERMINAL = '.'
+
+    def __init__(self, domains: Iterable[str] = ()) -> None:
+        self.root: Dict[str, Any] = {}
+        self.size = 0
+        for domain in domains:
+            self.add(domain)
+
+    def add(self, domain: str) -> None:
+        domain = domain.strip().lower().strip('.')
+        domain = domain.partition(':')[0]
+        # normalized urls have no leading www label
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        if not domain:
+            return
+        node = self.root
+        for label in reversed(domain.split('.')):
+            node = node.setdefault(label, {})
+        if self.TERMINAL not in node:
+            node[self.TERMINAL] = True
+            self.size += 1
+
+    def matches(self, host: str) -> bool:
+        node = self.root
+        for label in reversed(host.split('.')):
+            child = node.get(label)
+            if child is None:
+                return False
+            node = child
+            if self.TERMINAL in node:
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return self.size
+
+
 class DomainFilter:
     def __init__(self, domain_config: ScraperDomainConfig, urls: list[str] = [])-> None:
-        self.forbidden_domains = domain_config.forbidden_domains
-        self.allowed_domains: set[str]|None = set()        
+        self.forbidden_domains = DomainTrie(domain_config.forbidden_domains)
+        self.allowed_domains: DomainTrie|None = DomainTrie()
         if domain_config.allowance == ScraperDomainConfigMode.DIREVE_FROM_SEED_URLS:
             for url in urls:
-                normalized_url = normalize_url(url)
-                self.allowed_domains.add(urlparse(normalized_url).netloc)
+                self.allowed_domains.add(urlsplit(normalize_url(url)).hostname or '')
         elif domain_config.allowance == ScraperDomainConfigMode.ALLOW_ALL:
             self.allowed_domains = None
         elif isinstance(domain_config.allowance, ScraperAllowedDomains):
@@ -20,43 +64,88 @@ class DomainFilter:
         else:
             raise ValueError("Unsupported domain config mode")
                 
-        if domain_config.forbidden_domains:
-            self.forbidden_domains = domain_config.forbidden_domains
-                
     def is_allowed(self, url: str)-> bool:
-        url = normalize_url(url)
-        domain = urlparse(url).netloc
-        if self.forbidden_domains:
-            for forbidden_domain in self.forbidden_domains:
-                if domain.endswith(forbidden_domain):
-                    return False
+        host = urlsplit(url).hostname or ''
+        if host.startswith('www.'):
+            host = host[4:]
+        if len(self.forbidden_domains) and self.forbidden_domains.matches(host):
+            return False
                 
         if self.allowed_domains is None or len(self.allowed_domains) == 0:
             return True
         
-        for allowed_domain in self.allowed_domains:
-            if domain.endswith(allowed_domain):
+        return self.allowed_domains.matches(host)
+    
+URL_PATH_PATTERN = re.compile(r'(?:[a-zA-Z][a-zA-Z0-9+.-]*://[^/?#]*)?([^?#]*)')
+
+def url_path(url: str) -> str:
+    """Same as urlparse(url).path without building the whole parse result"""
+    path = URL_PATH_PATTERN.match(url).group(1)  # type: ignore[union-attr]
+    params_start = path.find(';', path.rfind('/') + 1)
+    if params_start >= 0:
+        path = path[:params_start]
+    return path
+
+
+class PrefixSet:
+    """Set of string prefixes, a lookup costs one set probe per distinct prefix length"""
+    def __init__(self, prefixes: Iterable[str]) -> None:
+        self.prefixes = set(prefixes)
+        self.lengths = sorted({len(prefix) for prefix in self.prefixes})
+
+    def matches(self, value: str) -> bool:
+        prefixes = self.prefixes
+        for length in self.lengths:
+            if length > len(value):
+                return False
+            if value[:length] in prefixes:
                 return True
-        
         return False
-    
+
+
 class PathFilter:
+    """
+    Matches url paths against robots.txt style patterns in one pass:
+    - Literal patterns are prefix matched with one set lookup per distinct pattern length.
+    - Literal patterns ending with $ are matched exactly with a set lookup.
+    - Remaining wildcard patterns are combined into one alternation regex, which only runs
+      when the path starts with the literal prefix of one of them.
+    """
     def __init__(self, path_filters: list[str], default_value: bool = True)-> None:
-        self.path_filter_patterns: list[re.Pattern] = []
         self.default_value = default_value
+        self.has_patterns = bool(path_filters)
+        prefixes: list[str] = []
+        self.exact_paths: set[str] = set()
+        wildcard_patterns: list[str] = []
+        wildcard_prefixes: list[str] = []
         for path_filter in path_filters:
-            self.path_filter_patterns.append(robots_txt_pattern_compile(path_filter))
+            path = path_filter if path_filter.startswith('/') else '/' + path_filter
+            literal = path.rstrip('*')
+            if not any(char in literal for char in '*$^'):
+                prefixes.append(literal)
+            elif literal.endswith('$') and not any(char in literal[:-1] for char in '*$^'):
+                self.exact_paths.add(literal[:-1])
+            else:
+                wildcard_patterns.append(robots_txt_pattern_compile(path_filter).pattern)
+                wildcard_prefixes.append(re.split(r'[*$^]', path, maxsplit=1)[0])
+        self.prefixes = PrefixSet(prefixes)
+        self.wildcard_prefixes = PrefixSet(wildcard_prefixes)
+        self.wildcard_pattern: re.Pattern | None = None
+        if wildcard_patterns:
+            self.wildcard_pattern = re.compile('|'.join(f"(?:{pattern})" for pattern in wildcard_patterns))
             
     def is_passing(self, url: str)-> bool:
-        if not self.path_filter_patterns:
+        if not self.has_patterns:
             return self.default_value
         
-        path = urlparse(url).path
+        path = url_path(url)
         if not path.startswith('/'):
             path = "/" + path
                     
-        for path_filter_pattern in self.path_filter_patterns:
-            if path_filter_pattern.fullmatch(path):
-                return True
-        return False
-        
\ No newline at end of file
+        if self.prefixes.matches(path):
+            return True
+        if path in self.exact_paths:
+            return True
+        return self.wildcard_pattern is not None \
+            and self.wildcard_prefixes.matches(path) \
+            and self.wildcard_pattern.fullmatch(path) is not None
@@ -15,6 +15,10 @@ def generate_url_safe_id(input_string:str)->str:
     base64_encoded = base64.urlsafe_b64encode(sha256_hash.digest()).decode('utf-8')
     return base64_encoded[:32]
 
+def url_fingerprint(normalized_url: str) -> int:
+    """Fast 64-bit fingerprint of a normalized url for in-memory sets and indexes, not stable across hash algorithms"""
+    return int.from_bytes(hashlib.blake2b(normalized_url.encode(), digest_size=8).digest(), 'little')
+
 def generate_url_safe_hash_for_file(file_path)->str:
     sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
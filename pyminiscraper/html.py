@@ -1,7 +1,6 @@
 from bs4 import BeautifulSoup
-from urllib.parse import urlparse
-from .url import make_absolute_url
-from typing import List, Set
+from .url import make_absolute_url, LinkResolver
+from typing import List
 from bs4.element import Tag
 
 EXCLUDED_EXTENSIONS = (
@@ -29,21 +28,7 @@ class HtmlScraperProcessor:
     @staticmethod
     def is_excluded_url(href: str) -> bool:
         """Determine if a URL should be excluded based on its scheme or file extension."""
-        # Exclude empty hrefs
-        href = href.strip()
-        if not href:
-            return True
-        
-        # Exclude JavaScript links, mailto links, and fragments
-        if href.startswith(('javascript:', 'mailto:', '#')):
-            return True
-        
-        # Exclude URLs with unwanted file extensions
-        parsed_href = urlparse(href)
-        path = parsed_href.path.lower()
-        if any(path.endswith(ext) for ext in EXCLUDED_EXTENSIONS):
-            return True
-        return False
+        return LinkResolver('', EXCLUDED_EXTENSIONS).is_excluded(href.strip())
 
     def extract(self) -> HtmlContent:
         # Determine the canonical URL
@@ -76,13 +61,8 @@ class HtmlScraperProcessor:
                 rss_urls.append(make_absolute_url(self.url, rss_link['href']))                
 
         # Extract outgoing URLs
-        outgoing_urls: Set[str] = set()
-        for a_tag in self.soup.find_all('a', href=True):
-            href = a_tag['href']
-            if self.is_excluded_url(href):
-                continue
-            absolute_href = make_absolute_url(self.url, href)
-            outgoing_urls.add(absolute_href)
+        link_resolver = LinkResolver(self.url, EXCLUDED_EXTENSIONS)
+        outgoing_urls = link_resolver.resolve_all(a_tag['href'] for a_tag in self.soup.find_all('a', href=True))
 
         # Remove images from the soup to exclude them from the text
         for img in self.soup.find_all('img'):
@@ -93,7 +73,7 @@ class HtmlScraperProcessor:
         
         return HtmlContent(
             canonical_url=canonical_url, 
-            outgoing_urls=list(outgoing_urls),
+            outgoing_urls=outgoing_urls,
             visible_text=text_content, 
             sitemap_urls=sitemap_urls, 
             rss_urls=rss_urls, 
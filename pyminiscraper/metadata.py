@@ -3,7 +3,7 @@ from w3lib.html import get_base_url
 from typing import Optional, cast
 from datetime import datetime
 from bs4 import BeautifulSoup, Tag
-from dateutil import parser
+from .dates import parse_date
 from .url import make_absolute_url
 
 class PageMetadata:
@@ -121,7 +121,7 @@ class PageMetadataExtractor:
         """Extract publication date as a datetime object"""
         date_string = self.get_published_date_string()
         if date_string:
-            return parser.parse(date_string)
+            return parse_date(str(date_string))
         return None
 
     def get_all_metadata(self) -> PageMetadata:
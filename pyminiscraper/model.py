@@ -2,6 +2,8 @@ from typing import Dict
 from dataclasses import dataclass
 from datetime import datetime
 from .url import normalize_url, normalized_url_hash as do_normalized_url_hash
+from .hash import url_fingerprint
+from .sitemap import ChangeFrequency
 from enum import Enum
 
 class ScraperUrlType(Enum):
@@ -12,20 +14,26 @@ class ScraperUrlType(Enum):
     
 
 class ScrapeUrlMetadata:
-    def __init__(self, title: str | None, description: str | None, published_at: datetime | None, image_url: str | None):   
+    def __init__(self, title: str | None, description: str | None, published_at: datetime | None, image_url: str | None, *, changefreq: ChangeFrequency | None = None, priority: float | None = None):   
         self.title = title
         self.description = description
         self.published_at = published_at
         self.image_url = image_url
+        # sitemap hints, seed the revisit interval in continuous mode
+        self.changefreq = changefreq
+        self.priority = priority
 
 class ScraperUrl:
-    def __init__(self, url: str, *, max_depth: int = 16, type: ScraperUrlType = ScraperUrlType.HTML, high_priority: bool = False, metadata: ScrapeUrlMetadata | None = None):
+    def __init__(self, url: str, *, max_depth: int = 16, type: ScraperUrlType = ScraperUrlType.HTML, high_priority: bool = False, metadata: ScrapeUrlMetadata | None = None, normalized_url: str | None = None, fingerprint: int | None = None, bypass_cache: bool = False):
         self.url = url
-        self.normalized_url = normalize_url(url)
+        self.normalized_url = normalized_url if normalized_url is not None else normalize_url(url)
+        self.fingerprint = fingerprint if fingerprint is not None else url_fingerprint(self.normalized_url)
         self.max_depth = max_depth
         self.type = type
         self.high_priority = high_priority
         self.metadata = metadata
+        # set when the page is known to have changed since it was stored
+        self.bypass_cache = bypass_cache
 
     @staticmethod
     def create_terminal():
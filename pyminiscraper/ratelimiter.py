@@ -1,31 +1,125 @@
 import asyncio
-from typing import Optional
+from typing import Dict, Optional
+from .robots import RequestRate
 
-# improve rate limiter to compensate for irregular delay
-class CrawlRateLimiter:
-    def __init__(self, crawl_delay_seconds: float) -> None:
-        self.crawl_delay_seconds: float = crawl_delay_seconds
-        self.last_request_time: Optional[float] = None
+class TokenBucket:
+    """
+    Token bucket refilled at rate tokens per second up to burst tokens.
+    Consuming more tokens than available waits until the deficit is refilled.
+    """
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last_refill_time: Optional[float] = None
         self._lock: asyncio.Lock = asyncio.Lock()
 
-    async def acquire(self) -> None:
-        """Acquire permission to make a request"""
+    def _refill(self, current_time: float) -> None:
+        if self.last_refill_time is not None:
+            self.tokens = min(self.burst, self.tokens + (current_time - self.last_refill_time) * self.rate)
+        self.last_refill_time = current_time
+
+    def reset(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = min(self.tokens, burst)
+
+    async def consume(self, amount: float = 1.0) -> None:
+        """Take amount tokens, waiting for the bucket to refill if needed"""
         async with self._lock:
-            current_time: float = asyncio.get_event_loop().time()
-            
-            if self.last_request_time is None:
-                self.last_request_time = current_time
-                return
-            
-            time_since_last_request: float = current_time - self.last_request_time
-            if time_since_last_request < self.crawl_delay_seconds:
-                wait_time: float = self.crawl_delay_seconds - time_since_last_request
-                await asyncio.sleep(wait_time)
-            
-            self.last_request_time = asyncio.get_event_loop().time()
-
-    def reset(self, craw_delay_seconds: float) -> None:
-        """Reset the rate limiter state"""
-        self.crawl_delay_seconds = craw_delay_seconds
-        self.last_request_time = None
-        
+            self._refill(asyncio.get_event_loop().time())
+            self.tokens -= amount
+            if self.tokens < 0:
+                await asyncio.sleep(-self.tokens / self.rate)
+
+
+class HostRateLimiter:
+    """
+    Limits request rate per host with a token bucket built from robots.txt directives:
+    - Request-rate: n/s allows bursts of n requests refilled at n/s requests per second.
+    - Crawl-delay: d allows one request every d seconds.
+    - Without directives the default crawl delay is used.
+    An adaptive delay set by AutoThrottle can only make the host rate stricter.
+    """
+    def __init__(self, default_crawl_delay_seconds: float) -> None:
+        self.default_crawl_delay_seconds = default_crawl_delay_seconds
+        self.robots_rates: Dict[str, tuple[Optional[float], float]] = {}
+        self.adaptive_delays: Dict[str, float] = {}
+        self.buckets: Dict[str, Optional[TokenBucket]] = {}
+
+    def configure(self, host: str, crawl_delay_seconds: Optional[float] = None, request_rate: Optional[RequestRate] = None) -> None:
+        rate: Optional[float] = None
+        burst = 1.0
+        if request_rate is not None and request_rate.requests > 0 and request_rate.seconds > 0:
+            rate = request_rate.requests / request_rate.seconds
+            burst = float(request_rate.requests)
+        if crawl_delay_seconds is None and rate is None:
+            crawl_delay_seconds = self.default_crawl_delay_seconds
+        if crawl_delay_seconds:
+            crawl_delay_rate = 1.0 / crawl_delay_seconds
+            if rate is None or crawl_delay_rate < rate:
+                rate = crawl_delay_rate
+                burst = 1.0
+        self.robots_rates[host] = (rate, burst)
+        self._update_bucket(host)
+
+    def set_adaptive_delay(self, host: str, delay_seconds: float) -> None:
+        self.adaptive_delays[host] = delay_seconds
+        if host not in self.robots_rates:
+            self.configure(host)
+        else:
+            self._update_bucket(host)
+
+    def _update_bucket(self, host: str) -> None:
+        rate, burst = self.robots_rates[host]
+        adaptive_delay = self.adaptive_delays.get(host)
+        if adaptive_delay and (rate is None or 1.0 / adaptive_delay < rate):
+            rate = 1.0 / adaptive_delay
+            burst = 1.0
+        bucket = self.buckets.get(host)
+        if rate is None:
+            self.buckets[host] = None
+        elif bucket is None:
+            self.buckets[host] = TokenBucket(rate, burst)
+        else:
+            bucket.reset(rate, burst)
+
+    async def acquire(self, host: str) -> None:
+        """Acquire permission to make a request to the host"""
+        if host not in self.robots_rates:
+            self.configure(host)
+        bucket = self.buckets[host]
+        if bucket is not None:
+            await bucket.consume()
+
+
+class AutoThrottle:
+    """
+    Adapts crawl delay per host to the observed response latency:
+    - The delay moves towards latency / target_concurrency, averaged with the previous delay.
+    - Failed responses never decrease the delay.
+    - The delay stays between min_delay_seconds and max_delay_seconds.
+    """
+    def __init__(self, *,
+                 min_delay_seconds: float,
+                 start_delay_seconds: float = 5.0,
+                 max_delay_seconds: float = 60.0,
+                 target_concurrency: float = 1.0) -> None:
+        self.min_delay_seconds = min_delay_seconds
+        self.start_delay_seconds = max(min_delay_seconds, start_delay_seconds)
+        self.max_delay_seconds = max_delay_seconds
+        self.target_concurrency = target_concurrency
+        self.delays: Dict[str, float] = {}
+
+    def delay(self, host: str) -> float:
+        return self.delays.get(host, self.start_delay_seconds)
+
+    def record_response(self, host: str, latency_seconds: float, success: bool) -> float:
+        previous_delay = self.delay(host)
+        target_delay = latency_seconds / self.target_concurrency
+        new_delay = max(target_delay, (previous_delay + target_delay) / 2.0)
+        if not success and new_delay < previous_delay:
+            new_delay = previous_delay
+        new_delay = min(self.max_delay_seconds, max(self.min_delay_seconds, new_delay))
+        self.delays[host] = new_delay
+        return new_delay
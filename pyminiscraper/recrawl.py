@@ -0,0 +1,109 @@
+from typing import Dict, Optional
+import hashlib
+import logging
+from .sitemap import ChangeFrequency
+
+logger = logging.getLogger("recrawl")
+
+CHANGE_FREQUENCY_SECONDS: Dict[ChangeFrequency, Optional[float]] = {
+    ChangeFrequency.ALWAYS: 0.0,
+    ChangeFrequency.HOURLY: 60 * 60.0,
+    ChangeFrequency.DAILY: 24 * 60 * 60.0,
+    ChangeFrequency.WEEKLY: 7 * 24 * 60 * 60.0,
+    ChangeFrequency.MONTHLY: 30 * 24 * 60 * 60.0,
+    ChangeFrequency.YEARLY: 365 * 24 * 60 * 60.0,
+    ChangeFrequency.NEVER: None,
+}
+
+
+def content_hash(content: bytes | None) -> Optional[bytes]:
+    if content is None:
+        return None
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class RecrawlState:
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self.content_hash: Optional[bytes] = None
+        self.fetches_count = 0
+        self.changes_count = 0
+
+
+class RecrawlScheduler:
+    """
+    Decides when each url is fetched again in continuous mode:
+    - The first interval comes from the sitemap changefreq, divided by (0.5 + priority) so priority 0.5 keeps it unchanged.
+    - Every fetch compares the content hash with the previous fetch, changed content multiplies the interval
+      by change_factor and unchanged content by no_change_factor.
+    - Failed and skipped fetches back the interval off like unchanged content, so they stay on the schedule.
+    - Intervals are kept between min_interval_seconds and max_interval_seconds, changefreq never is not revisited.
+    """
+    def __init__(self, *,
+                 min_interval_seconds: float = 5 * 60.0,
+                 max_interval_seconds: float = 30 * 24 * 60 * 60.0,
+                 default_interval_seconds: float = 24 * 60 * 60.0,
+                 change_factor: float = 0.5,
+                 no_change_factor: float = 1.5) -> None:
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.default_interval_seconds = default_interval_seconds
+        self.change_factor = change_factor
+        self.no_change_factor = no_change_factor
+        self.states: Dict[str, RecrawlState] = {}
+
+    def _clamp(self, interval_seconds: float) -> float:
+        return max(self.min_interval_seconds, min(self.max_interval_seconds, interval_seconds))
+
+    def initial_interval(self, changefreq: Optional[ChangeFrequency], priority: Optional[float]) -> Optional[float]:
+        """Returns the interval before the first revisit, or None if the url should not be revisited"""
+        interval_seconds = self.default_interval_seconds if changefreq is None else CHANGE_FREQUENCY_SECONDS[changefreq]
+        if interval_seconds is None:
+            return None
+        if priority is not None:
+            interval_seconds /= 0.5 + max(0.0, min(1.0, priority))
+        return self._clamp(interval_seconds)
+
+    def record_fetch(self, normalized_url: str, content_hash: Optional[bytes], *,
+                     changefreq: Optional[ChangeFrequency] = None,
+                     priority: Optional[float] = None) -> Optional[float]:
+        """
+        Records a successful fetch and returns the delay before the url is fetched again,
+        or None if it should not be revisited. A missing content hash leaves the interval unchanged.
+        """
+        state = self.states.get(normalized_url)
+        if state is None:
+            interval_seconds = self.initial_interval(changefreq, priority)
+            if interval_seconds is None:
+                return None
+            state = RecrawlState(interval_seconds)
+            self.states[normalized_url] = state
+        elif content_hash is not None and state.content_hash is not None:
+            if content_hash != state.content_hash:
+                state.changes_count += 1
+                state.interval_seconds = self._clamp(state.interval_seconds * self.change_factor)
+            else:
+                state.interval_seconds = self._clamp(state.interval_seconds * self.no_change_factor)
+        state.fetches_count += 1
+        if content_hash is not None:
+            state.content_hash = content_hash
+        logger.debug(f"revisit scheduled in {state.interval_seconds:.0f}s - {normalized_url}")
+        return state.interval_seconds
+
+    def record_failure(self, normalized_url: str, *,
+                       changefreq: Optional[ChangeFrequency] = None,
+                       priority: Optional[float] = None) -> Optional[float]:
+        """Backs the url off after a failed or skipped fetch and returns the delay before it is tried again"""
+        state = self.states.get(normalized_url)
+        if state is None:
+            interval_seconds = self.initial_interval(changefreq, priority)
+            if interval_seconds is None:
+                return None
+            state = RecrawlState(interval_seconds)
+            self.states[normalized_url] = state
+        else:
+            state.interval_seconds = self._clamp(state.interval_seconds * self.no_change_factor)
+        return state.interval_seconds
+
+    def forget(self, normalized_url: str) -> None:
+        self.states.pop(normalized_url, None)
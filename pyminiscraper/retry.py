@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Dict, Optional
+import random
+import aiohttp
+from .fetch import find_status, find_status_error, is_timeout_error, error_chain
+
+TRANSIENT_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+
+class FailureKind(Enum):
+    TRANSIENT = "transient"
+    PERMANENT = "permanent"
+
+
+def classify_failure(error: BaseException) -> FailureKind:
+    status = find_status(error)
+    if status is not None:
+        return FailureKind.TRANSIENT if status in TRANSIENT_STATUSES else FailureKind.PERMANENT
+    if is_timeout_error(error):
+        return FailureKind.TRANSIENT
+    if any(isinstance(e, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)) for e in error_chain(error)):
+        return FailureKind.TRANSIENT
+    return FailureKind.PERMANENT
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Parses Retry-After header given either as delay seconds or as HTTP date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    status_error = find_status_error(error)
+    if status_error is None:
+        return None
+    return parse_retry_after(status_error.headers.get('Retry-After'))
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed url should be retried and after which delay:
+    - Only transient failures are retried, at most max_retries times per url.
+    - Delay grows exponentially from base_delay_seconds with full jitter.
+    - Retry-After response header is honored as the lower bound of the delay,
+      a url whose Retry-After exceeds max_delay_seconds is given up instead of being held.
+    """
+    def __init__(self, *, max_retries: int = 2, base_delay_seconds: float = 1.0, max_delay_seconds: float = 60.0) -> None:
+        self.max_retries = max_retries
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.attempts: Dict[str, int] = {}
+
+    def next_retry_delay(self, normalized_url: str, error: BaseException) -> Optional[float]:
+        """Returns the delay before the next retry, or None if the url should not be retried"""
+        attempt = self.attempts.pop(normalized_url, 0)
+        if classify_failure(error) != FailureKind.TRANSIENT or attempt >= self.max_retries:
+            return None
+        retry_after = get_retry_after(error)
+        if retry_after is not None and retry_after > self.max_delay_seconds:
+            return None
+        self.attempts[normalized_url] = attempt + 1
+        backoff = random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * (2 ** attempt)))
+        if retry_after is not None:
+            return max(retry_after, backoff)
+        return backoff
+
+    def forget(self, normalized_url: str) -> None:
+        self.attempts.pop(normalized_url, None)
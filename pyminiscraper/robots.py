@@ -1,18 +1,45 @@
 import collections
 import urllib.parse
 import urllib.request
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Mapping, Optional, Union
 from enum import Enum
 import aiohttp
 import logging
 import asyncio
+import functools
 from .url import normalize_url
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import re
 
 logger = logging.getLogger("robots")
 
 RequestRate = collections.namedtuple("RequestRate", "requests seconds")
 
+
+def get_cache_ttl(headers: Mapping[str, str], now: Optional[datetime] = None) -> Optional[float]:
+    """Returns freshness lifetime in seconds from Cache-Control or Expires headers, None if neither is present"""
+    cache_control = headers.get('Cache-Control')
+    if cache_control:
+        for directive in cache_control.lower().split(','):
+            name, _, value = directive.strip().partition('=')
+            if name in ('no-store', 'no-cache'):
+                return 0.0
+            if name == 'max-age' and value.strip().strip('"').isdigit():
+                return float(value.strip().strip('"'))
+    expires = headers.get('Expires')
+    if expires:
+        try:
+            expires_at = parsedate_to_datetime(expires)
+        except (TypeError, ValueError):
+            return 0.0
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        now = now or datetime.now(timezone.utc)
+        return max(0.0, (expires_at - now).total_seconds())
+    return None
+
+
 class RobotsError(Exception):
     pass
 
@@ -32,12 +59,19 @@ class Robot:
         self.sitemap_urls: set[str] = set()
         self.default_entry: Optional[Entry] = None
         self.access_rule: AccessRule = AccessRule.ALLOW_ALL
+        # freshness lifetime from the response cache headers, None if the response had none
+        self.cache_ttl_seconds: Optional[float] = None
+        self._useragent_entries: Dict[str, Optional[Entry]] = {}
 
     @classmethod
     async def download_and_parse(cls, normalized_url: str, client_session: aiohttp.ClientSession, timeout_seconds: int = 30) -> "Robot":
         try:
             async with client_session.get(normalized_url, timeout=aiohttp.ClientTimeout(total=timeout_seconds)) as http_response:
                 robots = cls()
+                robots.cache_ttl_seconds = get_cache_ttl(http_response.headers)
+                if http_response.status >= 500:
+                    # server errors are not a statement about access, do not keep them
+                    robots.cache_ttl_seconds = 0.0
                 if http_response.status in (401, 403):
                     robots.access_rule = AccessRule.DISALLOW_ALL
                 elif http_response.status >= 400 and http_response.status < 500:
@@ -51,6 +85,7 @@ class Robot:
             raise RobotsError(f"""Failed to fetch robots.txt from {normalized_url}""") from e                    
         
     def _add_entry(self, entry: 'Entry') -> None:
+        self._useragent_entries.clear()
         if "*" in entry.useragents:
             if self.default_entry is None:
                 self.default_entry = entry
@@ -113,38 +148,53 @@ class Robot:
         if self.access_rule == AccessRule.ALLOW_ALL:
             return True
 
-        parsed_url = urllib.parse.urlparse(urllib.parse.unquote(url))
-        url = urllib.parse.urlunparse(('', '', parsed_url.path,
-                                       parsed_url.params, parsed_url.query, parsed_url.fragment))
-        url = urllib.parse.quote(url)
-        if not url:
-            url = "/"
-        for entry in self.entries:
-            if entry.applies_to(useragent):
-                return entry.allowance(url)
-        if self.default_entry:
-            return self.default_entry.allowance(url)
-        return True
+        entry = self._entry_for(useragent)
+        if entry is None:
+            return True
+        return entry.allowance(robots_request_path(url))
+
+    def _entry_for(self, useragent: str) -> Optional["Entry"]:
+        """Returns the entry that applies to the user agent, resolved once per user agent"""
+        if useragent in self._useragent_entries:
+            return self._useragent_entries[useragent]
+        entry = self.default_entry
+        for candidate in self.entries:
+            if candidate.applies_to(useragent):
+                entry = candidate
+                break
+        self._useragent_entries[useragent] = entry
+        return entry
 
     def crawl_delay(self, useragent: str) -> Optional[int]:
-        for entry in self.entries:
-            if entry.applies_to(useragent):
-                return entry.delay
-        if self.default_entry:
-            return self.default_entry.delay
-        return None
+        entry = self._entry_for(useragent)
+        return entry.delay if entry else None
 
     def request_rate(self, useragent: str) -> Optional[RequestRate]:
-        for entry in self.entries:
-            if entry.applies_to(useragent):
-                return entry.req_rate
-        if self.default_entry:
-            return self.default_entry.req_rate
-        return None
+        entry = self._entry_for(useragent)
+        return entry.req_rate if entry else None
 
     def site_maps(self) -> Optional[set[str]]:
         return self.sitemap_urls
 
+    def to_dict(self) -> Dict[str, Any]:
+        entries = self.entries
+        if self.default_entry is not None:
+            entries = entries + [self.default_entry]
+        return {
+            'access_rule': self.access_rule.value,
+            'sitemap_urls': sorted(self.sitemap_urls),
+            'entries': [entry.to_dict() for entry in entries],
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Robot":
+        robot = cls()
+        robot.access_rule = AccessRule(d['access_rule'])
+        robot.sitemap_urls = set(d['sitemap_urls'])
+        for entry_dict in d['entries']:
+            robot._add_entry(Entry.from_dict(entry_dict))
+        return robot
+
     def __str__(self) -> str:
         entries = self.entries
         if self.default_entry is not None:
@@ -156,11 +206,19 @@ class RuleLine:
     def __init__(self, path: str, allowance: bool) -> None:
         if path == '' and not allowance:
             allowance = True
-        path = urllib.parse.urlunparse(urllib.parse.urlparse(path))
-        self.path: str = urllib.parse.quote(path)
+        self.path: str = quote_robots_path(path)
         self.path_pattern = robots_txt_pattern_compile(self.path)
         self.allowance: bool = allowance
 
+    @classmethod
+    def from_quoted(cls, path: str, allowance: bool) -> "RuleLine":
+        """Restores a rule line from its already quoted path"""
+        rule_line = cls.__new__(cls)
+        rule_line.path = path
+        rule_line.path_pattern = robots_txt_pattern_compile(path)
+        rule_line.allowance = allowance
+        return rule_line
+
     def applies_to(self, filename: str) -> bool:
         if not filename.startswith('/'):
             filename = '/' + filename
@@ -176,6 +234,7 @@ class Entry:
         self.rulelines: List[RuleLine] = []
         self.delay: Optional[int] = None
         self.req_rate: Optional[RequestRate] = None
+        self._matcher: Optional[RobotsMatcher] = None
 
     def __str__(self) -> str:
         ret = []
@@ -189,6 +248,23 @@ class Entry:
         ret.extend(map(str, self.rulelines))
         return '\n'.join(ret)
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'useragents': self.useragents,
+            'rulelines': [[line.path, line.allowance] for line in self.rulelines],
+            'delay': self.delay,
+            'req_rate': list(self.req_rate) if self.req_rate is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Entry":
+        entry = cls()
+        entry.useragents = d['useragents']
+        entry.rulelines = [RuleLine.from_quoted(path, allowance) for path, allowance in d['rulelines']]
+        entry.delay = d['delay']
+        entry.req_rate = RequestRate(*d['req_rate']) if d['req_rate'] is not None else None
+        return entry
+
     def applies_to(self, useragent: str) -> bool:
         useragent = useragent.split("/")[0].lower()
         for agent in self.useragents:
@@ -199,12 +275,107 @@ class Entry:
                 return True
         return False
 
-    def allowance(self, filename: str) -> bool:        
-        for line in self.rulelines:
-            if line.applies_to(filename):
-                return line.allowance
-        return True
+    def allowance(self, filename: str) -> bool:
+        if self._matcher is None or self._matcher.rules_count != len(self.rulelines):
+            self._matcher = RobotsMatcher(self.rulelines)
+        return self._matcher.allowance(filename)
     
+class RobotsMatcher:
+    """
+    Rules of one entry compiled for RFC 9309 longest-match lookups:
+    - Literal rules live in a character trie, a single walk over the path finds the longest one.
+    - Rules ending with $ and no wildcard are looked up by exact path.
+    - Wildcard rules are tried longest first, only while they can still beat the best match.
+    - The most specific matching rule wins, an allow wins ties, no match allows.
+    - Decisions are cached per path.
+    """
+    TERMINAL = ''
+
+    def __init__(self, rulelines: List[RuleLine], cache_size: int = 4096) -> None:
+        self.rules_count = len(rulelines)
+        self.cache_size = cache_size
+        self.trie: Dict[str, Any] = {}
+        self.exact: Dict[str, bool] = {}
+        self.wildcards: List[tuple[int, RuleLine]] = []
+        self.cache: Dict[str, bool] = {}
+        for line in rulelines:
+            path = line.path
+            if not path:
+                # an empty rule matches nothing
+                continue
+            if not path.startswith('/'):
+                path = '/' + path
+            if '*' in path:
+                self.wildcards.append((len(path), line))
+            elif path.endswith('$'):
+                self.exact[path[:-1]] = self.exact.get(path[:-1], False) or line.allowance
+            else:
+                node = self.trie
+                for char in path:
+                    node = node.setdefault(char, {})
+                node[self.TERMINAL] = node.get(self.TERMINAL, False) or line.allowance
+        self.wildcards.sort(key=lambda item: item[0], reverse=True)
+
+    def allowance(self, path: str) -> bool:
+        allowance = self.cache.get(path)
+        if allowance is None:
+            allowance = self._match(path)
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+            self.cache[path] = allowance
+        return allowance
+
+    def _match(self, path: str) -> bool:
+        if not path.startswith('/'):
+            path = '/' + path
+        best_length = -1
+        best_allowance = True
+
+        node = self.trie
+        for length, char in enumerate(path, 1):
+            child = node.get(char)
+            if child is None:
+                break
+            node = child
+            allowance = node.get(self.TERMINAL)
+            if allowance is not None:
+                best_length = length
+                best_allowance = allowance
+
+        allowance = self.exact.get(path)
+        if allowance is not None:
+            # the exact rule is one character longer than the path because of the trailing $
+            best_length = len(path) + 1
+            best_allowance = allowance
+
+        for length, line in self.wildcards:
+            if length < best_length or (length == best_length and best_allowance):
+                break
+            if line.applies_to(path):
+                best_allowance = line.allowance if length > best_length else best_allowance or line.allowance
+                best_length = length
+
+        return best_allowance if best_length >= 0 else True
+
+
+ROBOTS_PATH_SAFE_CHARS = "/?=&;:@!$'()*+,"
+
+
+def quote_robots_path(path: str) -> str:
+    """Percent encodes a path the same way for rules and request urls, keeping robots.txt wildcards"""
+    return urllib.parse.quote(path, safe=ROBOTS_PATH_SAFE_CHARS)
+
+
+@functools.lru_cache(maxsize=4096)
+def robots_request_path(url: str) -> str:
+    """Returns the quoted path and query of the url that robots.txt rules are matched against"""
+    parsed_url = urllib.parse.urlsplit(url)
+    path = parsed_url.path or '/'
+    if parsed_url.query:
+        path = f"{path}?{parsed_url.query}"
+    return quote_robots_path(urllib.parse.unquote(path))
+
+
 special_chars = set(['\\', '.', '+', '?', '|', '(', ')', '[', ']', '{', '}'])
     
 def robots_txt_pattern_compile(path: str) -> re.Pattern:
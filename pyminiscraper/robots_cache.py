@@ -0,0 +1,90 @@
+from typing import Callable, Dict, Optional
+import json
+import logging
+import os
+import time
+from .robots import Robot
+from .url import normalized_url_hash
+
+logger = logging.getLogger("robots_cache")
+
+
+class RobotsCacheEntry:
+    def __init__(self, robot: Robot, expires_at: float) -> None:
+        self.robot = robot
+        self.expires_at = expires_at
+
+
+# shared by all RobotsCache instances, so concurrent scrapers in one process reuse parsed robots.txt
+_memory_entries: Dict[str, RobotsCacheEntry] = {}
+
+
+class RobotsCache:
+    """
+    Caches parsed robots.txt per robots url across scraper runs:
+    - A process-wide in-memory layer is shared by all scrapers.
+    - If directory is given, entries are also stored on disk as compact JSON.
+    - Entries live for the Cache-Control max-age / Expires of the robots.txt response,
+      capped at default_ttl_seconds, or default_ttl_seconds if the response had no cache headers.
+    """
+    def __init__(self, *,
+                 directory: Optional[str] = None,
+                 default_ttl_seconds: float = 24 * 60 * 60,
+                 clock: Callable[[], float] = time.time) -> None:
+        self.directory = directory
+        self.default_ttl_seconds = default_ttl_seconds
+        self.clock = clock
+
+    def get(self, robots_url: str) -> Optional[Robot]:
+        now = self.clock()
+        entry = _memory_entries.get(robots_url)
+        if entry is None and self.directory is not None:
+            entry = self._load(robots_url)
+            if entry is not None:
+                _memory_entries[robots_url] = entry
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            _memory_entries.pop(robots_url, None)
+            return None
+        logger.debug(f"robots.txt cache hit {robots_url}")
+        return entry.robot
+
+    def put(self, robots_url: str, robot: Robot) -> None:
+        ttl_seconds = self.default_ttl_seconds
+        if robot.cache_ttl_seconds is not None:
+            ttl_seconds = min(ttl_seconds, robot.cache_ttl_seconds)
+        if ttl_seconds <= 0:
+            return
+        entry = RobotsCacheEntry(robot, self.clock() + ttl_seconds)
+        _memory_entries[robots_url] = entry
+        if self.directory is not None:
+            self._store(robots_url, entry)
+
+    def _filepath(self, robots_url: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, f"{normalized_url_hash(robots_url)}.robots.json")
+
+    def _load(self, robots_url: str) -> Optional[RobotsCacheEntry]:
+        filepath = self._filepath(robots_url)
+        if not os.path.exists(filepath):
+            return None
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                d = json.load(f)
+            return RobotsCacheEntry(Robot.from_dict(d['robot']), d['expires_at'])
+        except Exception as e:
+            logger.warning(f"Error loading cached robots.txt {filepath}: {e}")
+            return None
+
+    def _store(self, robots_url: str, entry: RobotsCacheEntry) -> None:
+        filepath = self._filepath(robots_url)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp_filepath = f"{filepath}.tmp"
+        with open(tmp_filepath, 'w', encoding='utf-8') as f:
+            json.dump({'expires_at': entry.expires_at, 'robot': entry.robot.to_dict()}, f, separators=(',', ':'))
+        os.replace(tmp_filepath, filepath)
+
+    @staticmethod
+    def clear_memory() -> None:
+        _memory_entries.clear()
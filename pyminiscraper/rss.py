@@ -4,7 +4,7 @@ from typing import List, Optional, Dict
 import xml.etree.ElementTree as ET
 from urllib.parse import urlparse
 import aiohttp
-from dateutil.parser import parse as parse_date
+from .dates import parse_optional_date
 import logging
 from io import BytesIO
 
@@ -96,11 +96,4 @@ class RssParser:
         return categories
 
     def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
-        if not date_str:
-            return None
-        try:
-            return parse_date(date_str)
-        except (ValueError, TypeError):
-            return None
-
-    
\ No newline at end of file
+        return parse_optional_date(date_str)
@@ -3,6 +3,8 @@ from typing import Optional
 import logging
 from .model import ScraperWebPage
 from datetime import datetime
+from .fetch import FetchStatusError, read_text
+from .bandwidth import BandwidthLimiter
 
 class HttpHtmlScraperError(Exception):
     pass
@@ -10,20 +12,21 @@ class HttpHtmlScraperError(Exception):
 logger = logging.getLogger("scrape_html_http")
 
 class HttpHtmlScraper:
-    def __init__(self, client_session: aiohttp.ClientSession, timeout_seconds: int = 30):
+    def __init__(self, client_session: aiohttp.ClientSession, timeout_seconds: int = 30, bandwidth_limiter: Optional[BandwidthLimiter] = None):
         self.client_session = client_session
         self.timeout_seconds = timeout_seconds
+        self.bandwidth_limiter = bandwidth_limiter
 
     async def scrape(self, normalized_url: str) -> ScraperWebPage:
         try:
             async with self.client_session.get(normalized_url) as http_response:
                 if not http_response.status == 200:
                     logger.error(f"Error fetching {normalized_url}: {http_response.status}")
-                    raise HttpHtmlScraperError(f"Error fetching {normalized_url}: {http_response.status}")
+                    raise FetchStatusError(f"Error fetching {normalized_url}: {http_response.status}", http_response.status, http_response.headers)
                 if not http_response.content_type.startswith('text/html'):
                     logger.warning(f"Skipping non-HTML content type {http_response.content_type} for {normalized_url}")
                     raise HttpHtmlScraperError(f"Non html content {normalized_url}: {http_response.status}")
-                html_content = await http_response.text()
+                html_content = await read_text(http_response, self.bandwidth_limiter)
                 page=ScraperWebPage(
                     status_code=http_response.status,
                     headers={str(k): str(v) for k, v in dict(http_response.headers).items()},
@@ -42,11 +45,12 @@ class HttpHtmlScraper:
 
 
 class HttpHtmlScraperFactory:
-    def __init__(self, client_session: aiohttp.ClientSession):
+    def __init__(self, client_session: aiohttp.ClientSession, bandwidth_limiter: Optional[BandwidthLimiter] = None):
         self.client_session = client_session
+        self.bandwidth_limiter = bandwidth_limiter
 
     async def close(self) -> None:
         await self.client_session.close()
 
     def new_scraper(self) -> HttpHtmlScraper:
-        return HttpHtmlScraper(self.client_session)
+        return HttpHtmlScraper(self.client_session, bandwidth_limiter=self.bandwidth_limiter)
@@ -1,25 +1,35 @@
 import asyncio
-from typing import Dict
+from typing import Dict, AsyncContextManager, AsyncIterator
+from contextlib import nullcontext
 import logging
 from urllib.parse import urlparse
-from .url import make_absolute_url
+from .url import make_absolute_url, normalize_url
 from .scrape_html_http import HttpHtmlScraperFactory
 from .scrape_html_browser import BrowserHtmlScraperFactory
 from .model import ScraperWebPage, ScraperUrl, ScraperUrlType, ScrapeUrlMetadata
 from .model import ScraperUrl
 from .extract import extract_metadata, PageMetadataExtractor
-from .stats import ScraperStats, analyze_url_groups
+from .stats import ScraperStats, DomainStats, analyze_url_groups
 from .domain_metadata import DomainMetadata
-from .sitemap import Sitemap
+from .sitemap import Sitemap, SitemapEntry, PageUrl
 from .robots import Robot
-from .deque import AsyncDeque
+from .deque import AsyncDeque, AsyncDelayedQueue
 from .config import ScraperConfig, ScraperCallbackError, ScraperContext
-from datetime import datetime
-from .ratelimiter import CrawlRateLimiter
+from datetime import datetime, timezone
+from .ratelimiter import HostRateLimiter, AutoThrottle
 import aiohttp
 from .feed import FeedParser, Feed
 from .filter import DomainFilter, PathFilter
 from .context import ScraperContextImpl
+from .trap import CrawlTrapDetector
+from .budget import CrawlBudget
+from .concurrency import HostConcurrencyLimiter
+from .retry import RetryPolicy, FailureKind, classify_failure
+from .circuit import HostCircuitBreaker
+from .bandwidth import BandwidthLimiter
+from .hash import url_fingerprint
+from .recrawl import RecrawlScheduler, content_hash
+from .feed_poller import FeedPoller
 
 
 logger = logging.getLogger("scraper")
@@ -27,6 +37,10 @@ logger = logging.getLogger("scraper")
 class ScraperError(Exception):
     pass
 
+def as_utc(value: datetime) -> datetime:
+    """Naive datetimes, such as date-only sitemap lastmod values, are taken as UTC"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
 class ScraperLoopResult:
     def __init__(self, completed_url_count: int):
         self.completed_urls_count = completed_url_count
@@ -36,7 +50,7 @@ class Scraper:
     def __init__(self, config: ScraperConfig):
         self.config = config
         self.client_session = aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(ssl=False),
+            connector=aiohttp.TCPConnector(ssl=False, ttl_dns_cache=config.dns_cache_ttl_seconds),
             headers={
                 'User-Agent': config.user_agent,
                 "Referer": config.referer,
@@ -44,57 +58,154 @@ class Scraper:
             timeout = aiohttp.ClientTimeout(total=config.request_timeout_seconds))
         
         self.domain_metadata: Dict[str, asyncio.Task[DomainMetadata]] = {}
-        self.queued_urls: set[str] = set()
+        self.domain_metadata_prefetch_semaphore = asyncio.Semaphore(config.max_parallel_prefetch_requests)
+        # hosts whose prefetch is still waiting for a prefetch slot
+        self.domain_metadata_prefetch_waiting: set[str] = set()
+        # fingerprints of queued urls, the url strings are only kept when domain stats are collected
+        self.queued_urls: set[int] = set()
+        self.domain_stats_urls: list[str] | None = [] if config.collect_domain_stats else None
         self.requested_urls_count = 0
         self.success_urls_count = 0
         self.skipped_urls_count = 0
         self.error_urls_count = 0
         self.url_queue: AsyncDeque[ScraperUrl] = AsyncDeque()
-        self.http_html_scraper_factory = HttpHtmlScraperFactory(self.client_session)
+        # sitemaps are expanded by their own workers, so discovery and page fetching do not starve each other
+        self.sitemap_queue: AsyncDeque[ScraperUrl] | None = AsyncDeque() if config.sitemap_config else None
+        self.sitemap_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.bandwidth_limiter = BandwidthLimiter(
+            bytes_per_second=config.bandwidth_config.bytes_per_second,
+            burst_bytes=config.bandwidth_config.burst_bytes,
+            bytes_per_second_per_host=config.bandwidth_config.bytes_per_second_per_host,
+            burst_bytes_per_host=config.bandwidth_config.burst_bytes_per_host,
+        ) if config.bandwidth_config else None
+        self.http_html_scraper_factory = HttpHtmlScraperFactory(self.client_session, bandwidth_limiter=self.bandwidth_limiter)
         self.browser_html_scraper_factory = BrowserHtmlScraperFactory() if self.config.use_headless_browser else None
-        self.request_rate_limiter = CrawlRateLimiter(self.config.crawl_delay_seconds)
-        self.back_to_back_errors = 0
-        self.sitemaps: dict[str, Sitemap] = {}
+        self.request_rate_limiter = HostRateLimiter(self.config.crawl_delay_seconds)
+        self.auto_throttle = AutoThrottle(
+            min_delay_seconds=config.crawl_delay_seconds,
+            start_delay_seconds=config.auto_throttle_config.start_delay_seconds,
+            max_delay_seconds=config.auto_throttle_config.max_delay_seconds,
+            target_concurrency=config.auto_throttle_config.target_concurrency,
+        ) if config.auto_throttle_config else None
+        self.circuit_breaker = HostCircuitBreaker(
+            failure_threshold=config.max_back_to_back_errors,
+            cooldown_seconds=config.circuit_breaker_cooldown_seconds,
+            max_trips=config.circuit_breaker_max_trips,
+        )
+        # number of entries read from each sitemap
+        self.sitemaps: dict[str, int] = {}
         self.feeds: dict[str, Feed] = {}
         self.domain_filter = DomainFilter(config.domain_config, [url.url for url in config.seed_urls])
         self.include_path_patterns = PathFilter(config.include_path_patterns, default_value=True)
         self.exclude_path_patterns = PathFilter(config.exclude_path_patterns, default_value=False)
+        self.trap_detector = CrawlTrapDetector(
+            max_path_segment_repeats=config.trap_config.max_path_segment_repeats,
+            max_numeric_parameter_values=config.trap_config.max_numeric_parameter_values,
+            max_query_combinations_per_path=config.trap_config.max_query_combinations_per_path,
+            max_stale_link_yield_pages=config.trap_config.max_stale_link_yield_pages,
+            stale_link_yield_blocked_urls=config.trap_config.stale_link_yield_blocked_urls,
+            max_content_hashes_per_host=config.trap_config.max_content_hashes_per_host,
+        ) if config.trap_config else None
+        self.budget = CrawlBudget(
+            max_urls_per_host=config.budget_config.max_urls_per_host,
+            max_urls_per_path_prefix=config.budget_config.max_urls_per_path_prefix,
+        ) if config.budget_config else None
+        self.host_concurrency = HostConcurrencyLimiter(
+            max_limit=config.max_parallel_requests,
+            initial_limit=config.adaptive_concurrency_config.initial_requests_per_host,
+            target_latency_seconds=config.adaptive_concurrency_config.target_latency_seconds,
+            additive_increase=config.adaptive_concurrency_config.additive_increase,
+            multiplicative_decrease=config.adaptive_concurrency_config.multiplicative_decrease,
+        ) if config.adaptive_concurrency_config else None
+        self.retry_policy = RetryPolicy(
+            max_retries=config.retry_config.max_retries,
+            base_delay_seconds=config.retry_config.base_delay_seconds,
+            max_delay_seconds=config.retry_config.max_delay_seconds,
+        ) if config.retry_config else None
+        self.retried_urls_count = 0
+        self.unchanged_urls_count = 0
+        self.delayed_urls: AsyncDelayedQueue[ScraperUrl] = AsyncDelayedQueue(self._push_scraper_url)
+        # continuous mode - fetched urls are scheduled for revisits instead of the run ending after one pass
+        self.recrawl_scheduler = RecrawlScheduler(
+            min_interval_seconds=config.recrawl_config.min_interval_seconds,
+            max_interval_seconds=config.recrawl_config.max_interval_seconds,
+            default_interval_seconds=config.recrawl_config.default_interval_seconds,
+            change_factor=config.recrawl_config.change_factor,
+            no_change_factor=config.recrawl_config.no_change_factor,
+        ) if config.recrawl_config else None
+        # feed polling mode - feeds are polled again with conditional requests and only new items are queued
+        self.feed_poller = FeedPoller(
+            min_interval_seconds=config.feed_poll_config.min_interval_seconds,
+            max_interval_seconds=config.feed_poll_config.max_interval_seconds,
+            default_interval_seconds=config.feed_poll_config.default_interval_seconds,
+            no_new_items_factor=config.feed_poll_config.no_new_items_factor,
+            max_seen_items=config.feed_poll_config.max_seen_items,
+        ) if config.feed_poll_config else None
+        self.revisit_urls: AsyncDelayedQueue[ScraperUrl] = AsyncDelayedQueue(self._revisit_scraper_url)
+        self.revisited_urls_count = 0
+        self.not_modified_feeds_count = 0
+        self.new_feed_items_count = 0
         
 
     async def run(self) -> ScraperStats:
-        for scraper_url in self.config.seed_urls:
-            await self._queue_scraper_url(scraper_url, skip_path_filter=True)
+        await self._queue_many(self.config.seed_urls, skip_path_filter=True)
 
         if self._is_crawler_empty():
             logger.info("finished before starting - no urls to scrape")
-            return ScraperStats(
-                queued_urls_count=len(self.queued_urls),
-                requested_urls_count=self.requested_urls_count,
-                success_urls_count=self.success_urls_count,
-                error_urls_count=self.error_urls_count,
-                skipped_urls_count=self.skipped_urls_count,
-                domain_stats={}
-            )
+            return self._build_stats(domain_stats={})
 
+        delayed_urls_task = asyncio.create_task(self.delayed_urls.run())
+        revisit_urls_task = asyncio.create_task(self.revisit_urls.run()) if self._is_continuous() else None
+        sitemap_tasks = []
+        if self.sitemap_queue is not None and self.config.sitemap_config:
+            for i in range(self.config.sitemap_config.max_parallel_requests):
+                sitemap_tasks.append(asyncio.create_task(self._scrape_loop(f"Sitemap-{i}", self.sitemap_queue)))
         tasks = []
         for i in range(self.config.max_parallel_requests):
-            task = asyncio.create_task(self._scrape_loop(f"Scraper-{i}"))
+            task = asyncio.create_task(self._scrape_loop(f"Scraper-{i}", self.url_queue))
             tasks.append(task)
         
-        await asyncio.gather(*tasks)
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            delayed_urls_task.cancel()
+            if revisit_urls_task:
+                revisit_urls_task.cancel()
+            # page loops only finish once every queued sitemap was processed or the request limit was hit
+            for sitemap_task in sitemap_tasks:
+                sitemap_task.cancel()
+            await asyncio.gather(*sitemap_tasks, return_exceptions=True)
 
-        domain_stats = analyze_url_groups(list(self.queued_urls), min_pages_per_sub_path=5)
+        domain_stats = analyze_url_groups(self.domain_stats_urls, min_pages_per_sub_path=5) if self.domain_stats_urls is not None else {}
         await self._close()       
+        return self._build_stats(domain_stats=domain_stats)
+
+    def _build_stats(self, domain_stats: Dict[str, DomainStats]) -> ScraperStats:
         return ScraperStats(
             queued_urls_count=len(self.queued_urls),
             requested_urls_count=self.requested_urls_count,
             success_urls_count=self.success_urls_count,
             error_urls_count=self.error_urls_count,
             skipped_urls_count=self.skipped_urls_count,
-            domain_stats=domain_stats
-        )         
+            domain_stats=domain_stats,
+            trapped_urls_count=self.trap_detector.trapped_urls_count if self.trap_detector else 0,
+            trap_stats=self.trap_detector.stats() if self.trap_detector else {},
+            over_budget_urls_count=self.budget.over_budget_urls_count if self.budget else 0,
+            host_concurrency_limits=self.host_concurrency.limits() if self.host_concurrency else {},
+            retried_urls_count=self.retried_urls_count,
+            host_circuit_states=self.circuit_breaker.states(),
+            downloaded_bytes_count=self.bandwidth_limiter.downloaded_bytes_count if self.bandwidth_limiter else 0,
+            bytes_per_second=self.bandwidth_limiter.bytes_per_second() if self.bandwidth_limiter else 0.0,
+            host_crawl_delays=dict(self.auto_throttle.delays) if self.auto_throttle else {},
+            unchanged_urls_count=self.unchanged_urls_count,
+            revisited_urls_count=self.revisited_urls_count,
+            not_modified_feeds_count=self.not_modified_feeds_count,
+            new_feed_items_count=self.new_feed_items_count,
+        )
 
     async def _close(self):
+        for domain_metadata_task in self.domain_metadata.values():
+            domain_metadata_task.cancel()
         if self.http_html_scraper_factory:
             await self.http_html_scraper_factory.close()
         if self.browser_html_scraper_factory:
@@ -120,13 +231,12 @@ class Scraper:
         return not context.should_prevent_default_queuing and not self.config.prevent_default_queuing
     
     async def _enqueue_context_urls(self, context: ScraperContextImpl) -> None:
-        for url in context.queued_urls:
-            await self._queue_scraper_url(url, skip_path_filter=True)
+        await self._queue_many(context.queued_urls, skip_path_filter=True)
 
-    async def _scrape_loop(self, looper_name: str) -> ScraperLoopResult:
+    async def _scrape_loop(self, looper_name: str, url_queue: AsyncDeque[ScraperUrl]) -> ScraperLoopResult:
         loop_completed_urls_count = 0
         while True:
-            scraper_url = await self.url_queue.popright()
+            scraper_url = await url_queue.popright()
             if scraper_url.is_terminal() or self._was_max_requests_achieved():
                 logger.info(f"terminating - {self._looper_context(looper_name)} URLs")
                 break
@@ -139,82 +249,306 @@ class Scraper:
                 logger.info(
                     f"url not allowed for scraping - {self._looper_context(looper_name)} - {self._url_context(scraper_url)}")
                 self.skipped_urls_count += 1
+                self._schedule_revisit_after_failure(scraper_url)
+                await self._terminate_all_loops_if_needed(looper_name)
+                continue
+
+            host = urlparse(scraper_url.normalized_url).netloc
+            if self.circuit_breaker.is_dead(host):
+                logger.info(
+                    f"url not scraped - host circuit is dead - {self._looper_context(looper_name)} - {self._url_context(scraper_url)}")
+                self.error_urls_count += 1
+                self._schedule_revisit_after_failure(scraper_url)
+                await self._terminate_all_loops_if_needed(looper_name)
+                continue
+
+            # a worker does not wait on a busy host while urls of other hosts are queued
+            busy_delay = self.host_concurrency.busy_delay(host) if self.host_concurrency else 0.0
+            if busy_delay > 0:
+                logger.debug(
+                    f"url postponed for {busy_delay:.1f}s - host is at its concurrency limit - {self._looper_context(looper_name)} - {self._url_context(scraper_url)}")
+                self.delayed_urls.schedule(scraper_url, busy_delay)
+                continue
+
+            circuit_delay = self.circuit_breaker.allow_request(host)
+            if circuit_delay > 0:
+                logger.info(
+                    f"url postponed for {circuit_delay:.1f}s - host circuit is open - {self._looper_context(looper_name)} - {self._url_context(scraper_url)}")
+                self.delayed_urls.schedule(scraper_url, circuit_delay)
                 continue
 
             self.requested_urls_count += 1
             context = ScraperContextImpl(self.client_session)
+            fetched_content_hash: bytes | None = None
+            revisit_delay: float | None = None
             try:
                 if scraper_url.type == ScraperUrlType.HTML:
                     page = await self._load_or_download_page(context=context, url=scraper_url)
+                    if self.recrawl_scheduler:
+                        fetched_content_hash = content_hash(page.content)
+                    queued_urls_count = len(self.queued_urls)
                     await self._enqueue_context_urls(context)
                     if self._should_do_default_queuing(context):
                         await self._enqueue_web_page_urls(scraper_url, page)                    
+                    if self.trap_detector:
+                        self.trap_detector.record_page(scraper_url.normalized_url, page.visible_text, len(self.queued_urls) - queued_urls_count)
                 elif scraper_url.type == ScraperUrlType.SITEMAP:
-                    sitemap = await self._download_sitemap(scraper_url.normalized_url)
-                    try:
-                        await self.config.callback.on_sitemap(context, sitemap)
-                    except Exception as e:
-                        raise ScraperCallbackError(f"Error storing sitemap {self._url_context(scraper_url)}") from e
-                    
-                    await self._enqueue_context_urls(context)
-                    if self._should_do_default_queuing(context):
-                        await self._enqueue_sitemap_urls(sitemap)
+                    async for sitemap in self._stream_sitemap(scraper_url.normalized_url):
+                        try:
+                            await self.config.callback.on_sitemap(context, sitemap)
+                        except Exception as e:
+                            raise ScraperCallbackError(f"Error storing sitemap {self._url_context(scraper_url)}") from e
+                        
+                        await self._enqueue_context_urls(context)
+                        if self._should_do_default_queuing(context):
+                            await self._enqueue_sitemap_urls(sitemap)
+                    await self._save_last_fetched_at(scraper_url)
                 elif scraper_url.type == ScraperUrlType.FEED:
-                    feed = await self._download_feed(scraper_url.normalized_url)
-                    try:
-                        await self.config.callback.on_feed(context, feed)
-                    except Exception as e:
-                        raise ScraperCallbackError(f"Error storing sitemap {self._url_context(scraper_url)}") from e
-                    await self._enqueue_context_urls(context)
-                    if self._should_do_default_queuing(context):
-                        await self._enqueue_feed_urls(feed)                    
+                    listed_item_keys: list[str] = []
+                    if self.feed_poller:
+                        feed, listed_item_keys = await self._poll_feed(scraper_url)
+                    else:
+                        feed = await self._download_feed(scraper_url.normalized_url)
+                    # polls without new items have nothing to store or queue
+                    if feed.items or not self.feed_poller:
+                        try:
+                            await self.config.callback.on_feed(context, feed)
+                        except Exception as e:
+                            raise ScraperCallbackError(f"Error storing sitemap {self._url_context(scraper_url)}") from e
+                        await self._enqueue_context_urls(context)
+                        if self._should_do_default_queuing(context):
+                            await self._enqueue_feed_urls(feed)                    
+                    if self.feed_poller:
+                        revisit_delay = await self._commit_feed_poll(scraper_url, feed, listed_item_keys)
                 self.success_urls_count += 1
+                self.circuit_breaker.record_success(host)
+                if self.retry_policy:
+                    self.retry_policy.forget(scraper_url.normalized_url)
+                self._schedule_revisit(scraper_url, fetched_content_hash, revisit_delay)
             except ScraperCallbackError as e:
                 logger.error(f"callback error while retriving url - {self._looper_context(looper_name)} - {self._url_context(scraper_url)} {e}")
                 raise e
             except Exception as e:
+                if classify_failure(e) == FailureKind.TRANSIENT:
+                    self.circuit_breaker.record_failure(host)
+                else:
+                    self.circuit_breaker.record_success(host)
+                retry_delay = self.retry_policy.next_retry_delay(scraper_url.normalized_url, e) if self.retry_policy else None
+                if retry_delay is not None:
+                    await self.config.log(f"retrying url in {retry_delay:.1f}s - {self._looper_context(looper_name)} - {self._url_context(scraper_url)}")
+                    self.retried_urls_count += 1
+                    self.delayed_urls.schedule(scraper_url, retry_delay)
+                    continue
                 await self.config.log(f"exception while retriving url - {self._looper_context(looper_name)} - {self._url_context(scraper_url)}")
                 self.error_urls_count += 1
+                self._schedule_revisit_after_failure(scraper_url)
 
             await self._terminate_all_loops_if_needed(looper_name)
 
         return ScraperLoopResult(loop_completed_urls_count)
     
-    async def _download_sitemap(self, normalized_url: str) -> Sitemap:
-        sitemap = await Sitemap.download_and_parse(normalized_url, self.http_html_scraper_factory.client_session)
-        self.sitemaps[normalized_url] = sitemap
-        return sitemap
+    def _is_continuous(self) -> bool:
+        return self.recrawl_scheduler is not None or self.feed_poller is not None
+
+    def _schedule_revisit(self, scraper_url: ScraperUrl, fetched_content_hash: bytes | None, delay: float | None = None) -> None:
+        metadata = scraper_url.metadata
+        if delay is None and self.recrawl_scheduler:
+            delay = self.recrawl_scheduler.record_fetch(
+                scraper_url.normalized_url,
+                fetched_content_hash,
+                changefreq=metadata.changefreq if metadata else None,
+                priority=metadata.priority if metadata else None,
+            )
+        if delay is None:
+            return
+        self.revisit_urls.schedule(ScraperUrl(
+            scraper_url.url,
+            normalized_url=scraper_url.normalized_url,
+            max_depth=scraper_url.max_depth,
+            type=scraper_url.type,
+            metadata=metadata,
+            bypass_cache=True,
+        ), delay)
+
+    def _schedule_revisit_after_failure(self, scraper_url: ScraperUrl) -> None:
+        """Keeps failed and skipped urls on the revisit schedule in continuous modes, backed off"""
+        delay: float | None = None
+        if self.feed_poller and scraper_url.type == ScraperUrlType.FEED:
+            delay = self.feed_poller.record_failure(scraper_url.normalized_url)
+        elif self.recrawl_scheduler:
+            metadata = scraper_url.metadata
+            delay = self.recrawl_scheduler.record_failure(
+                scraper_url.normalized_url,
+                changefreq=metadata.changefreq if metadata else None,
+                priority=metadata.priority if metadata else None,
+            )
+        if delay is not None:
+            self._schedule_revisit(scraper_url, None, delay)
+
+    async def _revisit_scraper_url(self, scraper_url: ScraperUrl) -> None:
+        logger.debug(f"revisiting url - {self._url_context(scraper_url)}")
+        self.revisited_urls_count += 1
+        await self._push_scraper_url(scraper_url)
+
+    def _host_slot(self, normalized_url: str) -> AsyncContextManager[None]:
+        if not self.host_concurrency:
+            return nullcontext()
+        return self.host_concurrency.slot(urlparse(normalized_url).netloc)
+
+    async def _stream_sitemap(self, normalized_url: str) -> AsyncIterator[Sitemap]:
+        """Yields the sitemap in batches while it downloads, so memory use does not grow with the sitemap size"""
+        self.sitemaps[normalized_url] = 0
+        async with self._sitemap_host_slot(normalized_url):
+            stream = Sitemap.stream(normalized_url, self.http_html_scraper_factory.client_session, bandwidth_limiter=self.bandwidth_limiter)
+            try:
+                while True:
+                    # the host slot covers the network reads only, not the consumer work between batches
+                    async with self._host_slot(normalized_url):
+                        sitemap = await anext(stream, None)
+                    if sitemap is None:
+                        break
+                    self.sitemaps[normalized_url] += len(sitemap)
+                    yield sitemap
+            finally:
+                await stream.aclose()
     
+    def _sitemap_host_slot(self, normalized_url: str) -> AsyncContextManager:
+        if not self.config.sitemap_config:
+            return nullcontext()
+        host = urlparse(normalized_url).netloc
+        semaphore = self.sitemap_host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.config.sitemap_config.max_parallel_requests_per_host)
+            self.sitemap_host_semaphores[host] = semaphore
+        return semaphore
+
     async def _download_feed(self, normalized_url: str) -> Feed:
-        feed = await FeedParser.download_and_parse(normalized_url, self.http_html_scraper_factory.client_session)
+        async with self._host_slot(normalized_url):
+            feed = await FeedParser.download_and_parse(normalized_url, self.http_html_scraper_factory.client_session, bandwidth_limiter=self.bandwidth_limiter)
         self.feeds[normalized_url] = feed
         return feed
     
+    async def _poll_feed(self, scraper_url: ScraperUrl) -> tuple[Feed, list[str]]:
+        """
+        Polls the feed with a conditional request and returns it with only new items, along with the keys of all listed items.
+        The poll is committed once the new items are delivered.
+        """
+        assert self.feed_poller is not None
+        normalized_url = scraper_url.normalized_url
+        if normalized_url not in self.feed_poller.states:
+            try:
+                state = await self.config.callback.load_feed_poll_state(normalized_url)
+            except Exception as e:
+                raise ScraperCallbackError(f"Error loading feed state {self._url_context(scraper_url)}") from e
+            if state is not None:
+                self.feed_poller.states[normalized_url] = state
+        state = self.feed_poller.state(normalized_url)
+        async with self._host_slot(normalized_url):
+            feed = await FeedParser.download_and_parse(
+                normalized_url, self.http_html_scraper_factory.client_session, bandwidth_limiter=self.bandwidth_limiter,
+                etag=state.etag, last_modified=state.last_modified)
+        if feed.not_modified:
+            self.not_modified_feeds_count += 1
+        new_items = self.feed_poller.new_items(normalized_url, feed)
+        new_feed = Feed(items=new_items, etag=feed.etag, last_modified=feed.last_modified, not_modified=feed.not_modified)
+        self.feeds[normalized_url] = new_feed
+        return new_feed, self.feed_poller.listed_item_keys(feed)
+
+    async def _commit_feed_poll(self, scraper_url: ScraperUrl, feed: Feed, listed_item_keys: list[str]) -> float:
+        """Marks the delivered items seen and persists the feed state, returns the delay before the next poll"""
+        assert self.feed_poller is not None
+        normalized_url = scraper_url.normalized_url
+        interval_seconds = self.feed_poller.record_poll(normalized_url, feed, listed_item_keys)
+        self.new_feed_items_count += len(feed.items)
+        try:
+            await self.config.callback.save_feed_poll_state(normalized_url, self.feed_poller.state(normalized_url))
+        except Exception as e:
+            raise ScraperCallbackError(f"Error saving feed state {self._url_context(scraper_url)}") from e
+        logger.info(f"polled feed - {self._url_context(scraper_url)} - new items: {len(feed.items)} not modified: {feed.not_modified} next poll in {interval_seconds:.0f}s")
+        return interval_seconds
+
     async def _enqueue_sitemap_urls(self, sitemap: Sitemap) -> None:
-        for page_url in sitemap.page_urls:
-            await self._queue_scraper_url(
-                ScraperUrl(page_url.loc, 
-                           max_depth=self.config.max_depth, 
-                           type=ScraperUrlType.HTML, 
-                           metadata=ScrapeUrlMetadata(
-                                 None, None, page_url.lastmod, None
-                           )
-                )
-            )
-        
-        for sitemap_url in sitemap.sitemap_urls:
-            await self._queue_scraper_url(
-                ScraperUrl(sitemap_url.loc, max_depth=self.config.max_depth, type=ScraperUrlType.SITEMAP)
-            )        
+        """
+        Queues the page and child sitemap urls of a sitemap batch. Urls are deduplicated and filtered as strings first,
+        so in incremental mode last fetch times are loaded in one call, for the remaining candidates only.
+        """
+        batch_fingerprints: set[int] = set()
+        candidates: list[tuple[ScraperUrl, datetime | None]] = []
+        skipped_counts: Dict[str, int] = {}
+        entries: list[tuple[SitemapEntry, ScraperUrlType]] = \
+            [(page_url, ScraperUrlType.HTML) for page_url in sitemap.page_urls] \
+            + [(sitemap_url, ScraperUrlType.SITEMAP) for sitemap_url in sitemap.sitemap_urls]
+        for entry, type in entries:
+            normalized_url = normalize_url(entry.loc)
+            fingerprint = url_fingerprint(normalized_url)
+            if fingerprint in batch_fingerprints or fingerprint in self.queued_urls:
+                continue
+            batch_fingerprints.add(fingerprint)
+            # the budget is only consumed by urls that are actually queued
+            skip_reason = self._skip_reason(normalized_url, type, skip_path_filter=False, check_budget=False)
+            if skip_reason:
+                logger.debug(f"skipping url before queueing - {skip_reason} - type={type} {normalized_url}")
+                skipped_counts[skip_reason] = skipped_counts.get(skip_reason, 0) + 1
+                continue
+            metadata = ScrapeUrlMetadata(
+                None, None, entry.lastmod, None,
+                changefreq=entry.changefreq, priority=entry.priority
+            ) if isinstance(entry, PageUrl) else None
+            candidates.append((ScraperUrl(entry.loc, max_depth=self.config.max_depth, type=type, metadata=metadata,
+                                          normalized_url=normalized_url, fingerprint=fingerprint), entry.lastmod))
+
+        last_fetched_at = await self._load_last_fetched_at_many(
+            [scraper_url.normalized_url for scraper_url, lastmod in candidates if lastmod is not None])
+        scraper_urls: list[ScraperUrl] = []
+        for scraper_url, lastmod in candidates:
+            if self._is_unchanged(scraper_url, lastmod, last_fetched_at.get(scraper_url.normalized_url)):
+                continue
+            if scraper_url.type == ScraperUrlType.HTML and not self._consume_budget(scraper_url.normalized_url):
+                skipped_counts["over budget"] = skipped_counts.get("over budget", 0) + 1
+                continue
+            scraper_urls.append(scraper_url)
+        await self._queue_many(scraper_urls, filtered=True, skipped_counts=skipped_counts)
+
+    async def _load_last_fetched_at_many(self, normalized_urls: list[str]) -> Dict[str, datetime | None]:
+        if not self.config.incremental or not normalized_urls:
+            return {}
+        try:
+            return await self.config.callback.load_last_fetched_at_many(normalized_urls)
+        except Exception as e:
+            raise ScraperCallbackError(f"Error loading last fetch times of {len(normalized_urls)} urls") from e
+
+    def _is_unchanged(self, scraper_url: ScraperUrl, lastmod: datetime | None, last_fetched_at: datetime | None) -> bool:
+        """
+        In incremental mode returns True if lastmod shows the url did not change since it was last fetched.
+        Urls that did change are marked to bypass the page cache.
+        """
+        if not self.config.incremental or lastmod is None or last_fetched_at is None:
+            return False
+        if as_utc(lastmod) <= as_utc(last_fetched_at):
+            logger.debug(f"skipping url before queueing - unchanged since last fetch - {self._url_context(scraper_url)}")
+            self.unchanged_urls_count += 1
+            return True
+        scraper_url.bypass_cache = True
+        return False
+
+    async def _save_last_fetched_at(self, scraper_url: ScraperUrl) -> None:
+        if not self.config.incremental:
+            return
+        try:
+            await self.config.callback.save_last_fetched_at(scraper_url.normalized_url, datetime.now(timezone.utc))
+        except Exception as e:
+            raise ScraperCallbackError(f"Error saving last fetch time {self._url_context(scraper_url)}") from e
             
     async def _enqueue_feed_urls(self, rss: Feed) -> None:
+        scraper_urls: list[ScraperUrl] = []
         for item in rss.items:
             if item.link:
                 metadata = ScrapeUrlMetadata(
                     item.title, item.description, item.pub_date, 
                     None if item.description is None else PageMetadataExtractor(item.link, item.description).get_image_url()
                 )
-                await self._queue_scraper_url(ScraperUrl(item.link, max_depth=self.config.max_depth, type=ScraperUrlType.HTML, metadata=metadata))
+                scraper_urls.append(ScraperUrl(item.link, max_depth=self.config.max_depth, type=ScraperUrlType.HTML, metadata=metadata))
+        await self._queue_many(scraper_urls)
 
     def _looper_context(self, looper_name: str)->str:
         return f"{looper_name} queued={len(self.queued_urls)} requested={self.requested_urls_count} success={self.success_urls_count} error={self.error_urls_count} skipped={self.skipped_urls_count}"
@@ -223,41 +557,53 @@ class Scraper:
         return f"type={scraper_url.type} {scraper_url.normalized_url}"
 
     def _was_max_requests_achieved(self) -> bool:
+        # continuous modes keep revisiting, they run until stop() is called
+        if self._is_continuous():
+            return False
         return self.requested_urls_count >= self.config.max_requested_urls
 
     
     async def _load_or_download_page(self, context: ScraperContext, url: ScraperUrl)-> ScraperWebPage:
-        try:
-            page = await self.config.callback.load_web_page_from_cache(url.normalized_url)        
-        except Exception as e:
-            raise ScraperCallbackError(f"Error loading page {self._url_context(url)}") from e                
-        if page:
-            return page
+        if not url.bypass_cache:
+            try:
+                page = await self.config.callback.load_web_page_from_cache(url.normalized_url)        
+            except Exception as e:
+                raise ScraperCallbackError(f"Error loading page {self._url_context(url)}") from e                
+            if page:
+                return page
         
-        await self.request_rate_limiter.acquire()
+        host = urlparse(url.normalized_url).netloc
+        await self.request_rate_limiter.acquire(host)
         
+        loop = asyncio.get_event_loop()
+        start_time: float | None = None
         try:
-            if self.config.use_headless_browser and self.browser_html_scraper_factory:
-                page = await self.browser_html_scraper_factory.new_scraper().scrape(url.normalized_url)
-            else:
-                page = await self.http_html_scraper_factory.new_scraper().scrape(url.normalized_url)
-            self.back_to_back_errors = 0            
-
+            async with self._host_slot(url.normalized_url):
+                start_time = loop.time()
+                if self.config.use_headless_browser and self.browser_html_scraper_factory:
+                    page = await self.browser_html_scraper_factory.new_scraper().scrape(url.normalized_url)
+                else:
+                    page = await self.http_html_scraper_factory.new_scraper().scrape(url.normalized_url)
         except Exception as e:
             logger.warning(f"Failed to fetch page {self._url_context(url)}")
-            self.back_to_back_errors += 1
-            if self.back_to_back_errors >= self.config.max_back_to_back_errors:
-                logger.error(f"Terminating due to maximum back to back errors reached")
-                await self.stop()
+            if start_time is not None:
+                self._throttle(host, loop.time() - start_time, success=False)
             raise ScraperError(f"Failed to fetch page {self._url_context(url)}") from e
+        self._throttle(host, loop.time() - start_time, success=True)
+        await self._save_last_fetched_at(url)
 
         page = await self._extract_metadata_and_save(context, url, page)        
         page.requested_at = datetime.now()
         return page
     
+    def _throttle(self, host: str, latency_seconds: float, success: bool) -> None:
+        if not self.auto_throttle:
+            return
+        delay_seconds = self.auto_throttle.record_response(host, latency_seconds, success)
+        self.request_rate_limiter.set_adaptive_delay(host, delay_seconds)
+
     async def _enqueue_web_page_urls(self, url: ScraperUrl, page: ScraperWebPage)-> None:        
-        for sitemap_url in page.sitemap_urls or []:
-            await self._queue_scraper_url(ScraperUrl(sitemap_url, max_depth=self.config.max_depth, type=ScraperUrlType.SITEMAP))
+        await self._queue_scraper_urls(page.sitemap_urls or [], ScraperUrlType.SITEMAP)
 
         if self.config.follow_web_page_links:
             await self._queue_scraper_urls(page.outgoing_urls or [], ScraperUrlType.HTML)            
@@ -270,31 +616,43 @@ class Scraper:
 
     
     async def _get_domain_metadata(self, scraper_url: ScraperUrl) -> DomainMetadata:
-        normalized_url_parsed = urlparse(scraper_url.normalized_url)
-        domain_metadata_task = self.domain_metadata.get(normalized_url_parsed.netloc)
+        return await self._domain_metadata_task(scraper_url.normalized_url, prefetch=False)
+
+    def _prefetch_domain_metadata(self, normalized_url: str) -> None:
+        if self.config.prefetch_domain_metadata:
+            self._domain_metadata_task(normalized_url, prefetch=True)
+
+    def _domain_metadata_task(self, normalized_url: str, prefetch: bool) -> asyncio.Task[DomainMetadata]:
+        normalized_url_parsed = urlparse(normalized_url)
+        netloc = normalized_url_parsed.netloc
+        domain_metadata_task = self.domain_metadata.get(netloc)
         if domain_metadata_task is not None:
-            return await domain_metadata_task
-        
-        domain_url = f"{normalized_url_parsed.scheme}://{normalized_url_parsed.netloc}"
-        logger.info(f"downloading domain metadata {domain_url}")
-        domain_metadata_task = asyncio.create_task(self._download_domain_metadata(domain_url))
-        self.domain_metadata[normalized_url_parsed.netloc] = domain_metadata_task        
-        domain_metadata = await domain_metadata_task
-        self.request_rate_limiter.reset(domain_metadata.robots.crawl_delay(self.config.user_agent) or self.config.crawl_delay_seconds)
-        return domain_metadata
+            if prefetch or netloc not in self.domain_metadata_prefetch_waiting or domain_metadata_task.done():
+                return domain_metadata_task
+            # a worker needs the metadata now, it does not wait behind the prefetch backlog
+            logger.info(f"prefetch still waiting, downloading domain metadata now {netloc}")
+            domain_metadata_task.cancel()
+        self.domain_metadata_prefetch_waiting.discard(netloc)
+
+        domain_url = f"{normalized_url_parsed.scheme}://{netloc}"
+        logger.info(f"downloading domain metadata {domain_url} prefetch={prefetch}")
+        if prefetch:
+            self.domain_metadata_prefetch_waiting.add(netloc)
+        domain_metadata_task = asyncio.create_task(self._download_domain_metadata(domain_url, prefetch))
+        self.domain_metadata[netloc] = domain_metadata_task        
+        return domain_metadata_task
 
     
-    async def _download_domain_metadata(self, domain_url: str) -> DomainMetadata:
+    async def _download_domain_metadata(self, domain_url: str, prefetch: bool = False) -> DomainMetadata:
         robots_url = make_absolute_url(domain_url, "/robots.txt")
-        try:
-            logger.info(f"downloading robots.txt {robots_url}")
-            robot = await Robot.download_and_parse(robots_url, self.http_html_scraper_factory.client_session)
-        except Exception as e:
-            logger.error(f"Error fetching sitemap {robots_url}: {e}")
-            robot = Robot()
-            
-        self.request_rate_limiter.reset(
-            robot.crawl_delay(self.config.user_agent) or self.config.crawl_delay_seconds
+        robot = self.config.robots_cache.get(robots_url) if self.config.robots_cache else None
+        if robot is None:
+            robot = await self._download_robot(robots_url, prefetch)
+
+        self.request_rate_limiter.configure(
+            urlparse(domain_url).netloc,
+            crawl_delay_seconds=robot.crawl_delay(self.config.user_agent),
+            request_rate=robot.request_rate(self.config.user_agent),
         )
 
         if self.config.follow_sitemap_links:
@@ -304,36 +662,130 @@ class Scraper:
             robots=robot,
             domain_url=domain_url)
     
+    async def _download_robot(self, robots_url: str, prefetch: bool) -> Robot:
+        try:
+            logger.info(f"downloading robots.txt {robots_url}")
+            if prefetch:
+                # fetching robots.txt also resolves the host into the connector DNS cache
+                async with self.domain_metadata_prefetch_semaphore:
+                    self.domain_metadata_prefetch_waiting.discard(urlparse(robots_url).netloc)
+                    robot = await Robot.download_and_parse(robots_url, self.http_html_scraper_factory.client_session)
+            else:
+                robot = await Robot.download_and_parse(robots_url, self.http_html_scraper_factory.client_session)
+        except Exception as e:
+            logger.error(f"Error fetching sitemap {robots_url}: {e}")
+            return Robot()
+        if self.config.robots_cache:
+            self.config.robots_cache.put(robots_url, robot)
+        return robot
+
     async def _queue_sitemap_urls(self, sitemap: Sitemap)-> None:
-        for page_url in sitemap.page_urls:
-            await self._queue_scraper_url(ScraperUrl(page_url.loc, max_depth=self.config.max_depth, type=ScraperUrlType.HTML, high_priority=True))
-        for sitemap_url in sitemap.sitemap_urls:
-            await self._queue_scraper_url(ScraperUrl(sitemap_url.loc, max_depth=self.config.max_depth, type=ScraperUrlType.SITEMAP))
+        await self._queue_many(
+            [ScraperUrl(page_url.loc, max_depth=self.config.max_depth, type=ScraperUrlType.HTML, high_priority=True) for page_url in sitemap.page_urls]
+            + [ScraperUrl(sitemap_url.loc, max_depth=self.config.max_depth, type=ScraperUrlType.SITEMAP) for sitemap_url in sitemap.sitemap_urls])
             
     async def _queue_scraper_urls(self, urls: list[str], type: ScraperUrlType) -> None:
+        """Normalizes, deduplicates and filters the urls as strings, ScraperUrl objects are only created for urls that pass"""
+        batch_urls: set[str] = set()
+        scraper_urls: list[ScraperUrl] = []
+        skipped_counts: Dict[str, int] = {}
         for url in urls:
-            await self._queue_scraper_url(ScraperUrl(url, max_depth=self.config.max_depth, type=type))
+            normalized_url = normalize_url(url)
+            fingerprint = url_fingerprint(normalized_url)
+            if normalized_url in batch_urls or fingerprint in self.queued_urls:
+                continue
+            batch_urls.add(normalized_url)
+            skip_reason = self._skip_reason(normalized_url, type, skip_path_filter=False)
+            if skip_reason:
+                logger.debug(f"skipping url before queueing - {skip_reason} - type={type} {normalized_url}")
+                skipped_counts[skip_reason] = skipped_counts.get(skip_reason, 0) + 1
+                continue
+            scraper_urls.append(ScraperUrl(url, max_depth=self.config.max_depth, type=type, normalized_url=normalized_url, fingerprint=fingerprint))
+        await self._queue_many(scraper_urls, filtered=True, skipped_counts=skipped_counts)
+
+    def _is_path_allowed(self, normalized_url: str) -> bool:
+        return not self.exclude_path_patterns.is_passing(normalized_url) \
+            and self.include_path_patterns.is_passing(normalized_url)
 
     async def _queue_scraper_url(self, scraper_url: ScraperUrl, skip_path_filter: bool = False) -> None:
-        if scraper_url.normalized_url in self.queued_urls:
-            return
-        if not self._is_domain_allowed(scraper_url.normalized_url):
-            logger.info(f"skipping url before queueing - domain not allowed - {self._looper_context('')} - {self._url_context(scraper_url)}")
-            return
-        
-        if scraper_url.type == ScraperUrlType.HTML \
-            and not skip_path_filter \
-            and ( self.exclude_path_patterns.is_passing(scraper_url.normalized_url)
-                or not self.include_path_patterns.is_passing(scraper_url.normalized_url)):
-            logger.info(f"skipping url before queueing - path not allowed - {self._looper_context('')} - {self._url_context(scraper_url)}")
-            return
-                
-        logger.info(f"queueing - {self._looper_context('')} - url: {self._url_context(scraper_url)}")
-        self.queued_urls.add(scraper_url.normalized_url)
-        if scraper_url.type == ScraperUrlType.FEED \
-            or scraper_url.type == ScraperUrlType.SITEMAP\
+        await self._queue_many([scraper_url], skip_path_filter)
+
+    async def _queue_many(self, scraper_urls: list[ScraperUrl], skip_path_filter: bool = False,
+                          filtered: bool = False, skipped_counts: Dict[str, int] | None = None) -> int:
+        """
+        Filters a batch of urls and adds the remaining ones to the frontier:
+        - Urls are deduplicated, then checked against the domain filter, path filters, crawl traps and budgets,
+          unless the caller already filtered them.
+        - Each queue is extended once for the whole batch, waking waiting workers in bulk.
+        - One summary line is logged per batch instead of a line per url.
+        Returns the number of queued urls.
+        """
+        skipped_counts = skipped_counts if skipped_counts is not None else {}
+        sitemap_urls: list[ScraperUrl] = []
+        right_urls: list[ScraperUrl] = []
+        left_urls: list[ScraperUrl] = []
+        for scraper_url in scraper_urls:
+            if scraper_url.fingerprint in self.queued_urls:
+                continue
+            skip_reason = None if filtered else self._skip_reason(scraper_url.normalized_url, scraper_url.type, skip_path_filter)
+            if skip_reason:
+                logger.debug(f"skipping url before queueing - {skip_reason} - {self._url_context(scraper_url)}")
+                skipped_counts[skip_reason] = skipped_counts.get(skip_reason, 0) + 1
+                continue
+            self.queued_urls.add(scraper_url.fingerprint)
+            if self.domain_stats_urls is not None:
+                self.domain_stats_urls.append(scraper_url.normalized_url)
+            self._prefetch_domain_metadata(scraper_url.normalized_url)
+            if scraper_url.type == ScraperUrlType.SITEMAP and self.sitemap_queue is not None:
+                sitemap_urls.append(scraper_url)
+            elif self._is_pushed_right(scraper_url):
+                right_urls.append(scraper_url)
+            else:
+                left_urls.append(scraper_url)
+
+        if sitemap_urls and self.sitemap_queue is not None:
+            await self.sitemap_queue.extendleft(sitemap_urls)
+        if right_urls:
+            await self.url_queue.extendright(right_urls)
+        if left_urls:
+            await self.url_queue.extendleft(left_urls)
+
+        queued_urls_count = len(sitemap_urls) + len(right_urls) + len(left_urls)
+        if queued_urls_count or skipped_counts:
+            skipped = " ".join(f"{reason}={count}" for reason, count in skipped_counts.items())
+            logger.info(f"queueing - {self._looper_context('')} - queued: {queued_urls_count} skipped: {skipped or 0}")
+        return queued_urls_count
+
+    def _skip_reason(self, normalized_url: str, type: ScraperUrlType, skip_path_filter: bool, check_budget: bool = True) -> str | None:
+        """Returns why the url must not be queued, consuming its budget if it can be"""
+        if not self._is_domain_allowed(normalized_url):
+            return "domain not allowed"
+        if type != ScraperUrlType.HTML:
+            return None
+        if not skip_path_filter:
+            if not self._is_path_allowed(normalized_url):
+                return "path not allowed"
+            if self.trap_detector:
+                trap_reason = self.trap_detector.check(normalized_url)
+                if trap_reason:
+                    return f"crawl trap {trap_reason.value}"
+        if check_budget and not self._consume_budget(normalized_url):
+            return "over budget"
+        return None
+
+    def _consume_budget(self, normalized_url: str) -> bool:
+        return self.budget is None or self.budget.try_consume(normalized_url)
+
+    def _is_pushed_right(self, scraper_url: ScraperUrl) -> bool:
+        return scraper_url.type == ScraperUrlType.FEED \
+            or scraper_url.type == ScraperUrlType.SITEMAP \
             or scraper_url.type == ScraperUrlType.TERMINATE_LOOP \
-            or scraper_url.high_priority:
+            or scraper_url.high_priority
+
+    async def _push_scraper_url(self, scraper_url: ScraperUrl) -> None:
+        if scraper_url.type == ScraperUrlType.SITEMAP and self.sitemap_queue is not None:
+            await self.sitemap_queue.appendleft(scraper_url)
+        elif self._is_pushed_right(scraper_url):
             await self.url_queue.appendright(scraper_url) 
         else:
             await self.url_queue.appendleft(scraper_url)
@@ -346,7 +798,8 @@ class Scraper:
         return (self.success_urls_count+self.error_urls_count+self.skipped_urls_count) >= len(self.queued_urls)
 
     async def _terminate_all_loops_if_needed(self, name: str) -> None:   
-        if not self._is_crawler_empty():
+        # continuous modes run until stop() is called
+        if self._is_continuous() or not self._is_crawler_empty():
             return
         logger.info(
             f"terminating all loops - no more queued urls - {self._looper_context(name)}")
@@ -1,8 +1,11 @@
-from typing import List, Dict, Union, Optional
+from typing import AsyncGenerator, Iterator, List, Dict, Tuple, Union, Optional, cast
 import aiohttp
 from datetime import datetime
 from enum import Enum
 import logging
+from .fetch import FetchStatusError, iter_body, iter_decompressed
+from .bandwidth import BandwidthLimiter
+from .dates import parse_date
 
 import xml.etree.ElementTree as ET
 
@@ -39,73 +42,135 @@ class PageUrl:
         self.changefreq = changefreq
         self.priority = priority        
 
+SitemapEntry = Union[PageUrl, SitemapUrl]
+
+def _parse_lastmod(elem: ET.Element, namespace: str) -> datetime | None:
+    lastmod_elem = elem.find(f'{namespace}lastmod')
+    if lastmod_elem is None or lastmod_elem.text is None:
+        return None
+    return parse_date(lastmod_elem.text)
+
+class SitemapStreamParser:
+    """
+    Incremental sitemap parser with memory bounded by the size of one entry:
+    - Bytes are fed as they arrive, entries are returned as soon as their closing tag is seen.
+    - Parsed entries are cleared from the tree, so the document is never held in memory.
+    """
+    def __init__(self) -> None:
+        self.parser: ET.XMLPullParser[ET.Element] = ET.XMLPullParser(events=('start', 'end'))
+        self.root: ET.Element | None = None
+        self.namespace = ''
+        self.is_index = False
+        self.depth = 0
+
+    def feed(self, data: bytes | str) -> List[SitemapEntry]:
+        self.parser.feed(data)
+        return self._read_events()
+
+    def close(self) -> List[SitemapEntry]:
+        self.parser.close()
+        return self._read_events()
+
+    def _read_events(self) -> List[SitemapEntry]:
+        entries: List[SitemapEntry] = []
+        # only start and end events are requested, so every event carries an element
+        for event, elem in cast(Iterator[Tuple[str, ET.Element]], self.parser.read_events()):
+            if event == 'start':
+                self.depth += 1
+                if self.root is None:
+                    self._start_root(elem)
+                continue
+            if self.depth == 2:
+                entry = self._parse_entry(elem)
+                if entry is not None:
+                    entries.append(entry)
+                assert self.root is not None
+                self.root.clear()
+            self.depth -= 1
+        return entries
+
+    def _start_root(self, root: ET.Element) -> None:
+        if root.tag.endswith('urlset'):
+            self.is_index = False
+        elif root.tag.endswith('sitemapindex'):
+            self.is_index = True
+        else:
+            raise ValueError("Unsupported XML format")
+        self.root = root
+        if root.tag.startswith('{'):
+            self.namespace = root.tag[:root.tag.index('}') + 1]
+
+    def _parse_entry(self, elem: ET.Element) -> SitemapEntry | None:
+        if elem.tag != f"{self.namespace}{'sitemap' if self.is_index else 'url'}":
+            return None
+        loc_elem = elem.find(f'{self.namespace}loc')
+        if loc_elem is None or loc_elem.text is None:
+            return None
+        loc = loc_elem.text.strip()
+        lastmod_date = _parse_lastmod(elem, self.namespace)
+        if self.is_index:
+            return SitemapUrl(loc, lastmod_date)
+        changefreq_elem = elem.find(f'{self.namespace}changefreq')
+        changefreq = ChangeFrequency.from_str(changefreq_elem.text.strip()) if changefreq_elem is not None and changefreq_elem.text is not None else None
+        priority_elem = elem.find(f'{self.namespace}priority')
+        priority = float(priority_elem.text) if priority_elem is not None and priority_elem.text is not None else None
+        return PageUrl(loc, lastmod_date, changefreq, priority)
+
 class Sitemap:
     def __init__(self) -> None:
         self.page_urls: List[PageUrl] = []
         self.sitemap_urls: List[SitemapUrl] = []
 
-    def parse(self, xml_content: str) -> None:
-
-        tree: ET.ElementTree = ET.ElementTree(ET.fromstring(xml_content))
-        root: ET.Element = tree.getroot()
+    def __len__(self) -> int:
+        return len(self.page_urls) + len(self.sitemap_urls)
 
-        if root.tag.endswith('urlset'):
-            self.page_urls =self._parse_urlset(root)
-        elif root.tag.endswith('sitemapindex'):
-            self.sitemap_urls = self._parse_sitemapindex(root)
+    def add(self, entry: SitemapEntry) -> None:
+        if isinstance(entry, PageUrl):
+            self.page_urls.append(entry)
         else:
-            raise ValueError("Unsupported XML format")
+            self.sitemap_urls.append(entry)
 
-    def _parse_urlset(self, root: ET.Element) -> List[PageUrl]:
-        urls = []
-        namespace = {'ns': root.tag.split('}')[0].strip('{')}
-        for url in root.findall('ns:url', namespace):
-            loc_elem = url.find('ns:loc', namespace)
-            if loc_elem is None or loc_elem.text is None:
-                continue
-            loc = loc_elem.text
-            lastmod_elem = url.find('ns:lastmod', namespace)
-            lastmod = lastmod_elem.text if lastmod_elem is not None else None
-            lastmod_date = None
-            if lastmod is not None:
-                lastmod_date = datetime.fromisoformat(lastmod.replace('Z', '+00:00'))
-            changefreq_elem = url.find('ns:changefreq', namespace)
-            changefreq = ChangeFrequency.from_str(changefreq_elem.text) if changefreq_elem is not None and changefreq_elem.text is not None else None
-            priority_elem = url.find('ns:priority', namespace)
-            priority = float(priority_elem.text) if priority_elem is not None and priority_elem.text is not None else None
-            urls.append(PageUrl(loc, lastmod_date, changefreq, priority))
-
-        return urls
-
-    def _parse_sitemapindex(self, root: ET.Element) -> List[SitemapUrl]:
-        sitemaps = []
-        namespace = {'ns': root.tag.split('}')[0].strip('{')}
-        for sitemap in root.findall('ns:sitemap', namespace):
-            loc_elem = sitemap.find('ns:loc', namespace)
-            if loc_elem is None or loc_elem.text is None:
-                continue
-            loc = loc_elem.text
-            lastmod_elem = sitemap.find('ns:lastmod', namespace)
-            lastmod = lastmod_elem.text if lastmod_elem is not None else None
-            lastmod_date = None
-            if lastmod is not None:
-                lastmod_date = datetime.fromisoformat(lastmod.replace('Z', '+00:00'))
-            sitemaps.append(SitemapUrl(loc, lastmod_date))
-        return sitemaps
+    def parse(self, xml_content: str) -> None:
+        parser = SitemapStreamParser()
+        for entry in parser.feed(xml_content) + parser.close():
+            self.add(entry)
 
     @classmethod
-    async def download_and_parse(cls, normalized_url: str, session: aiohttp.ClientSession, timeout_seconds: int = 30) -> "Sitemap":
-        """Downloads sitemap from URL and returns parsed result"""
-        
+    async def stream(cls, normalized_url: str, session: aiohttp.ClientSession, timeout_seconds: int = 30, bandwidth_limiter: Optional[BandwidthLimiter] = None, batch_size: int = 1000) -> AsyncGenerator["Sitemap", None]:
+        """
+        Downloads sitemap from URL and yields it as partial sitemaps of up to batch_size entries,
+        each batch is yielded while the rest of the body is still being downloaded
+        """
         try:
-            async with session.get(normalized_url, timeout=aiohttp.ClientTimeout(total=timeout_seconds)) as response:
+            # the timeout applies per read, the consumer may take long to process batches of a large sitemap
+            timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout_seconds, sock_read=timeout_seconds)
+            async with session.get(normalized_url, timeout=timeout) as response:
                 if response.status != 200:
-                    raise ValueError(f"Failed to download sitemap: {response.status}")
-                content = await response.text()
-                parser = cls()
-                parser.parse(content)
-                return parser
+                    raise FetchStatusError(f"Failed to download sitemap: {response.status}", response.status, response.headers)
+                parser = SitemapStreamParser()
+                batch = cls()
+                yielded = False
+                # sitemap.xml.gz bodies are detected by their magic bytes and decompressed as they stream
+                async for chunk in iter_decompressed(iter_body(response, bandwidth_limiter)):
+                    for entry in parser.feed(chunk):
+                        batch.add(entry)
+                        if len(batch) >= batch_size:
+                            yield batch
+                            yielded = True
+                            batch = cls()
+                for entry in parser.close():
+                    batch.add(entry)
+                if len(batch) or not yielded:
+                    yield batch
         except Exception as e:
             logger.error(f"Error fetching {normalized_url}: {e}")
-            raise SitemapError(f"""Failed to fetch sitemap from {normalized_url}""") from e                    
+            raise SitemapError(f"""Failed to fetch sitemap from {normalized_url}""") from e
 
+    @classmethod
+    async def download_and_parse(cls, normalized_url: str, session: aiohttp.ClientSession, timeout_seconds: int = 30, bandwidth_limiter: Optional[BandwidthLimiter] = None) -> "Sitemap":
+        """Downloads sitemap from URL and returns parsed result"""
+        sitemap = cls()
+        async for batch in cls.stream(normalized_url, session, timeout_seconds, bandwidth_limiter):
+            sitemap.page_urls.extend(batch.page_urls)
+            sitemap.sitemap_urls.extend(batch.sitemap_urls)
+        return sitemap
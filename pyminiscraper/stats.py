@@ -1,13 +1,18 @@
 from urllib.parse import urlparse
 from collections import defaultdict
 from typing import List, Dict, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 @dataclass
 class DomainStats:
     domain: str
     frequent_subpaths: Dict[str, int]
 
+@dataclass
+class TrapStats:
+    domain: str
+    reasons: Dict[str, int]
+
 @dataclass
 class ScraperStats:
 
@@ -26,6 +31,19 @@ class ScraperStats:
     error_urls_count: int
     skipped_urls_count: int
     domain_stats: Dict[str, DomainStats]
+    trapped_urls_count: int = 0
+    trap_stats: Dict[str, TrapStats] = field(default_factory=dict)
+    over_budget_urls_count: int = 0
+    host_concurrency_limits: Dict[str, float] = field(default_factory=dict)
+    retried_urls_count: int = 0
+    host_circuit_states: Dict[str, str] = field(default_factory=dict)
+    downloaded_bytes_count: int = 0
+    bytes_per_second: float = 0.0
+    host_crawl_delays: Dict[str, float] = field(default_factory=dict)
+    unchanged_urls_count: int = 0
+    revisited_urls_count: int = 0
+    not_modified_feeds_count: int = 0
+    new_feed_items_count: int = 0
 
 def analyze_url_groups(urls: List[str], min_pages_per_sub_path: int = 5) -> Dict[str, DomainStats]:
     # Group URLs by domain
@@ -1,10 +1,12 @@
 from .config import ScraperCallback, ScraperContext
 from typing import Optional, override
+from datetime import datetime, timezone
 from .model import ScraperWebPage, ScraperUrl
 import os
 import json
 from dateutil import parser
 from .url import normalized_url_hash
+from .feed_poller import FeedPollState
 
 class FileStore(ScraperCallback):
     def __init__(self, directory: str):
@@ -54,6 +56,37 @@ class FileStore(ScraperCallback):
         with open(filepath, 'r', encoding='utf-8') as f:
             return self.model_load_json(f.read())
         
+    @override
+    async def load_last_fetched_at(self, normalized_url: str) -> Optional[datetime]:
+        filepath = os.path.join(self.directory, f"{self.safe_filename(normalized_url)}.fetched")
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath, 'r', encoding='utf-8') as f:
+            fetched_at = datetime.fromisoformat(f.read().strip())
+        return fetched_at if fetched_at.tzinfo else fetched_at.replace(tzinfo=timezone.utc)
+
+    @override
+    async def save_last_fetched_at(self, normalized_url: str, fetched_at: datetime) -> None:
+        filepath = os.path.join(self.directory, f"{self.safe_filename(normalized_url)}.fetched")
+        os.makedirs(self.directory, exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(fetched_at.astimezone(timezone.utc).isoformat())
+
+    @override
+    async def load_feed_poll_state(self, normalized_url: str) -> Optional[FeedPollState]:
+        filepath = os.path.join(self.directory, f"{self.safe_filename(normalized_url)}.feed.json")
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return FeedPollState.from_dict(json.load(f))
+
+    @override
+    async def save_feed_poll_state(self, normalized_url: str, state: FeedPollState) -> None:
+        filepath = os.path.join(self.directory, f"{self.safe_filename(normalized_url)}.feed.json")
+        os.makedirs(self.directory, exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(state.to_dict(), f)
+
     def safe_filename(self, normalized_url: str) -> str:
         hash = normalized_url_hash(normalized_url)
         safe_normalized_url = normalized_url.replace('/', '_').replace(':', '_')
@@ -1,10 +1,14 @@
 from .config import ScraperCallback, ScraperContext
 from typing import Optional, override
+from datetime import datetime
 from .model import ScraperWebPage, ScraperUrl
+from .feed_poller import FeedPollState
 
 class MemoryStore(ScraperCallback):
     def __init__(self, store: dict[str, ScraperWebPage]) -> None:
         self.store = store
+        self.fetched_at: dict[str, datetime] = {}
+        self.feed_poll_states: dict[str, FeedPollState] = {}
         
     @override
     async def on_web_page(self, context: ScraperContext, request: ScraperUrl, response: ScraperWebPage) -> None:
@@ -12,4 +16,24 @@ class MemoryStore(ScraperCallback):
         
     @override
     async def load_web_page_from_cache(self, normalized_url: str) -> Optional[ScraperWebPage]:
-        return self.store.get(normalized_url)
\ No newline at end of file
+        return self.store.get(normalized_url)
+
+    @override
+    async def load_last_fetched_at(self, normalized_url: str) -> Optional[datetime]:
+        return self.fetched_at.get(normalized_url)
+
+    @override
+    async def load_last_fetched_at_many(self, normalized_urls: list[str]) -> dict[str, Optional[datetime]]:
+        return {normalized_url: self.fetched_at.get(normalized_url) for normalized_url in normalized_urls}
+
+    @override
+    async def save_last_fetched_at(self, normalized_url: str, fetched_at: datetime) -> None:
+        self.fetched_at[normalized_url] = fetched_at
+
+    @override
+    async def load_feed_poll_state(self, normalized_url: str) -> Optional[FeedPollState]:
+        return self.feed_poll_states.get(normalized_url)
+
+    @override
+    async def save_feed_poll_state(self, normalized_url: str, state: FeedPollState) -> None:
+        self.feed_poll_states[normalized_url] = state
@@ -0,0 +1,151 @@
+from collections import defaultdict
+from enum import Enum
+from typing import Dict, Optional
+from urllib.parse import urlsplit, parse_qsl
+import hashlib
+import logging
+import re
+from .stats import TrapStats
+
+logger = logging.getLogger("trap")
+
+_DIGITS_RE = re.compile(r'\d+')
+
+
+class TrapReason(Enum):
+    REPEATING_PATH_SEGMENTS = "repeating_path_segments"
+    UNBOUNDED_NUMERIC_PARAMETER = "unbounded_numeric_parameter"
+    QUERY_COMBINATION_EXPLOSION = "query_combination_explosion"
+    STALE_LINK_YIELD = "stale_link_yield"
+
+
+class HostTrapState:
+    def __init__(self) -> None:
+        self.numeric_parameter_values: Dict[tuple[str, str], set[str]] = defaultdict(set)
+        self.query_combinations: Dict[str, set[frozenset[str]]] = defaultdict(set)
+        # insertion ordered, so the least recently seen hashes are dropped first
+        self.content_hashes: Dict[bytes, None] = {}
+        self.stale_link_yield_pages = 0
+        # urls still dropped under the current stale link yield verdict
+        self.blocked_urls_left = 0
+        self.trapped_counts: Dict[TrapReason, int] = defaultdict(int)
+
+
+class CrawlTrapDetector:
+    """
+    Detects URL patterns that generate endless unique urls on a host:
+    - Repeating path segments (/a/b/a/b/a/b).
+    - Numeric query parameters with unbounded number of values (?page=1..N).
+    - Exploding combinations of query parameters on the same path template.
+    - Hosts that keep yielding new links while serving already seen content. The verdict drops the next
+      stale_link_yield_blocked_urls urls of the host, and is lifted early once the host serves new content.
+    """
+    def __init__(self, *,
+                 max_path_segment_repeats: int = 3,
+                 max_numeric_parameter_values: int = 1000,
+                 max_query_combinations_per_path: int = 64,
+                 max_stale_link_yield_pages: int = 50,
+                 stale_link_yield_blocked_urls: int = 1000,
+                 max_content_hashes_per_host: int = 10000) -> None:
+        self.max_path_segment_repeats = max_path_segment_repeats
+        self.max_numeric_parameter_values = max_numeric_parameter_values
+        self.max_query_combinations_per_path = max_query_combinations_per_path
+        self.max_stale_link_yield_pages = max_stale_link_yield_pages
+        self.stale_link_yield_blocked_urls = stale_link_yield_blocked_urls
+        self.max_content_hashes_per_host = max_content_hashes_per_host
+        self.hosts: Dict[str, HostTrapState] = defaultdict(HostTrapState)
+        self.trapped_urls_count = 0
+
+    def check(self, normalized_url: str) -> Optional[TrapReason]:
+        """Returns the trap reason if the url should not be queued, registers the url otherwise"""
+        parsed_url = urlsplit(normalized_url)
+        host = self.hosts[parsed_url.netloc]
+        reason = self._detect(host, parsed_url.path, parsed_url.query)
+        if reason is not None:
+            host.trapped_counts[reason] += 1
+            self.trapped_urls_count += 1
+        return reason
+
+    def _detect(self, host: HostTrapState, path: str, query: str) -> Optional[TrapReason]:
+        if host.blocked_urls_left > 0:
+            host.blocked_urls_left -= 1
+            return TrapReason.STALE_LINK_YIELD
+
+        segments = [segment for segment in path.split('/') if segment]
+        if self._max_segment_repeats(segments) > self.max_path_segment_repeats:
+            return TrapReason.REPEATING_PATH_SEGMENTS
+
+        if not query:
+            return None
+
+        path_template = _DIGITS_RE.sub('0', path)
+        query_params = parse_qsl(query, keep_blank_values=True)
+
+        combination = frozenset(name for name, _ in query_params)
+        combinations = host.query_combinations[path_template]
+        if combination not in combinations:
+            if len(combinations) >= self.max_query_combinations_per_path:
+                return TrapReason.QUERY_COMBINATION_EXPLOSION
+
+        new_numeric_values: list[tuple[set[str], str]] = []
+        for name, value in query_params:
+            if not value.isdigit():
+                continue
+            values = host.numeric_parameter_values[(path_template, name)]
+            if value in values:
+                continue
+            if len(values) >= self.max_numeric_parameter_values:
+                return TrapReason.UNBOUNDED_NUMERIC_PARAMETER
+            new_numeric_values.append((values, value))
+
+        combinations.add(combination)
+        for values, value in new_numeric_values:
+            values.add(value)
+        return None
+
+    @staticmethod
+    def _max_segment_repeats(segments: list[str]) -> int:
+        counts: Dict[str, int] = defaultdict(int)
+        max_repeats = 0
+        for segment in segments:
+            counts[segment] += 1
+            max_repeats = max(max_repeats, counts[segment])
+        return max_repeats
+
+    def record_page(self, normalized_url: str, content: Optional[str], new_links_count: int) -> None:
+        """Tracks hosts that keep producing new links without producing new content"""
+        if content is None:
+            return
+        host_name = urlsplit(normalized_url).netloc
+        host = self.hosts[host_name]
+        content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=8).digest()
+        if content_hash not in host.content_hashes:
+            host.content_hashes[content_hash] = None
+            if len(host.content_hashes) > self.max_content_hashes_per_host:
+                del host.content_hashes[next(iter(host.content_hashes))]
+            host.stale_link_yield_pages = 0
+            if host.blocked_urls_left > 0:
+                logger.info(f"host no longer marked as crawl trap - new content - {host_name}")
+                host.blocked_urls_left = 0
+            return
+        # move to the end, so hashes still being served are dropped last
+        del host.content_hashes[content_hash]
+        host.content_hashes[content_hash] = None
+        if new_links_count <= 0:
+            return
+        host.stale_link_yield_pages += 1
+        if host.blocked_urls_left == 0 and host.stale_link_yield_pages >= self.max_stale_link_yield_pages:
+            logger.warning(f"host marked as crawl trap - links keep growing without new content - {host_name}")
+            host.blocked_urls_left = self.stale_link_yield_blocked_urls
+            # a new verdict needs a new streak of stale pages
+            host.stale_link_yield_pages = 0
+
+    def stats(self) -> Dict[str, TrapStats]:
+        return {
+            host_name: TrapStats(
+                domain=host_name,
+                reasons={reason.value: count for reason, count in host.trapped_counts.items()}
+            )
+            for host_name, host in self.hosts.items()
+            if host.trapped_counts
+        }
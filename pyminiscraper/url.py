@@ -1,6 +1,7 @@
-from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode, urljoin
+from urllib.parse import urlparse, urlunparse, urlsplit, urlunsplit, parse_qsl, urlencode, urljoin, SplitResult
+from collections import OrderedDict
 import re
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Tuple
 from re import Match
 from .hash import generate_url_safe_id
 
@@ -151,8 +152,91 @@ def normalize_changing_semantics(url: str) -> str:
     ))
     return normalized_url
 
+UNRESERVED_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+DIRECTORY_INDEXES = ('index.html', 'index.htm', 'default.asp')
+PERCENT_ENCODED_PATTERN = re.compile(r'%[0-9a-fA-F]{2}')
+DUPLICATE_SLASHES_PATTERN = re.compile(r'//+')
+
+def _normalize_percent_encoded(match: Match) -> str:
+    pct_encoded = match.group(0).upper()
+    char = chr(int(pct_encoded[1:], 16))
+    return char if char in UNRESERVED_CHARS else pct_encoded
+
+def normalize_url_single_pass(url: str) -> Tuple[str, bool]:
+    """
+    Applies all normalize_changing_semantics rules with a single parse.
+    Returns the normalized url and whether normalizing it again would return it unchanged.
+    """
+    scheme, netloc, path, params, query, _ = urlparse(url)
+    scheme = scheme.lower()
+    netloc = netloc.lower()
+
+    hostname, _, port = netloc.partition(':')
+    if (scheme == 'http' and port == '80') or (scheme == 'https' and port == '443'):
+        netloc = hostname
+
+    if '%' in path:
+        path = PERCENT_ENCODED_PATTERN.sub(_normalize_percent_encoded, path)
+    path = remove_dot_segments(path)
+
+    # removing a directory index leaves a trailing slash, which the next normalization drops
+    idempotent = True
+    for index in DIRECTORY_INDEXES:
+        if path.endswith(index):
+            path = path[:-(len(index))]
+            if not path.endswith('/'):
+                path += '/'
+            idempotent = path == '/'
+            break
+
+    if '//' in path:
+        path = DUPLICATE_SLASHES_PATTERN.sub('/', path)
+
+    # params are split from the last path segment only, once empty segments are dropped
+    # a ';' in the path can become params on the next parse, which normalizes differently
+    if params or ';' in path:
+        idempotent = False
+
+    if netloc.startswith('www.'):
+        netloc = netloc[4:]
+        idempotent = idempotent and not netloc.startswith('www.')
+
+    if query:
+        query_params: List[Tuple[str, str]] = parse_qsl(query, keep_blank_values=True)
+        query_params.sort()
+        query = urlencode(query_params, doseq=True)
+
+    return urlunparse((scheme, netloc, path, params, query, '')), idempotent
+
+class NormalizedUrlMemo:
+    """Bounded LRU of normalized urls, already normalized urls are remembered as mapping to themselves"""
+    def __init__(self, max_size: int = 65536) -> None:
+        self.max_size = max_size
+        self.urls: OrderedDict[str, str] = OrderedDict()
+
+    def normalize(self, url: str) -> str:
+        normalized_url = self.urls.get(url)
+        if normalized_url is not None:
+            self.urls.move_to_end(url)
+            return normalized_url
+        normalized_url, idempotent = normalize_url_single_pass(url)
+        self._put(url, normalized_url)
+        if idempotent and normalized_url != url:
+            self._put(normalized_url, normalized_url)
+        return normalized_url
+
+    def _put(self, url: str, normalized_url: str) -> None:
+        self.urls[url] = normalized_url
+        if len(self.urls) > self.max_size:
+            self.urls.popitem(last=False)
+
+    def clear(self) -> None:
+        self.urls.clear()
+
+normalized_url_memo = NormalizedUrlMemo()
+
 def normalize_url(url:str)->str:   
-    return normalize_changing_semantics(url)
+    return normalized_url_memo.normalize(url)
 
 def normalized_url_hash(url:str)->str:
     normalized_url = normalize_url(url)
@@ -165,3 +249,61 @@ def make_absolute_url(base_url, relative_url) -> str:
         return relative_url
         
     return urljoin(base_url, relative_url)
+
+class LinkResolver:
+    """
+    Resolves the links of one page against its url in a single pass:
+    - The base url is parsed once, each href is parsed once.
+    - Empty, javascript:, mailto: and fragment-only hrefs are dropped.
+    - Hrefs whose path ends with one of excluded_extensions are dropped with a single suffix check.
+    - Root-relative hrefs without dot segments or duplicate slashes are joined without urljoin.
+    """
+    EXCLUDED_PREFIXES = ('javascript:', 'mailto:', '#')
+
+    def __init__(self, base_url: str, excluded_extensions: Tuple[str, ...] = ()) -> None:
+        self.base_url = base_url
+        self.excluded_extensions = excluded_extensions
+        base = urlsplit(base_url)
+        self.base_scheme = base.scheme
+        self.base_netloc = base.netloc
+
+    def is_excluded(self, href: str) -> bool:
+        return self._parse(href) is None
+
+    def _parse(self, href: str) -> Optional[SplitResult]:
+        if not href or href.startswith(self.EXCLUDED_PREFIXES):
+            return None
+        parts = urlsplit(href)
+        if self.excluded_extensions:
+            # urlparse splits ;params off the last path segment before extensions are checked
+            path = parts.path
+            params_start = path.find(';', path.rfind('/') + 1)
+            if params_start >= 0:
+                path = path[:params_start]
+            if path.lower().endswith(self.excluded_extensions):
+                return None
+        return parts
+
+    def resolve(self, href: str) -> Optional[str]:
+        """Returns the absolute url of the href, or None if it is excluded"""
+        href = href.strip()
+        parts = self._parse(href)
+        if parts is None:
+            return None
+        if parts.netloc:
+            return href
+        path = parts.path
+        if not parts.scheme and path.startswith('/') and '/.' not in path and '//' not in path:
+            return urlunsplit((self.base_scheme, self.base_netloc, path, parts.query, parts.fragment))
+        return urljoin(self.base_url, href)
+
+    def resolve_all(self, hrefs: Iterable[str]) -> List[str]:
+        """Resolves hrefs in order, dropping excluded and duplicate ones"""
+        seen: set[str] = set()
+        urls: List[str] = []
+        for href in hrefs:
+            url = self.resolve(href)
+            if url is not None and url not in seen:
+                seen.add(url)
+                urls.append(url)
+        return urls
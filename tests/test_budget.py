@@ -0,0 +1,28 @@
+from pyminiscraper.budget import CrawlBudget
+
+def test_max_urls_per_host():
+    budget = CrawlBudget(max_urls_per_host=2)
+    assert budget.try_consume("http://example.com/1") is True
+    assert budget.try_consume("http://example.com/2") is True
+    assert budget.try_consume("http://example.com/3") is False
+    assert budget.try_consume("http://other.com/1") is True
+    assert budget.over_budget_urls_count == 1
+
+def test_max_urls_per_path_prefix():
+    budget = CrawlBudget(max_urls_per_path_prefix={"/blog/": 1})
+    assert budget.try_consume("http://example.com/blog/1") is True
+    assert budget.try_consume("http://example.com/blog/2") is False
+    assert budget.try_consume("http://example.com/about") is True
+    assert budget.try_consume("http://other.com/blog/1") is True
+    assert budget.over_budget_urls_count == 1
+
+def test_rejected_url_does_not_consume_host_budget():
+    budget = CrawlBudget(max_urls_per_host=2, max_urls_per_path_prefix={"/blog/": 1})
+    assert budget.try_consume("http://example.com/blog/1") is True
+    assert budget.try_consume("http://example.com/blog/2") is False
+    assert budget.try_consume("http://example.com/about") is True
+
+def test_default_path_prefix_budgets_are_not_shared():
+    budget = CrawlBudget()
+    budget.max_urls_per_path_prefix["/blog/"] = 1
+    assert CrawlBudget().max_urls_per_path_prefix == {}
@@ -0,0 +1,46 @@
+from pyminiscraper.circuit import HostCircuitBreaker, CircuitState
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_circuit_opens_after_back_to_back_failures():
+    clock = FakeClock()
+    breaker = HostCircuitBreaker(failure_threshold=2, cooldown_seconds=10, clock=clock)
+    breaker.record_failure("example.com")
+    assert breaker.allow_request("example.com") == 0
+    breaker.record_failure("example.com")
+    assert breaker.allow_request("example.com") == 10
+    assert breaker.allow_request("other.com") == 0
+    assert breaker.states() == {"example.com": CircuitState.OPEN.value}
+
+def test_success_resets_back_to_back_failures():
+    breaker = HostCircuitBreaker(failure_threshold=2)
+    breaker.record_failure("example.com")
+    breaker.record_success("example.com")
+    breaker.record_failure("example.com")
+    assert breaker.allow_request("example.com") == 0
+
+def test_half_open_allows_single_probe():
+    clock = FakeClock()
+    breaker = HostCircuitBreaker(failure_threshold=1, cooldown_seconds=10, clock=clock)
+    breaker.record_failure("example.com")
+    clock.now = 10
+    assert breaker.allow_request("example.com") == 0
+    assert breaker.allow_request("example.com") > 0
+    breaker.record_success("example.com")
+    assert breaker.allow_request("example.com") == 0
+    assert breaker.states() == {}
+
+def test_failed_probe_reopens_and_host_dies_after_max_trips():
+    clock = FakeClock()
+    breaker = HostCircuitBreaker(failure_threshold=1, cooldown_seconds=10, max_trips=2, clock=clock)
+    breaker.record_failure("example.com")
+    clock.now = 10
+    assert breaker.allow_request("example.com") == 0
+    breaker.record_failure("example.com")
+    assert breaker.is_dead("example.com")
+    assert not breaker.is_dead("other.com")
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from pyminiscraper.concurrency import HostConcurrencyLimiter
+from pyminiscraper.fetch import FetchStatusError
+
+@pytest.mark.asyncio
+async def test_additive_increase_on_healthy_responses():
+    limiter = HostConcurrencyLimiter(max_limit=4, initial_limit=1, target_latency_seconds=1.0)
+    for _ in range(2):
+        await limiter.acquire("example.com")
+        await limiter.release("example.com", 0.1)
+    assert limiter.limits()["example.com"] == 2.5
+    for _ in range(100):
+        await limiter.acquire("example.com")
+        await limiter.release("example.com", 0.1)
+    assert limiter.limits()["example.com"] == 4
+
+@pytest.mark.asyncio
+async def test_no_increase_on_slow_responses():
+    limiter = HostConcurrencyLimiter(max_limit=4, initial_limit=2, target_latency_seconds=1.0)
+    await limiter.acquire("example.com")
+    await limiter.release("example.com", 5.0)
+    assert limiter.limits()["example.com"] == 2
+
+@pytest.mark.asyncio
+async def test_multiplicative_decrease_on_overload():
+    limiter = HostConcurrencyLimiter(max_limit=16, initial_limit=8)
+    await limiter.acquire("example.com")
+    await limiter.release("example.com", 0.1, FetchStatusError("Too many requests", 429))
+    assert limiter.limits()["example.com"] == 4
+    await limiter.acquire("example.com")
+    await limiter.release("example.com", 0.1, asyncio.TimeoutError())
+    assert limiter.limits()["example.com"] == 2
+    await limiter.acquire("example.com")
+    await limiter.release("example.com", 0.1, FetchStatusError("Not found", 404))
+    assert limiter.limits()["example.com"] == 2
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_free_slot():
+    limiter = HostConcurrencyLimiter(max_limit=1, initial_limit=1)
+    await limiter.acquire("example.com")
+    waiter = asyncio.create_task(limiter.acquire("example.com"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    await limiter.acquire("other.com")
+    await limiter.release("example.com", 0.1)
+    await asyncio.wait_for(waiter, 1)
+
+@pytest.mark.asyncio
+async def test_one_decrease_per_burst_of_failures():
+    limiter = HostConcurrencyLimiter(max_limit=16, initial_limit=8)
+    requests = [await limiter.acquire("example.com") for _ in range(4)]
+    for request in requests:
+        await limiter.release("example.com", 0.1, asyncio.TimeoutError(), request)
+    assert limiter.limits()["example.com"] == 4
+    request = await limiter.acquire("example.com")
+    await limiter.release("example.com", 0.1, asyncio.TimeoutError(), request)
+    assert limiter.limits()["example.com"] == 2
+
+@pytest.mark.asyncio
+async def test_busy_delay_when_host_is_at_its_limit():
+    limiter = HostConcurrencyLimiter(max_limit=2, initial_limit=2, target_latency_seconds=1.0)
+    assert limiter.busy_delay("example.com") == 0
+    await limiter.acquire("example.com")
+    assert limiter.busy_delay("example.com") == 0
+    await limiter.acquire("example.com")
+    assert limiter.busy_delay("example.com") == 0.5
+    assert limiter.busy_delay("other.com") == 0
@@ -0,0 +1,39 @@
+import pytest
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+from pyminiscraper.dates import parse_date, parse_optional_date
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-01-02T10:20:30Z", datetime(2024, 1, 2, 10, 20, 30, tzinfo=timezone.utc)),
+    ("2024-01-02T10:20:30.123+02:00", datetime(2024, 1, 2, 10, 20, 30, 123000, tzinfo=timezone(timedelta(hours=2)))),
+    ("2024-01-02", datetime(2024, 1, 2, tzinfo=timezone.utc)),
+    ("2024-05", datetime(2024, 5, 1, tzinfo=timezone.utc)),
+    ("Tue, 02 Jan 2024 10:20:30 GMT", datetime(2024, 1, 2, 10, 20, 30, tzinfo=timezone.utc)),
+    ("Tue, 2 Jan 2024 10:20:30 -0500", datetime(2024, 1, 2, 10, 20, 30, tzinfo=timezone(timedelta(hours=-5)))),
+    ("02 Jan 2024 10:20:30 +0000", datetime(2024, 1, 2, 10, 20, 30, tzinfo=timezone.utc)),
+    ("January 2, 2024", datetime(2024, 1, 2, tzinfo=timezone.utc)),
+    ("Tue, 02 Jan 2024 10:20:30 -0000", datetime(2024, 1, 2, 10, 20, 30, tzinfo=timezone.utc)),
+    ("2024-01-02T10:20:30", datetime(2024, 1, 2, 10, 20, 30, tzinfo=timezone.utc)),
+    ("  2024-01-02T10:20:30Z\n", datetime(2024, 1, 2, 10, 20, 30, tzinfo=timezone.utc)),
+])
+def test_parse_date(value, expected):
+    assert parse_date(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "not a date", "Tue, 32 Jan 2024 10:20:30 GMT"])
+def test_parse_date_invalid(value):
+    assert parse_date(value) is None
+
+
+def test_parse_optional_date():
+    assert parse_optional_date(None) is None
+    assert parse_optional_date("2024-01-02") == datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def test_parse_date_takes_the_current_year_for_dates_without_one():
+    with patch("pyminiscraper.dates.datetime", wraps=datetime) as mock_datetime:
+        mock_datetime.now.return_value = datetime(2030, 6, 1)
+        assert parse_date("March 3") == datetime(2030, 3, 3, tzinfo=timezone.utc)
+        mock_datetime.now.return_value = datetime(2031, 1, 1)
+        assert parse_date("March 3") == datetime(2031, 3, 3, tzinfo=timezone.utc)
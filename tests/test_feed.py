@@ -0,0 +1,142 @@
+import pytest
+from datetime import datetime, timezone
+from pyminiscraper.feed import FeedParser, FeedStreamParser, FeedError
+from unittest.mock import MagicMock
+from aioresponses import aioresponses
+import aiohttp
+
+RSS2 = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+    <title>Channel</title>
+    <link>http://example.com/</link>
+    <item>
+        <title>First</title>
+        <link>http://example.com/first</link>
+        <description>First description</description>
+        <pubDate>Mon, 01 Jan 2024 10:00:00 GMT</pubDate>
+        <guid>first-guid</guid>
+    </item>
+    <item>
+        <title>Second</title>
+        <link>http://example.com/second</link>
+        <content:encoded><![CDATA[<p>Second content</p>]]></content:encoded>
+        <dc:date>2024-01-02T10:00:00Z</dc:date>
+    </item>
+</channel>
+</rss>"""
+
+RDF = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <channel rdf:about="http://example.com/">
+        <title>Channel</title>
+        <items><rdf:Seq><rdf:li resource="http://example.com/first"/></rdf:Seq></items>
+    </channel>
+    <item rdf:about="http://example.com/first">
+        <title>First</title>
+        <link>http://example.com/first</link>
+        <dc:date>2024-01-01T10:00:00Z</dc:date>
+    </item>
+</rdf:RDF>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <title>Feed</title>
+    <link href="http://example.com/"/>
+    <entry>
+        <id>urn:uuid:1</id>
+        <title>First</title>
+        <link rel="edit" href="http://example.com/edit/first"/>
+        <link rel="alternate" type="application/json" href="http://example.com/first.json"/>
+        <link rel="alternate" type="text/html" href="http://example.com/first"/>
+        <summary>First summary</summary>
+        <updated>2024-01-01T10:00:00Z</updated>
+    </entry>
+    <entry>
+        <id>urn:uuid:2</id>
+        <title type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml">Second <b>title</b></div></title>
+        <link href="http://example.com/second"/>
+        <content>Second content</content>
+        <published>2024-01-02T10:00:00Z</published>
+        <updated>2024-01-03T10:00:00Z</updated>
+    </entry>
+</feed>"""
+
+
+def parse(content: bytes):
+    return FeedParser(MagicMock(aiohttp.ClientSession)).parse(content).items
+
+
+def test_parse_rss2():
+    items = parse(RSS2)
+    assert [item.title for item in items] == ["First", "Second"]
+    assert items[0].link == "http://example.com/first"
+    assert items[0].description == "First description"
+    assert items[0].pub_date == datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+    assert items[0].guid == "first-guid"
+    assert items[1].description == "<p>Second content</p>"
+    assert items[1].pub_date == datetime(2024, 1, 2, 10, tzinfo=timezone.utc)
+
+
+def test_parse_rdf():
+    items = parse(RDF)
+    assert len(items) == 1
+    assert items[0].link == "http://example.com/first"
+    assert items[0].guid == "http://example.com/first"
+    assert items[0].pub_date == datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+
+
+def test_parse_atom():
+    items = parse(ATOM)
+    assert items[0].link == "http://example.com/first"
+    assert items[0].description == "First summary"
+    assert items[0].pub_date == datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+    assert items[0].guid == "urn:uuid:1"
+    assert items[1].title == "Second title"
+    assert items[1].link == "http://example.com/second"
+    assert items[1].description == "Second content"
+    assert items[1].pub_date == datetime(2024, 1, 2, 10, tzinfo=timezone.utc)
+
+
+def test_parse_rss2_ignores_extension_elements_with_the_same_local_name():
+    items = parse(b"""<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/" xmlns:atom="http://www.w3.org/2005/Atom">
+    <channel>
+        <item>
+            <media:title>Thumb caption</media:title>
+            <media:description>Thumb description</media:description>
+            <atom:link rel="related" href="http://example.com/related"/>
+            <description></description>
+            <title>Real</title>
+            <link>http://example.com/a</link>
+            <description>Real description</description>
+        </item>
+    </channel>
+    </rss>""")
+    assert items[0].title == "Real"
+    assert items[0].link == "http://example.com/a"
+    assert items[0].description == "Real description"
+
+
+def test_stream_parser_yields_items_incrementally():
+    parser = FeedStreamParser()
+    first_item_end = RSS2.index(b"</item>") + len(b"</item>")
+    assert [item.guid for item in parser.feed(RSS2[:first_item_end])] == ["first-guid"]
+    items = parser.feed(RSS2[first_item_end:]) + parser.close()
+    assert [item.title for item in items] == ["Second"]
+
+
+def test_unsupported_root():
+    with pytest.raises(FeedError):
+        parse(b"<html><body></body></html>")
+
+
+@pytest.mark.asyncio
+async def test_download_and_parse_sniffs_format_regardless_of_content_type():
+    async with aiohttp.ClientSession() as session:
+        with aioresponses() as m:
+            m.get("http://example.com/atom", status=200, body=ATOM, content_type="text/xml")
+            m.get("http://example.com/rss", status=200, body=RSS2, content_type="application/xml")
+            atom = await FeedParser.download_and_parse("http://example.com/atom", session)
+            rss = await FeedParser.download_and_parse("http://example.com/rss", session)
+    assert [item.guid for item in atom.items] == ["urn:uuid:1", "urn:uuid:2"]
+    assert [item.guid for item in rss.items] == ["first-guid", None]
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from pyminiscraper.feed import Feed, Item
+from pyminiscraper.feed_poller import FeedPoller, FeedPollState
+
+
+def item(guid: str, hour: int) -> Item:
+    return Item(title=guid, link=f"http://example.com/{guid}", description=None, pub_date=datetime(2024, 1, 1, hour, tzinfo=timezone.utc), guid=guid)
+
+
+def poll(poller: FeedPoller, url: str, feed: Feed) -> list[Item]:
+    new_items = poller.new_items(url, feed)
+    poller.record_poll(url, Feed(items=new_items, etag=feed.etag, last_modified=feed.last_modified, not_modified=feed.not_modified),
+                       poller.listed_item_keys(feed))
+    return new_items
+
+
+def test_poll_returns_only_new_items():
+    poller = FeedPoller()
+    url = "http://example.com/feed.xml"
+    assert [i.guid for i in poll(poller, url, Feed(items=[item("a", 1), item("b", 2)], etag='"1"'))] == ["a", "b"]
+    assert [i.guid for i in poll(poller, url, Feed(items=[item("b", 2), item("c", 3)], etag='"2"'))] == ["c"]
+    assert poller.states[url].etag == '"2"'
+    assert poll(poller, url, Feed(items=[], etag='"2"', not_modified=True)) == []
+    assert poller.states[url].etag == '"2"'
+
+
+def test_items_are_not_seen_until_the_poll_is_recorded():
+    poller = FeedPoller()
+    url = "http://example.com/feed.xml"
+    feed = Feed(items=[item("a", 1), item("a", 1)], etag='"1"')
+    assert [i.guid for i in poller.new_items(url, feed)] == ["a"]
+    # delivery failed, nothing was recorded
+    assert [i.guid for i in poller.new_items(url, feed)] == ["a"]
+    assert poller.states[url].etag is None
+
+
+def test_interval_follows_publishing_rate():
+    poller = FeedPoller(min_interval_seconds=60, max_interval_seconds=86400, default_interval_seconds=3600)
+    url = "http://example.com/feed.xml"
+    poll(poller, url, Feed(items=[item("a", 0), item("b", 4), item("c", 8)]))
+    # items every 4 hours are polled every 2 hours
+    assert poller.states[url].interval_seconds == 2 * 3600
+    poll(poller, url, Feed(items=[], not_modified=True))
+    assert poller.states[url].interval_seconds == 3 * 3600
+    assert poller.record_failure(url) == 4.5 * 3600
+
+
+def test_undated_items_do_not_change_the_interval():
+    poller = FeedPoller(min_interval_seconds=60, default_interval_seconds=3600)
+    url = "http://example.com/feed.xml"
+    undated = [Item(title=None, link=f"http://example.com/{i}", description=None, pub_date=None) for i in range(3)]
+    assert poller.record_poll(url, Feed(items=undated)) == 3600
+    assert poller.states[url].published_at == []
+
+
+def test_seen_items_are_bounded():
+    poller = FeedPoller(max_seen_items=2)
+    url = "http://example.com/feed.xml"
+    poll(poller, url, Feed(items=[item("a", 1)]))
+    poll(poller, url, Feed(items=[item("b", 2)]))
+    poll(poller, url, Feed(items=[item("c", 3)]))
+    assert list(poller.states[url].seen_item_keys) == ["b", "c"]
+
+
+def test_seen_items_still_listed_by_the_feed_are_kept():
+    poller = FeedPoller(max_seen_items=2)
+    url = "http://example.com/feed.xml"
+    feed = Feed(items=[item("a", 1), item("b", 2), item("c", 3)])
+    assert len(poll(poller, url, feed)) == 3
+    assert poll(poller, url, feed) == []
+    assert [i.guid for i in poll(poller, url, Feed(items=[item("c", 3), item("d", 4)]))] == ["d"]
+    assert list(poller.states[url].seen_item_keys) == ["c", "d"]
+
+
+def test_state_round_trip():
+    state = FeedPollState(interval_seconds=120, etag='"1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT", seen_item_keys=["a"], published_at=[1.0, 2.0])
+    restored = FeedPollState.from_dict(state.to_dict())
+    assert restored.to_dict() == state.to_dict()
@@ -0,0 +1,67 @@
+from urllib.parse import urlparse
+from pyminiscraper.filter import DomainTrie, DomainFilter, PathFilter, url_path
+from pyminiscraper.robots import robots_txt_pattern_compile
+from pyminiscraper.config import ScraperDomainConfig, ScraperDomainConfigMode, ScraperAllowedDomains
+
+
+def test_domain_trie_respects_label_boundaries():
+    trie = DomainTrie(["example.com", "blog.other.org"])
+    assert trie.matches("example.com")
+    assert trie.matches("a.b.example.com")
+    assert not trie.matches("notexample.com")
+    assert not trie.matches("com")
+    assert trie.matches("x.blog.other.org")
+    assert not trie.matches("other.org")
+    assert len(trie) == 2
+
+
+def test_domain_trie_ignores_case_port_and_www():
+    trie = DomainTrie(["WWW.Example.com:8080", ".example.com", ""])
+    assert trie.matches("example.com")
+    assert len(trie) == 1
+
+
+def test_domain_filter_derives_allowed_domains_from_seed_urls():
+    domain_filter = DomainFilter(ScraperDomainConfig(), [f"https://www.site{i}.com/start" for i in range(1000)])
+    assert domain_filter.is_allowed("https://site999.com/page")
+    assert domain_filter.is_allowed("https://news.site1.com/page")
+    assert not domain_filter.is_allowed("https://notsite1.com/page")
+
+
+def test_domain_filter_forbidden_domains_take_precedence():
+    domain_filter = DomainFilter(ScraperDomainConfig(
+        forbidden_domains=["ads.example.com"],
+        allowance=ScraperAllowedDomains(domains=["example.com"]),
+    ))
+    assert domain_filter.is_allowed("https://example.com/")
+    assert not domain_filter.is_allowed("https://x.ads.example.com:8443/")
+    assert not domain_filter.is_allowed("https://other.com/")
+
+
+def test_domain_filter_allow_all():
+    domain_filter = DomainFilter(ScraperDomainConfig(forbidden_domains=["bad.com"], allowance=ScraperDomainConfigMode.ALLOW_ALL))
+    assert domain_filter.is_allowed("https://anything.org/")
+    assert not domain_filter.is_allowed("https://bad.com/")
+
+
+def test_path_filter_matches_like_robots_patterns():
+    patterns = ["/blog", "docs/", "/exact.html$", "/*.pdf$", "/shop/*/reviews", "/tags*"]
+    path_filter = PathFilter(patterns)
+    compiled = [robots_txt_pattern_compile(pattern) for pattern in patterns]
+    paths = ["/blog/post", "/blogger", "/docs/a", "/doc", "/exact.html", "/exact.html2", "/a/b.pdf", "/a/b.pdf?x",
+             "/shop/1/reviews/2", "/shop/reviews", "/tags/x", "/", ""]
+    for path in paths:
+        url_path = path.split('?')[0] or '/'
+        expected = any(pattern.fullmatch(url_path) for pattern in compiled)
+        assert path_filter.is_passing(f"https://example.com{path}") == expected, path
+
+
+def test_path_filter_default_value_without_patterns():
+    assert PathFilter([], default_value=False).is_passing("https://example.com/a") is False
+    assert PathFilter([], default_value=True).is_passing("https://example.com/a") is True
+
+
+def test_url_path_matches_urlparse():
+    for url in ["https://example.com/a/b?x=1#f", "https://example.com", "https://example.com?x=/a", "http://h:80/a;p?q",
+                "/a/b;p/c;q", "relative/path", "https://u@h/p#x/y", ""]:
+        assert url_path(url) == urlparse(url).path, url
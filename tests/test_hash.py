@@ -0,0 +1,13 @@
+from pyminiscraper.hash import url_fingerprint
+from pyminiscraper.model import ScraperUrl
+
+
+def test_url_fingerprint_is_stable_64_bit():
+    fingerprint = url_fingerprint("https://example.com/a")
+    assert fingerprint == url_fingerprint("https://example.com/a")
+    assert fingerprint != url_fingerprint("https://example.com/b")
+    assert 0 <= fingerprint < 2 ** 64
+
+
+def test_scraper_url_fingerprint_uses_normalized_url():
+    assert ScraperUrl("https://WWW.example.com/a#x").fingerprint == ScraperUrl("https://example.com/a").fingerprint
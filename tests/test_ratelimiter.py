@@ -0,0 +1,125 @@
+import asyncio
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+from pyminiscraper.bandwidth import BandwidthLimiter
+from pyminiscraper.fetch import read_body
+from pyminiscraper.ratelimiter import TokenBucket, HostRateLimiter, AutoThrottle
+from pyminiscraper.robots import RequestRate
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst():
+    bucket = TokenBucket(rate=1, burst=3)
+    loop = asyncio.get_event_loop()
+    start_time = loop.time()
+    for _ in range(3):
+        await bucket.consume()
+    assert loop.time() - start_time < 0.1
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate=100, burst=1)
+    loop = asyncio.get_event_loop()
+    start_time = loop.time()
+    for _ in range(6):
+        await bucket.consume()
+    assert loop.time() - start_time >= 0.05
+
+@pytest.mark.asyncio
+async def test_bandwidth_limiter_limits_per_host():
+    limiter = BandwidthLimiter(bytes_per_second_per_host=1000, burst_bytes_per_host=1000)
+    loop = asyncio.get_event_loop()
+    start_time = loop.time()
+    await limiter.consume("example.com", 1000)
+    await limiter.consume("other.com", 1000)
+    assert loop.time() - start_time < 0.1
+    await limiter.consume("example.com", 100)
+    assert loop.time() - start_time >= 0.1
+    assert limiter.downloaded_bytes_count == 2100
+
+@pytest.mark.asyncio
+async def test_read_body_counts_bytes():
+    limiter = BandwidthLimiter(bytes_per_second=1024 * 1024)
+    with aioresponses() as m:
+        m.get("http://example.com/", status=200, body=b"x" * 5000)
+        async with aiohttp.ClientSession() as session:
+            async with session.get("http://example.com/") as response:
+                body = await read_body(response, limiter)
+    assert len(body) == 5000
+    assert limiter.downloaded_bytes_count == 5000
+
+def test_host_rate_limiter_request_rate():
+    limiter = HostRateLimiter(default_crawl_delay_seconds=1)
+    limiter.configure("example.com", request_rate=RequestRate(10, 5))
+    bucket = limiter.buckets["example.com"]
+    assert bucket is not None
+    assert bucket.rate == 2
+    assert bucket.burst == 10
+
+def test_host_rate_limiter_crawl_delay():
+    limiter = HostRateLimiter(default_crawl_delay_seconds=1)
+    limiter.configure("example.com", crawl_delay_seconds=4)
+    bucket = limiter.buckets["example.com"]
+    assert bucket is not None
+    assert bucket.rate == 0.25
+    assert bucket.burst == 1
+
+def test_host_rate_limiter_stricter_directive_wins():
+    limiter = HostRateLimiter(default_crawl_delay_seconds=1)
+    limiter.configure("example.com", crawl_delay_seconds=10, request_rate=RequestRate(10, 5))
+    bucket = limiter.buckets["example.com"]
+    assert bucket is not None
+    assert bucket.rate == 0.1
+    assert bucket.burst == 1
+
+def test_host_rate_limiter_default_crawl_delay():
+    limiter = HostRateLimiter(default_crawl_delay_seconds=2)
+    limiter.configure("example.com")
+    bucket = limiter.buckets["example.com"]
+    assert bucket is not None
+    assert bucket.rate == 0.5
+
+@pytest.mark.asyncio
+async def test_host_rate_limiter_allows_burst_per_host():
+    limiter = HostRateLimiter(default_crawl_delay_seconds=10)
+    limiter.configure("example.com", request_rate=RequestRate(3, 10))
+    loop = asyncio.get_event_loop()
+    start_time = loop.time()
+    for _ in range(3):
+        await limiter.acquire("example.com")
+    await limiter.acquire("other.com")
+    assert loop.time() - start_time < 0.1
+
+def test_auto_throttle_follows_latency():
+    throttle = AutoThrottle(min_delay_seconds=0.1, start_delay_seconds=5, max_delay_seconds=60)
+    assert throttle.delay("example.com") == 5
+    assert throttle.record_response("example.com", 1.0, success=True) == 3
+    assert throttle.record_response("example.com", 1.0, success=True) == 2
+    for _ in range(20):
+        throttle.record_response("example.com", 0.2, success=True)
+    assert abs(throttle.delay("example.com") - 0.2) < 0.01
+
+def test_auto_throttle_backs_off_on_slow_responses():
+    throttle = AutoThrottle(min_delay_seconds=1, start_delay_seconds=1, max_delay_seconds=10)
+    assert throttle.record_response("example.com", 4.0, success=True) == 4
+    assert throttle.record_response("example.com", 30.0, success=True) == 10
+
+def test_auto_throttle_failures_do_not_decrease_delay():
+    throttle = AutoThrottle(min_delay_seconds=0.1, start_delay_seconds=5)
+    assert throttle.record_response("example.com", 0.1, success=False) == 5
+
+def test_auto_throttle_respects_floor():
+    throttle = AutoThrottle(min_delay_seconds=1, start_delay_seconds=1)
+    assert throttle.record_response("example.com", 0.01, success=True) == 1
+
+def test_host_rate_limiter_adaptive_delay_only_slows_down():
+    limiter = HostRateLimiter(default_crawl_delay_seconds=1)
+    limiter.configure("example.com", request_rate=RequestRate(10, 1))
+    limiter.set_adaptive_delay("example.com", 2)
+    bucket = limiter.buckets["example.com"]
+    assert bucket is not None
+    assert bucket.rate == 0.5
+    assert bucket.burst == 1
+    limiter.set_adaptive_delay("example.com", 0.01)
+    assert bucket.rate == 10
+    assert bucket.burst == 10
@@ -0,0 +1,48 @@
+import pytest
+from pyminiscraper.recrawl import RecrawlScheduler, content_hash
+from pyminiscraper.sitemap import ChangeFrequency
+
+
+def test_initial_interval_from_changefreq_and_priority():
+    scheduler = RecrawlScheduler(min_interval_seconds=60, max_interval_seconds=30 * 86400, default_interval_seconds=86400)
+    assert scheduler.initial_interval(None, None) == 86400
+    assert scheduler.initial_interval(ChangeFrequency.HOURLY, None) == 3600
+    assert scheduler.initial_interval(ChangeFrequency.HOURLY, 1.0) == 2400
+    assert scheduler.initial_interval(ChangeFrequency.HOURLY, 0.0) == 7200
+    assert scheduler.initial_interval(ChangeFrequency.ALWAYS, None) == 60
+    assert scheduler.initial_interval(ChangeFrequency.YEARLY, None) == 30 * 86400
+    assert scheduler.initial_interval(ChangeFrequency.NEVER, None) is None
+
+
+def test_interval_adapts_to_observed_changes():
+    scheduler = RecrawlScheduler(min_interval_seconds=100, max_interval_seconds=1000)
+    url = "http://example.com/page"
+    assert scheduler.record_fetch(url, content_hash(b"a"), changefreq=ChangeFrequency.HOURLY) == 1000
+    assert scheduler.record_fetch(url, content_hash(b"b")) == 500
+    assert scheduler.record_fetch(url, content_hash(b"c")) == 250
+    assert scheduler.record_fetch(url, content_hash(b"c")) == 375
+    assert scheduler.record_fetch(url, None) == 375
+    for i in range(10):
+        scheduler.record_fetch(url, content_hash(str(i).encode()))
+    assert scheduler.states[url].interval_seconds == 100
+    assert scheduler.states[url].changes_count == 12
+    assert scheduler.states[url].fetches_count == 15
+
+
+def test_never_changing_urls_are_not_revisited():
+    scheduler = RecrawlScheduler()
+    assert scheduler.record_fetch("http://example.com/archive", content_hash(b"a"), changefreq=ChangeFrequency.NEVER) is None
+    assert "http://example.com/archive" not in scheduler.states
+
+
+def test_failures_back_off_and_keep_urls_scheduled():
+    scheduler = RecrawlScheduler(min_interval_seconds=100, max_interval_seconds=1000, default_interval_seconds=200)
+    url = "http://example.com/page"
+    assert scheduler.record_failure(url) == 200
+    assert scheduler.record_failure(url) == 300
+    assert scheduler.record_fetch(url, content_hash(b"a")) == 300
+    assert scheduler.states[url].fetches_count == 1
+    for _ in range(10):
+        scheduler.record_failure(url)
+    assert scheduler.states[url].interval_seconds == 1000
+    assert scheduler.record_failure("http://example.com/archive", changefreq=ChangeFrequency.NEVER) is None
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timezone
+import aiohttp
+import pytest
+from pyminiscraper.deque import AsyncDelayedQueue
+from pyminiscraper.fetch import FetchStatusError
+from pyminiscraper.retry import RetryPolicy, FailureKind, classify_failure, parse_retry_after
+
+def _wrapped(error: Exception) -> Exception:
+    try:
+        try:
+            raise error
+        except Exception as e:
+            raise ValueError("Failed to fetch page") from e
+    except ValueError as e:
+        return e
+
+def test_classify_failure():
+    assert classify_failure(_wrapped(FetchStatusError("unavailable", 503))) == FailureKind.TRANSIENT
+    assert classify_failure(_wrapped(FetchStatusError("too many requests", 429))) == FailureKind.TRANSIENT
+    assert classify_failure(_wrapped(FetchStatusError("not found", 404))) == FailureKind.PERMANENT
+    assert classify_failure(_wrapped(asyncio.TimeoutError())) == FailureKind.TRANSIENT
+    assert classify_failure(_wrapped(aiohttp.ClientConnectionError())) == FailureKind.TRANSIENT
+    assert classify_failure(ValueError("Unsupported XML format")) == FailureKind.PERMANENT
+
+def test_parse_retry_after():
+    now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("120", now) == 120
+    assert parse_retry_after("Mon, 01 Jan 2024 12:01:00 GMT", now) == 60
+    assert parse_retry_after("Mon, 01 Jan 2024 11:00:00 GMT", now) == 0
+    assert parse_retry_after("invalid", now) is None
+    assert parse_retry_after(None, now) is None
+
+def test_retry_policy_caps_retries():
+    policy = RetryPolicy(max_retries=2, base_delay_seconds=1, max_delay_seconds=10)
+    error = FetchStatusError("unavailable", 503)
+    first_delay = policy.next_retry_delay("http://example.com/", error)
+    assert first_delay is not None and 0 <= first_delay <= 1
+    second_delay = policy.next_retry_delay("http://example.com/", error)
+    assert second_delay is not None and 0 <= second_delay <= 2
+    assert policy.next_retry_delay("http://example.com/", error) is None
+    assert policy.next_retry_delay("http://example.com/other", error) is not None
+
+def test_retry_policy_permanent_failure():
+    policy = RetryPolicy()
+    assert policy.next_retry_delay("http://example.com/", FetchStatusError("not found", 404)) is None
+
+def test_retry_policy_honors_retry_after():
+    policy = RetryPolicy(max_delay_seconds=60)
+    error = FetchStatusError("too many requests", 429, {"Retry-After": "30"})
+    assert policy.next_retry_delay("http://example.com/", error) == 30
+
+def test_retry_policy_gives_up_when_retry_after_exceeds_max_delay():
+    policy = RetryPolicy(max_delay_seconds=60)
+    error = FetchStatusError("too many requests", 429, {"Retry-After": "86400"})
+    assert policy.next_retry_delay("http://example.com/", error) is None
+    assert policy.attempts == {}
+
+def test_retry_policy_forgets_exhausted_urls():
+    policy = RetryPolicy(max_retries=1)
+    error = FetchStatusError("unavailable", 503)
+    assert policy.next_retry_delay("http://example.com/", error) is not None
+    assert policy.next_retry_delay("http://example.com/", error) is None
+    assert policy.attempts == {}
+
+@pytest.mark.asyncio
+async def test_delayed_queue_releases_items_in_time_order():
+    released: list[str] = []
+    async def on_ready(item: str) -> None:
+        released.append(item)
+    queue: AsyncDelayedQueue[str] = AsyncDelayedQueue(on_ready)
+    task = asyncio.create_task(queue.run())
+    queue.schedule("late", 0.05)
+    queue.schedule("early", 0.01)
+    await asyncio.sleep(0)
+    assert released == []
+    await asyncio.sleep(0.1)
+    assert released == ["early", "late"]
+    assert len(queue) == 0
+    task.cancel()
@@ -251,4 +251,65 @@ def test_robots_txt_path_match_edge_cases():
     assert robots_txt_path_match("/page.*/", "/page.php/") is True
     assert robots_txt_path_match("/test.*$", "/test") is False
     assert robots_txt_path_match("/*.download", "/file.download.txt") is True
-    assert robots_txt_path_match("/download/*.html$", "/download/page.html") is True
\ No newline at end of file
+    assert robots_txt_path_match("/download/*.html$", "/download/page.html") is True
+
+def make_longest_match_robot(content: str) -> Robot:
+    robot = Robot()
+    robot.access_rule = AccessRule.DEFAULT
+    robot.parse(content)
+    return robot
+
+def test_robot_can_fetch_longest_match_wins_regardless_of_order():
+    robot = make_longest_match_robot("""
+User-agent: *
+Disallow: /private/
+Allow: /private/public
+""")
+    assert robot.can_fetch("bot", "https://example.com/private/secret") is False
+    assert robot.can_fetch("bot", "https://example.com/private/public/page") is True
+    assert robot.can_fetch("bot", "https://example.com/other") is True
+
+def test_robot_can_fetch_allow_wins_ties():
+    robot = make_longest_match_robot("""
+User-agent: *
+Disallow: /page
+Allow: /page
+""")
+    assert robot.can_fetch("bot", "https://example.com/page") is True
+
+def test_robot_can_fetch_wildcards_and_end_anchor():
+    robot = make_longest_match_robot("""
+User-agent: *
+Disallow: /*.php$
+Disallow: /search
+Allow: /search/*/about
+Allow: /index.php$
+""")
+    assert robot.can_fetch("bot", "https://example.com/file.php") is False
+    assert robot.can_fetch("bot", "https://example.com/file.php?x=1") is True
+    assert robot.can_fetch("bot", "https://example.com/index.php") is True
+    assert robot.can_fetch("bot", "https://example.com/search/q") is False
+    assert robot.can_fetch("bot", "https://example.com/search/q/about") is True
+
+def test_robot_can_fetch_percent_encoded_paths():
+    robot = make_longest_match_robot("""
+User-agent: *
+Disallow: /a%20b
+""")
+    assert robot.can_fetch("bot", "https://example.com/a%20b/c") is False
+    assert robot.can_fetch("bot", "https://example.com/a b/c") is False
+    assert robot.can_fetch("bot", "https://example.com/a") is True
+
+def test_robot_entry_is_resolved_per_useragent():
+    robot = make_longest_match_robot("""
+User-agent: special-bot
+Disallow: /
+
+User-agent: *
+Crawl-delay: 2
+Disallow: /tmp
+""")
+    assert robot.can_fetch("Special-Bot/1.0", "https://example.com/page") is False
+    assert robot.can_fetch("other-bot", "https://example.com/page") is True
+    assert robot.crawl_delay("other-bot") == 2
+    assert robot.crawl_delay("special-bot") is None
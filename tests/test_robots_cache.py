@@ -0,0 +1,81 @@
+import pytest
+from pyminiscraper.robots import Robot, AccessRule, get_cache_ttl
+from pyminiscraper.robots_cache import RobotsCache
+
+
+ROBOTS_URL = "https://example.com/robots.txt"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clear_memory():
+    RobotsCache.clear_memory()
+    yield
+    RobotsCache.clear_memory()
+
+
+def make_robot() -> Robot:
+    robot = Robot()
+    robot.access_rule = AccessRule.DEFAULT
+    robot.parse("""
+User-agent: *
+Allow: /private%20data/public
+Disallow: /private%20data/
+Crawl-delay: 3
+Request-rate: 2/10
+Sitemap: https://example.com/sitemap.xml
+""")
+    return robot
+
+
+def test_get_cache_ttl():
+    assert get_cache_ttl({}) is None
+    assert get_cache_ttl({"Cache-Control": "public, max-age=600"}) == 600.0
+    assert get_cache_ttl({"Cache-Control": "no-store"}) == 0.0
+    assert get_cache_ttl({"Expires": "invalid"}) == 0.0
+
+
+def test_robots_cache_round_trips_through_disk(tmp_path):
+    clock = FakeClock()
+    RobotsCache(directory=str(tmp_path), clock=clock).put(ROBOTS_URL, make_robot())
+    RobotsCache.clear_memory()
+
+    robot = RobotsCache(directory=str(tmp_path), clock=clock).get(ROBOTS_URL)
+    assert robot is not None
+    assert robot.can_fetch("bot", "https://example.com/private%20data/x") is False
+    assert robot.can_fetch("bot", "https://example.com/private%20data/public") is True
+    assert robot.crawl_delay("bot") == 3
+    assert robot.request_rate("bot") == (2, 10)
+    assert robot.sitemap_urls == {"https://example.com/sitemap.xml"}
+
+
+def test_robots_cache_memory_layer_is_shared():
+    RobotsCache().put(ROBOTS_URL, make_robot())
+    assert RobotsCache().get(ROBOTS_URL) is not None
+
+
+def test_robots_cache_expires_by_cache_headers():
+    clock = FakeClock()
+    cache = RobotsCache(default_ttl_seconds=3600, clock=clock)
+    robot = make_robot()
+    robot.cache_ttl_seconds = 60
+    cache.put(ROBOTS_URL, robot)
+    clock.now += 59
+    assert cache.get(ROBOTS_URL) is robot
+    clock.now += 2
+    assert cache.get(ROBOTS_URL) is None
+
+
+def test_robots_cache_skips_uncacheable_responses():
+    cache = RobotsCache()
+    robot = make_robot()
+    robot.cache_ttl_seconds = 0
+    cache.put(ROBOTS_URL, robot)
+    assert cache.get(ROBOTS_URL) is None
@@ -1,12 +1,16 @@
 import pytest
+import asyncio
 from unittest.mock import AsyncMock, patch, MagicMock
 from pyminiscraper.scraper import Scraper, ScraperError
-from pyminiscraper.config import ScraperConfig, ScraperDomainConfig, ScraperDomainConfigMode, ScraperAllowedDomains, ScraperCallback
+from pyminiscraper.config import ScraperCallbackError, ScraperConfig, ScraperDomainConfig, ScraperDomainConfigMode, ScraperAllowedDomains, ScraperCallback, ScraperBudgetConfig, ScraperRetryConfig, ScraperSitemapConfig, ScraperRecrawlConfig, ScraperFeedPollConfig, ScraperAdaptiveConcurrencyConfig
 from pyminiscraper.model import ScraperUrl, ScraperUrlType, ScraperWebPage
+from pyminiscraper.store_memory import MemoryStore
+from datetime import datetime, timezone
 from pyminiscraper.robots import Robot
-from pyminiscraper.sitemap import Sitemap
+from pyminiscraper.sitemap import Sitemap, PageUrl
 from pyminiscraper.domain_metadata import DomainMetadata
 from pyminiscraper.feed import FeedParser, Feed
+from aioresponses import aioresponses, CallbackResult
 
 @pytest.fixture
 def scraper_config():
@@ -64,17 +68,65 @@ async def test_scraper_queue_scraper_url(scraper_config: ScraperConfig):
     scraper = Scraper(scraper_config)
     scraper_url = ScraperUrl("http://example.com/page", type=ScraperUrlType.HTML)
     await scraper._queue_scraper_url(scraper_url)
-    assert scraper_url.normalized_url in scraper.queued_urls
+    assert scraper_url.fingerprint in scraper.queued_urls
+    assert scraper.domain_stats_urls == [scraper_url.normalized_url]
+
+@pytest.mark.asyncio
+async def test_scraper_keeps_only_fingerprints_without_domain_stats(scraper_config: ScraperConfig):
+    scraper_config.collect_domain_stats = False
+    scraper = Scraper(scraper_config)
+    await scraper._queue_scraper_urls(["http://example.com/a", "http://example.com/b", "http://example.com/a"], ScraperUrlType.HTML)
+    assert scraper.queued_urls == {ScraperUrl("http://example.com/a").fingerprint, ScraperUrl("http://example.com/b").fingerprint}
+    assert scraper.domain_stats_urls is None
+    assert scraper._build_stats(domain_stats={}).queued_urls_count == 2
+
+@pytest.mark.asyncio
+async def test_scraper_queue_scraper_urls_filters_before_creating_urls(scraper_config: ScraperConfig):
+    scraper_config.exclude_path_patterns = ["/private"]
+    scraper = Scraper(scraper_config)
+    with patch("pyminiscraper.scraper.ScraperUrl", wraps=ScraperUrl) as scraper_url_class:
+        await scraper._queue_scraper_urls(["http://example.com/a", "http://other.com/b", "http://example.com/private/c"], ScraperUrlType.HTML)
+    assert scraper_url_class.call_count == 1
+    assert scraper.domain_stats_urls == ["http://example.com/a"]
+
+@pytest.mark.asyncio
+async def test_scraper_queue_many_filters_and_pushes_batch(scraper_config: ScraperConfig):
+    scraper_config.exclude_path_patterns = ["/private"]
+    scraper = Scraper(scraper_config)
+    with patch.object(scraper.url_queue, 'appendleft', new_callable=AsyncMock) as appendleft:
+        queued_urls_count = await scraper._queue_many([
+            ScraperUrl("http://example.com/a"),
+            ScraperUrl("http://example.com/b"),
+            ScraperUrl("http://example.com/a"),
+            ScraperUrl("http://other.com/c"),
+            ScraperUrl("http://example.com/private/d"),
+            ScraperUrl("http://example.com/feed.xml", type=ScraperUrlType.FEED),
+            ScraperUrl("http://example.com/sitemap.xml", type=ScraperUrlType.SITEMAP),
+        ])
+        appendleft.assert_not_called()
+    assert queued_urls_count == 4
+    assert len(scraper.queued_urls) == 4
+    assert [(await scraper.url_queue.popright()).normalized_url for _ in range(3)] == [
+        "http://example.com/feed.xml", "http://example.com/a", "http://example.com/b"]
+    assert scraper.sitemap_queue is not None
+    assert (await scraper.sitemap_queue.popright()).normalized_url == "http://example.com/sitemap.xml"
 
 @pytest.mark.asyncio
 async def test_scraper_download_sitemap(scraper_config: ScraperConfig):
     scraper = Scraper(scraper_config)
     sitemap_url = "http://example.com/sitemap.xml"
-    with patch.object(Sitemap, 'download_and_parse', new_callable=AsyncMock) as mock_download_and_parse:
-        mock_download_and_parse.return_value = Sitemap()
-        sitemap = await scraper._download_sitemap(sitemap_url)
-        assert sitemap is not None
-        assert sitemap_url in scraper.sitemaps
+    batches = [Sitemap(), Sitemap()]
+    batches[0].add(PageUrl("http://example.com/a", None, None, None))
+    batches[1].add(PageUrl("http://example.com/b", None, None, None))
+
+    async def stream(*args, **kwargs):
+        for batch in batches:
+            yield batch
+
+    with patch.object(Sitemap, 'stream', new=stream):
+        sitemaps = [sitemap async for sitemap in scraper._stream_sitemap(sitemap_url)]
+        assert sitemaps == batches
+        assert scraper.sitemaps[sitemap_url] == 2
 
 @pytest.mark.asyncio
 async def test_scraper_download_feed(scraper_config: ScraperConfig):
@@ -86,3 +138,340 @@ async def test_scraper_download_feed(scraper_config: ScraperConfig):
         assert feed is not None
         assert feed_url in scraper.feeds
 
+@pytest.mark.asyncio
+async def test_scraper_queue_scraper_url_over_budget(scraper_config: ScraperConfig):
+    scraper_config.budget_config = ScraperBudgetConfig(max_urls_per_host=1)
+    scraper = Scraper(scraper_config)
+    await scraper._queue_scraper_url(ScraperUrl("http://example.com/page1", type=ScraperUrlType.HTML))
+    over_budget_url = ScraperUrl("http://example.com/page2", type=ScraperUrlType.HTML)
+    await scraper._queue_scraper_url(over_budget_url)
+    assert over_budget_url.fingerprint not in scraper.queued_urls
+    assert scraper._build_stats(domain_stats={}).over_budget_urls_count == 1
+
+@pytest.mark.asyncio
+async def test_scraper_retries_transient_failure(scraper_config: ScraperConfig):
+    scraper_config.retry_config = ScraperRetryConfig(base_delay_seconds=0.01, max_delay_seconds=0.01)
+    scraper_config.crawl_delay_seconds = 0
+    scraper_config.callback = ScraperCallback()
+    scraper = Scraper(scraper_config)
+    with aioresponses() as m:
+        m.get("http://example.com/robots.txt", status=404)
+        m.get("http://example.com/", status=503, headers={"Retry-After": "0"})
+        m.get("http://example.com/", status=200, body="<html><body>Hello</body></html>", content_type="text/html")
+        stats = await scraper.run()
+    assert stats.retried_urls_count == 1
+    assert stats.success_urls_count == 1
+    assert stats.error_urls_count == 0
+
+
+
+@pytest.mark.asyncio
+async def test_scraper_prefetches_domain_metadata_on_queue(scraper_config: ScraperConfig):
+    scraper = Scraper(scraper_config)
+    with patch.object(scraper, '_download_domain_metadata', new=AsyncMock(return_value=DomainMetadata("http://example.com", Robot()))) as download:
+        await scraper._queue_scraper_url(ScraperUrl("http://example.com/page", type=ScraperUrlType.HTML))
+        await scraper._queue_scraper_url(ScraperUrl("http://example.com/other", type=ScraperUrlType.HTML))
+        await asyncio.gather(*scraper.domain_metadata.values())
+    assert list(scraper.domain_metadata.keys()) == ["example.com"]
+    download.assert_awaited_once_with("http://example.com", True)
+
+
+@pytest.mark.asyncio
+async def test_scraper_domain_metadata_request_does_not_wait_behind_prefetches(scraper_config: ScraperConfig):
+    scraper_config.max_parallel_prefetch_requests = 1
+    scraper = Scraper(scraper_config)
+    with aioresponses() as m:
+        m.get("http://example.com/robots.txt", status=200, body="User-agent: *\nDisallow: /private")
+        # the prefetch backlog holds the only prefetch slot
+        await scraper.domain_metadata_prefetch_semaphore.acquire()
+        scraper._prefetch_domain_metadata("http://example.com/page")
+        await asyncio.sleep(0)
+        domain_metadata = await asyncio.wait_for(scraper._get_domain_metadata(ScraperUrl("http://example.com/page")), 1)
+    assert domain_metadata.robots.default_entry is not None
+    assert scraper.domain_metadata_prefetch_waiting == set()
+    assert scraper.domain_metadata["example.com"].result() is domain_metadata
+
+
+@pytest.mark.asyncio
+async def test_scraper_queue_scraper_urls_filters_batch(scraper_config: ScraperConfig):
+    scraper_config.prefetch_domain_metadata = False
+    scraper = Scraper(scraper_config)
+    await scraper._queue_scraper_urls([
+        "http://example.com/a",
+        "http://EXAMPLE.com/a#fragment",
+        "http://other.com/b",
+        "http://example.com/c",
+    ], ScraperUrlType.HTML)
+    assert set(scraper.domain_stats_urls or []) == {"http://example.com/a", "http://example.com/c"}
+
+
+@pytest.mark.asyncio
+async def test_scraper_expands_sitemap_index_in_sitemap_workers(scraper_config: ScraperConfig):
+    scraper_config.seed_urls = [ScraperUrl("http://example.com/sitemap_index.xml", type=ScraperUrlType.SITEMAP)]
+    scraper_config.crawl_delay_seconds = 0
+    scraper_config.callback = ScraperCallback()
+    scraper_config.sitemap_config = ScraperSitemapConfig(max_parallel_requests=2, max_parallel_requests_per_host=2)
+    namespace = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+    scraper = Scraper(scraper_config)
+    with aioresponses() as m:
+        m.get("http://example.com/robots.txt", status=404)
+        m.get("http://example.com/sitemap_index.xml", status=200, body=f"""<sitemapindex {namespace}>
+            <sitemap><loc>http://example.com/sitemap1.xml</loc></sitemap>
+            <sitemap><loc>http://example.com/sitemap2.xml</loc></sitemap>
+        </sitemapindex>""")
+        for i in (1, 2):
+            m.get(f"http://example.com/sitemap{i}.xml", status=200, body=f"<urlset {namespace}><url><loc>http://example.com/page{i}</loc></url></urlset>")
+            m.get(f"http://example.com/page{i}", status=200, body="<html><body>Hello</body></html>", content_type="text/html")
+        stats = await scraper.run()
+    assert scraper.sitemaps == {
+        "http://example.com/sitemap_index.xml": 2,
+        "http://example.com/sitemap1.xml": 1,
+        "http://example.com/sitemap2.xml": 1,
+    }
+    assert stats.success_urls_count == 5
+    assert stats.error_urls_count == 0
+
+
+@pytest.mark.asyncio
+async def test_scraper_does_not_hold_host_slot_while_consuming_sitemap(scraper_config: ScraperConfig):
+    scraper_config.seed_urls = [ScraperUrl("http://example.com/sitemap.xml", type=ScraperUrlType.SITEMAP)]
+    scraper_config.crawl_delay_seconds = 0
+    scraper_config.adaptive_concurrency_config = ScraperAdaptiveConcurrencyConfig()
+    scraper = Scraper(scraper_config)
+    in_flight_while_consuming = []
+
+    class Callback(ScraperCallback):
+        async def on_sitemap(self, context, sitemap):
+            assert scraper.host_concurrency is not None
+            in_flight_while_consuming.append(scraper.host_concurrency.hosts["example.com"].in_flight)
+
+    scraper_config.callback = Callback()
+    namespace = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+    with aioresponses() as m:
+        m.get("http://example.com/robots.txt", status=404)
+        m.get("http://example.com/sitemap.xml", status=200, body=f"<urlset {namespace}><url><loc>http://example.com/page</loc></url></urlset>")
+        m.get("http://example.com/page", status=200, body="<html><body>Hello</body></html>", content_type="text/html")
+        stats = await scraper.run()
+    assert in_flight_while_consuming == [0]
+    assert stats.success_urls_count == 2
+
+
+@pytest.mark.asyncio
+async def test_scraper_postpones_urls_of_busy_hosts_instead_of_waiting(scraper_config: ScraperConfig):
+    store = MemoryStore({})
+    scraper_config.callback = store
+    scraper_config.crawl_delay_seconds = 0
+    scraper_config.max_parallel_requests = 1
+    scraper_config.domain_config = ScraperDomainConfig(allowance=ScraperAllowedDomains(domains=["example.com", "other.com"]))
+    scraper_config.seed_urls = [ScraperUrl("http://example.com/a"), ScraperUrl("http://other.com/b")]
+    scraper_config.adaptive_concurrency_config = ScraperAdaptiveConcurrencyConfig(initial_requests_per_host=1, target_latency_seconds=0.05)
+    scraper = Scraper(scraper_config)
+    assert scraper.host_concurrency is not None
+    # a slow request to example.com holds its only slot
+    request = await scraper.host_concurrency.acquire("example.com")
+    with aioresponses() as m:
+        for host in ("example.com", "other.com"):
+            m.get(f"http://{host}/robots.txt", status=404)
+        m.get("http://example.com/a", status=200, body="<html><body>A</body></html>", content_type="text/html")
+        m.get("http://other.com/b", status=200, body="<html><body>B</body></html>", content_type="text/html")
+        run_task = asyncio.create_task(scraper.run())
+        for _ in range(100):
+            if "http://other.com/b" in store.store:
+                break
+            await asyncio.sleep(0.01)
+        assert "http://other.com/b" in store.store
+        assert "http://example.com/a" not in store.store
+        await scraper.host_concurrency.release("example.com", 0.05, None, request)
+        stats = await asyncio.wait_for(run_task, 5)
+    assert stats.success_urls_count == 2
+
+
+@pytest.mark.asyncio
+async def test_scraper_incremental_loads_fetch_times_once_for_filtered_sitemap_urls(scraper_config: ScraperConfig):
+    store = MemoryStore({})
+    last_crawl = datetime(2024, 1, 10, tzinfo=timezone.utc)
+    store.fetched_at = {"http://example.com/unchanged": last_crawl}
+    scraper_config.callback = store
+    scraper_config.incremental = True
+    scraper_config.prefetch_domain_metadata = False
+    scraper_config.exclude_path_patterns = ["/private"]
+    scraper = Scraper(scraper_config)
+    sitemap = Sitemap()
+    lastmod = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for loc in ["http://example.com/unchanged", "http://example.com/new", "http://example.com/new#top",
+                "http://example.com/private", "http://other.com/page"]:
+        sitemap.add(PageUrl(loc, lastmod, None, None))
+    with patch.object(store, 'load_last_fetched_at_many', wraps=store.load_last_fetched_at_many) as load_many, \
+            patch.object(store, 'load_last_fetched_at', wraps=store.load_last_fetched_at) as load_one:
+        await scraper._enqueue_sitemap_urls(sitemap)
+    load_many.assert_awaited_once_with(["http://example.com/unchanged", "http://example.com/new"])
+    load_one.assert_not_called()
+    assert scraper.unchanged_urls_count == 1
+    assert scraper.domain_stats_urls == ["http://example.com/new"]
+
+
+@pytest.mark.asyncio
+async def test_scraper_incremental_skips_unchanged_sitemaps_and_pages(scraper_config: ScraperConfig):
+    store = MemoryStore({})
+    last_crawl = datetime(2024, 1, 10, tzinfo=timezone.utc)
+    store.fetched_at = {
+        "http://example.com/sitemap1.xml": last_crawl,
+        "http://example.com/sitemap2.xml": last_crawl,
+        "http://example.com/unchanged": last_crawl,
+        "http://example.com/changed": last_crawl,
+    }
+    store.store["http://example.com/changed"] = ScraperWebPage(status_code=200, url="http://example.com/changed", normalized_url="http://example.com/changed", headers={}, content=b"")
+    scraper_config.seed_urls = [ScraperUrl("http://example.com/sitemap_index.xml", type=ScraperUrlType.SITEMAP)]
+    scraper_config.crawl_delay_seconds = 0
+    scraper_config.callback = store
+    scraper_config.incremental = True
+    namespace = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+    scraper = Scraper(scraper_config)
+    with aioresponses() as m:
+        m.get("http://example.com/robots.txt", status=404)
+        m.get("http://example.com/sitemap_index.xml", status=200, body=f"""<sitemapindex {namespace}>
+            <sitemap><loc>http://example.com/sitemap1.xml</loc><lastmod>2024-01-01</lastmod></sitemap>
+            <sitemap><loc>http://example.com/sitemap2.xml</loc><lastmod>2024-01-15T00:00:00Z</lastmod></sitemap>
+        </sitemapindex>""")
+        m.get("http://example.com/sitemap2.xml", status=200, body=f"""<urlset {namespace}>
+            <url><loc>http://example.com/unchanged</loc><lastmod>2024-01-05</lastmod></url>
+            <url><loc>http://example.com/changed</loc><lastmod>2024-01-12</lastmod></url>
+            <url><loc>http://example.com/new</loc><lastmod>2024-01-12</lastmod></url>
+        </urlset>""")
+        m.get("http://example.com/changed", status=200, body="<html><body>Changed</body></html>", content_type="text/html")
+        m.get("http://example.com/new", status=200, body="<html><body>New</body></html>", content_type="text/html")
+        stats = await scraper.run()
+    assert stats.unchanged_urls_count == 2
+    assert stats.success_urls_count == 4
+    assert stats.error_urls_count == 0
+    assert store.store["http://example.com/changed"].visible_text == "Changed"
+    assert store.fetched_at["http://example.com/new"] > last_crawl
+    assert store.fetched_at["http://example.com/sitemap_index.xml"] > last_crawl
+
+@pytest.mark.asyncio
+async def test_scraper_continuous_mode_revisits_changed_pages_sooner(scraper_config: ScraperConfig):
+    store = MemoryStore({})
+    scraper_config.callback = store
+    scraper_config.crawl_delay_seconds = 0
+    scraper_config.recrawl_config = ScraperRecrawlConfig(min_interval_seconds=0.01, default_interval_seconds=0.04)
+    scraper = Scraper(scraper_config)
+    with aioresponses() as m:
+        m.get("http://example.com/robots.txt", status=404)
+        m.get("http://example.com", status=200, body="<html><body>First</body></html>", content_type="text/html")
+        m.get("http://example.com", status=200, body="<html><body>Second</body></html>", content_type="text/html")
+        m.get("http://example.com", status=200, body="<html><body>Second</body></html>", content_type="text/html")
+        run_task = asyncio.create_task(scraper.run())
+        for _ in range(200):
+            if scraper.success_urls_count >= 3:
+                break
+            await asyncio.sleep(0.01)
+        await scraper.stop()
+        stats = await asyncio.wait_for(run_task, 5)
+    assert stats.success_urls_count == 3
+    assert stats.revisited_urls_count >= 2
+    page_url = scraper_config.seed_urls[0].normalized_url
+    assert store.store[page_url].visible_text == "Second"
+    assert scraper.recrawl_scheduler is not None
+    state = scraper.recrawl_scheduler.states[page_url]
+    assert state.fetches_count == 3
+    assert state.changes_count == 1
+    # 0.04 halved on change, then grown by half when unchanged
+    assert state.interval_seconds == pytest.approx(0.03)
+
+@pytest.mark.asyncio
+async def test_scraper_continuous_mode_keeps_failed_pages_scheduled(scraper_config: ScraperConfig):
+    store = MemoryStore({})
+    scraper_config.callback = store
+    scraper_config.crawl_delay_seconds = 0
+    scraper_config.recrawl_config = ScraperRecrawlConfig(min_interval_seconds=0.01, default_interval_seconds=0.02)
+    scraper = Scraper(scraper_config)
+    with aioresponses() as m:
+        m.get("http://example.com/robots.txt", status=404)
+        m.get("http://example.com", status=404)
+        m.get("http://example.com", status=200, body="<html><body>Back</body></html>", content_type="text/html")
+        run_task = asyncio.create_task(scraper.run())
+        for _ in range(200):
+            if scraper.success_urls_count >= 1:
+                break
+            await asyncio.sleep(0.01)
+        await scraper.stop()
+        stats = await asyncio.wait_for(run_task, 5)
+    assert stats.error_urls_count == 1
+    assert stats.success_urls_count == 1
+    assert stats.revisited_urls_count >= 1
+    assert store.store[scraper_config.seed_urls[0].normalized_url].visible_text == "Back"
+
+@pytest.mark.asyncio
+async def test_scraper_feed_polling_sends_conditional_requests_and_queues_new_items(scraper_config: ScraperConfig):
+    store = MemoryStore({})
+    scraper_config.callback = store
+    scraper_config.crawl_delay_seconds = 0
+    scraper_config.seed_urls = [ScraperUrl("http://example.com/feed.xml", type=ScraperUrlType.FEED)]
+    scraper_config.feed_poll_config = ScraperFeedPollConfig(min_interval_seconds=0.01, default_interval_seconds=0.01)
+    scraper = Scraper(scraper_config)
+    feed_requests = []
+
+    def feed_response(url, **kwargs):
+        headers = kwargs.get("headers") or {}
+        feed_requests.append(headers.get("If-None-Match"))
+        if headers.get("If-None-Match") == '"v1"':
+            return CallbackResult(status=304)
+        return CallbackResult(status=200, headers={"ETag": '"v1"'}, body="""<rss><channel>
+            <item><guid>1</guid><link>http://example.com/post1</link></item>
+        </channel></rss>""")
+
+    with aioresponses() as m:
+        m.get("http://example.com/robots.txt", status=404)
+        m.get("http://example.com/feed.xml", callback=feed_response, repeat=True)
+        m.get("http://example.com/post1", status=200, body="<html><body>Post</body></html>", content_type="text/html")
+        run_task = asyncio.create_task(scraper.run())
+        for _ in range(200):
+            if len(feed_requests) >= 3:
+                break
+            await asyncio.sleep(0.01)
+        await scraper.stop()
+        stats = await asyncio.wait_for(run_task, 5)
+    assert feed_requests[:3] == [None, '"v1"', '"v1"']
+    assert stats.new_feed_items_count == 1
+    assert stats.not_modified_feeds_count >= 2
+    assert "http://example.com/post1" in store.store
+    assert store.feed_poll_states["http://example.com/feed.xml"].etag == '"v1"'
+
+@pytest.mark.asyncio
+async def test_scraper_feed_polling_runs_past_max_requested_urls(scraper_config: ScraperConfig):
+    scraper_config.callback = MemoryStore({})
+    scraper_config.crawl_delay_seconds = 0
+    scraper_config.max_requested_urls = 2
+    scraper_config.seed_urls = [ScraperUrl("http://example.com/feed.xml", type=ScraperUrlType.FEED)]
+    scraper_config.feed_poll_config = ScraperFeedPollConfig(min_interval_seconds=0.01, default_interval_seconds=0.01)
+    scraper = Scraper(scraper_config)
+    with aioresponses() as m:
+        m.get("http://example.com/robots.txt", status=404)
+        m.get("http://example.com/feed.xml", status=200, body="<rss><channel></channel></rss>", repeat=True)
+        run_task = asyncio.create_task(scraper.run())
+        for _ in range(200):
+            if scraper.requested_urls_count >= 4:
+                break
+            await asyncio.sleep(0.01)
+        assert not run_task.done()
+        await scraper.stop()
+        stats = await asyncio.wait_for(run_task, 5)
+    assert stats.requested_urls_count >= 4
+
+
+@pytest.mark.asyncio
+async def test_scraper_feed_polling_does_not_commit_items_when_delivery_fails(scraper_config: ScraperConfig):
+    store = MemoryStore({})
+    store.on_feed = AsyncMock(side_effect=RuntimeError("store down"))
+    scraper_config.callback = store
+    scraper_config.seed_urls = [ScraperUrl("http://example.com/feed.xml", type=ScraperUrlType.FEED)]
+    scraper_config.feed_poll_config = ScraperFeedPollConfig()
+    scraper = Scraper(scraper_config)
+    with aioresponses() as m:
+        m.get("http://example.com/robots.txt", status=404)
+        m.get("http://example.com/feed.xml", status=200, headers={"ETag": '"v1"'}, body="<rss><channel><item><guid>1</guid></item></channel></rss>")
+        with pytest.raises(ScraperCallbackError):
+            await scraper.run()
+    assert store.feed_poll_states == {}
+    assert scraper.feed_poller is not None
+    assert scraper.feed_poller.states["http://example.com/feed.xml"].seen_item_keys == {}
@@ -1,9 +1,11 @@
+import gzip
 import pytest
 from datetime import datetime
 from pyminiscraper.sitemap import Sitemap, PageUrl, SitemapUrl, ChangeFrequency
 import aiohttp
 from aioresponses import aioresponses
-from pyminiscraper.sitemap import Sitemap, ChangeFrequency, SitemapError
+from pyminiscraper.sitemap import Sitemap, ChangeFrequency, SitemapError, SitemapStreamParser
+from pyminiscraper.fetch import iter_decompressed, DecompressionLimitError, TruncatedBodyError
 
 def test_parse_urlset():
     xml_content = """
@@ -100,3 +102,91 @@ async def test_download_and_parse_client_error():
         async with aiohttp.ClientSession() as session:
             with pytest.raises(SitemapError):
                 await Sitemap.download_and_parse(url, session)
+
+def make_urlset(count: int) -> str:
+    urls = "".join(f"<url><loc>http://example.com/{i}</loc></url>" for i in range(count))
+    return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+
+def test_stream_parser_yields_entries_incrementally():
+    content = make_urlset(20).encode()
+    parser = SitemapStreamParser()
+    seen = []
+    for i in range(len(content)):
+        for entry in parser.feed(content[i:i + 1]):
+            seen.append((entry.loc, i))
+    seen.extend((entry.loc, len(content)) for entry in parser.close())
+    assert [loc for loc, _ in seen] == [f"http://example.com/{i}" for i in range(20)]
+    # the first entry is returned long before the document ends
+    assert seen[0][1] < len(content) // 2
+    assert parser.root is not None and len(parser.root) == 0
+
+@pytest.mark.asyncio
+async def test_stream_yields_batches():
+    url = "http://example.com/sitemap.xml"
+    with aioresponses() as m:
+        m.get(url, status=200, body=make_urlset(5))
+        async with aiohttp.ClientSession() as session:
+            batches = [batch async for batch in Sitemap.stream(url, session, batch_size=2)]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[2].page_urls[0].loc == "http://example.com/4"
+
+@pytest.mark.asyncio
+async def test_stream_gzipped_sitemap():
+    url = "http://example.com/sitemap.xml.gz"
+    body = gzip.compress(make_urlset(3000).encode())
+    with aioresponses() as m:
+        m.get(url, status=200, body=body, content_type="application/x-gzip")
+        async with aiohttp.ClientSession() as session:
+            sitemap = await Sitemap.download_and_parse(url, session)
+    assert len(sitemap.page_urls) == 3000
+    assert sitemap.page_urls[-1].loc == "http://example.com/2999"
+
+@pytest.mark.asyncio
+async def test_iter_decompressed_handles_split_magic_and_concatenated_members():
+    body = gzip.compress(b"<urlset>") + gzip.compress(b"</urlset>")
+
+    async def chunks():
+        for i in range(len(body)):
+            yield body[i:i + 1]
+
+    assert b"".join([chunk async for chunk in iter_decompressed(chunks())]) == b"<urlset></urlset>"
+
+@pytest.mark.asyncio
+async def test_iter_decompressed_concatenated_members_split_at_every_offset():
+    body = gzip.compress(b"<urlset>") + gzip.compress(b"</urlset>") + b"\x00\x00"
+    for offset in range(1, len(body)):
+        async def chunks():
+            yield body[:offset]
+            yield body[offset:]
+
+        assert b"".join([chunk async for chunk in iter_decompressed(chunks())]) == b"<urlset></urlset>", offset
+
+@pytest.mark.asyncio
+async def test_iter_decompressed_rejects_truncated_body():
+    body = gzip.compress(b"<urlset></urlset>")
+
+    async def chunks():
+        yield body[:-4]
+
+    with pytest.raises(TruncatedBodyError):
+        async for _ in iter_decompressed(chunks()):
+            pass
+
+@pytest.mark.asyncio
+async def test_iter_decompressed_passes_plain_bodies_through():
+    async def chunks():
+        yield b"<"
+        yield b"urlset/>"
+
+    assert b"".join([chunk async for chunk in iter_decompressed(chunks())]) == b"<urlset/>"
+
+@pytest.mark.asyncio
+async def test_iter_decompressed_limits_output():
+    body = gzip.compress(b"0" * 1_000_000)
+
+    async def chunks():
+        yield body
+
+    with pytest.raises(DecompressionLimitError):
+        async for _ in iter_decompressed(chunks(), max_bytes=100_000):
+            pass
@@ -0,0 +1,61 @@
+from pyminiscraper.trap import CrawlTrapDetector, TrapReason
+
+def test_repeating_path_segments():
+    detector = CrawlTrapDetector(max_path_segment_repeats=2)
+    assert detector.check("http://example.com/a/b/a/b") is None
+    assert detector.check("http://example.com/a/b/a/b/a/b") == TrapReason.REPEATING_PATH_SEGMENTS
+    assert detector.trapped_urls_count == 1
+
+def test_unbounded_numeric_parameter():
+    detector = CrawlTrapDetector(max_numeric_parameter_values=3)
+    for page in range(3):
+        assert detector.check(f"http://example.com/calendar?page={page}") is None
+    assert detector.check("http://example.com/calendar?page=1") is None
+    assert detector.check("http://example.com/calendar?page=4") == TrapReason.UNBOUNDED_NUMERIC_PARAMETER
+    assert detector.check("http://other.com/calendar?page=4") is None
+
+def test_query_combination_explosion():
+    detector = CrawlTrapDetector(max_query_combinations_per_path=2)
+    assert detector.check("http://example.com/search?color=red") is None
+    assert detector.check("http://example.com/search?color=red&size=m") is None
+    assert detector.check("http://example.com/search?color=blue&size=l") is None
+    assert detector.check("http://example.com/search?brand=x&color=red") == TrapReason.QUERY_COMBINATION_EXPLOSION
+    assert detector.check("http://example.com/other?brand=x&color=red") is None
+
+def test_stale_link_yield():
+    detector = CrawlTrapDetector(max_stale_link_yield_pages=2)
+    detector.record_page("http://example.com/1", "same content", 10)
+    detector.record_page("http://example.com/2", "same content", 10)
+    assert detector.check("http://example.com/3") is None
+    detector.record_page("http://example.com/3", "same content", 10)
+    assert detector.check("http://example.com/4") == TrapReason.STALE_LINK_YIELD
+    assert detector.check("http://other.com/4") is None
+
+def test_stats():
+    detector = CrawlTrapDetector(max_path_segment_repeats=1)
+    detector.check("http://example.com/a/a")
+    detector.check("http://example.com/b/b")
+    stats = detector.stats()
+    assert stats["example.com"].reasons == {TrapReason.REPEATING_PATH_SEGMENTS.value: 2}
+
+def test_stale_link_yield_verdict_is_lifted_after_blocked_urls():
+    detector = CrawlTrapDetector(max_stale_link_yield_pages=1, stale_link_yield_blocked_urls=2)
+    detector.record_page("http://example.com/1", "same content", 10)
+    detector.record_page("http://example.com/2", "same content", 10)
+    assert detector.check("http://example.com/3") == TrapReason.STALE_LINK_YIELD
+    assert detector.check("http://example.com/4") == TrapReason.STALE_LINK_YIELD
+    assert detector.check("http://example.com/5") is None
+
+def test_stale_link_yield_verdict_is_lifted_by_new_content():
+    detector = CrawlTrapDetector(max_stale_link_yield_pages=1)
+    detector.record_page("http://example.com/1", "same content", 10)
+    detector.record_page("http://example.com/2", "same content", 10)
+    assert detector.check("http://example.com/3") == TrapReason.STALE_LINK_YIELD
+    detector.record_page("http://example.com/4", "new content", 10)
+    assert detector.check("http://example.com/5") is None
+
+def test_content_hashes_are_bounded_per_host():
+    detector = CrawlTrapDetector(max_content_hashes_per_host=2)
+    for i in range(5):
+        detector.record_page(f"http://example.com/{i}", f"content {i}", 0)
+    assert len(detector.hosts["example.com"].content_hashes) == 2